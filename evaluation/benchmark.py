@@ -0,0 +1,87 @@
+"""
+End-to-end latency benchmark over replayed pipeline runs.
+
+Replays recorded fixtures (see `evaluation/replay.py`) N times and reports latency
+percentiles per stage (every agent in the tree) and for the whole run. With
+`--latency-scale 0` (the default) the model and tool calls return instantly, so the
+numbers measure the pipeline's own overhead; `--latency-scale 1` reproduces the
+recorded call latencies, which shows how well the stages overlap.
+
+`--max-total-p95-ms` turns the benchmark into a regression gate: the script exits with
+status 1 when the p95 of the total run time exceeds the budget.
+
+Usage (from the repository root):
+    python -m evaluation.benchmark "Mega 7" --runs 20 --latency-scale 1 --max-total-p95-ms 60000
+"""
+
+import argparse
+import asyncio
+import math
+import sys
+from collections import defaultdict
+
+from evaluation.replay import REPLAY, Fixture, ReplayHarness
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile of `values` for `q` in [0, 100]."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+async def run_benchmark(topics: list[str], runs: int, latency_scale: float) -> dict[str, list[float]]:
+    """Replay every topic `runs` times; returns agent name -> run durations in milliseconds."""
+    harness = ReplayHarness(REPLAY, latency_scale)
+    fixtures = [Fixture.load(topic) for topic in topics]
+    durations: dict[str, list[float]] = defaultdict(list)
+
+    for _ in range(runs):
+        for fixture in fixtures:
+            spans = await harness.run(fixture)
+            for span in spans:
+                if span.kind == "agent" and span.duration_ms is not None:
+                    durations[span.name].append(span.duration_ms)
+    return durations
+
+
+def print_report(durations: dict[str, list[float]], total_stage: str) -> None:
+    header = f"{'Stage':<45}{'n':>5}{'p50':>10}{'p90':>10}{'p95':>10}{'max':>10}"
+    print(header)
+    print("-" * len(header))
+    # The whole run last, stages in the order they first ran
+    for stage in sorted(durations, key=lambda name: name == total_stage):
+        values = durations[stage]
+        label = "TOTAL" if stage == total_stage else stage
+        print(
+            f"{label:<45}{len(values):>5}"
+            f"{percentile(values, 50):>10.1f}{percentile(values, 90):>10.1f}"
+            f"{percentile(values, 95):>10.1f}{max(values):>10.1f}"
+        )
+    print("(milliseconds)")
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the agent pipeline on recorded fixtures.")
+    parser.add_argument("topics", nargs="+", help="Recorded topics or fixture paths.")
+    parser.add_argument("--runs", type=int, default=10, help="Replays per topic.")
+    parser.add_argument("--latency-scale", type=float, default=0.0,
+                        help="Multiplier for recorded model/tool latencies (0 = instant).")
+    parser.add_argument("--max-total-p95-ms", type=float, default=None,
+                        help="Fail (exit 1) when the p95 total run time exceeds this budget.")
+    args = parser.parse_args()
+
+    durations = await run_benchmark(args.topics, args.runs, args.latency_scale)
+
+    from agents.agent import root_agent
+    print_report(durations, root_agent.name)
+
+    total_p95 = percentile(durations[root_agent.name], 95)
+    if args.max_total_p95_ms is not None and total_p95 > args.max_total_p95_ms:
+        print(f"FAIL: p95 total {total_p95:.1f} ms exceeds the {args.max_total_p95_ms:.1f} ms budget.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,280 @@
+"""
+Record / replay harness for offline, network-free runs of the agent pipeline.
+
+Record mode runs the real pipeline once per topic and stores every model response
+(per agent, in call order) and every function tool return (per tool and arguments)
+in a JSON fixture under `evaluation/fixtures/`. Replay mode answers the model calls
+from the fixture through a plugin and swaps every function tool for a fixture lookup,
+so a run needs no Gemini, Yahoo Finance, Finnhub, Bluesky or SMTP access.
+
+The email dispatch agent sends through a local `send_email` stub in both modes, so
+neither recording nor replaying sends mail.
+
+Usage (from the repository root):
+    python -m evaluation.replay record "Mega 7" "Renewable Energy Storage"
+    python -m evaluation.replay replay "Mega 7"
+"""
+
+import argparse
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import os
+import re
+import sys
+import time
+from typing import Any, Callable, Optional
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), "../src"))
+
+from google.adk.agents import LlmAgent
+from google.adk.agents.base_agent import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.apps import App
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.runners import InMemoryRunner
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.base_toolset import BaseToolset
+
+from agents.agent import root_agent
+from agents.analysts_team.deterministic_analyst import DeterministicAnalystAgent
+from agents.email_dispatch import email_dispatch_agent
+from agents.plugin.instrumentation_plugin import InstrumentationPlugin, Span
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+RECORD, REPLAY = "record", "replay"
+
+
+class FixtureMissError(LookupError):
+    """Raised in replay mode when a model call or tool call has no recorded counterpart."""
+
+
+def thematic_topic_query(topic: str) -> str:
+    return f"The thematic topic is: '{topic}'. Please execute the task as defined in your system instructions."
+
+
+class Fixture:
+    """
+    Recorded model responses and tool returns for one topic.
+
+    - `model_responses`: agent name -> responses in call order, each `{"response", "latency_ms"}`.
+    - `tool_results`: tool call key (name + argument hash) -> `{"result", "latency_ms"}`.
+    """
+
+    def __init__(self, topic: str, model_responses: Optional[dict] = None, tool_results: Optional[dict] = None):
+        self.topic = topic
+        self.model_responses: dict[str, list[dict[str, Any]]] = model_responses or {}
+        self.tool_results: dict[str, dict[str, Any]] = tool_results or {}
+
+    @staticmethod
+    def path_for(topic: str) -> str:
+        slug = re.sub(r"[^a-z0-9]+", "_", topic.casefold()).strip("_")
+        return os.path.join(FIXTURE_DIR, f"{slug}.json")
+
+    @classmethod
+    def load(cls, topic_or_path: str) -> "Fixture":
+        path = topic_or_path if topic_or_path.endswith(".json") else cls.path_for(topic_or_path)
+        with open(path, encoding="utf-8") as f:
+            return cls(**json.load(f))
+
+    def save(self) -> str:
+        os.makedirs(FIXTURE_DIR, exist_ok=True)
+        path = self.path_for(self.topic)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"topic": self.topic, "model_responses": self.model_responses, "tool_results": self.tool_results},
+                f,
+                indent=2,
+            )
+        return path
+
+
+def _tool_key(func: Callable, args: tuple, kwargs: dict) -> str:
+    bound = inspect.signature(func).bind(*args, **kwargs)
+    bound.apply_defaults()
+    arguments = json.dumps(bound.arguments, sort_keys=True, default=str)
+    return f"{func.__name__}:{hashlib.sha256(arguments.encode('utf-8')).hexdigest()[:16]}"
+
+
+class ToolFixtures:
+    """Wraps tool callables so they record their returns to, or replay them from, `fixture`."""
+
+    def __init__(self, mode: str, latency_scale: float = 0.0) -> None:
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.fixture: Optional[Fixture] = None
+
+    def _replay(self, key: str) -> tuple[Any, float]:
+        entry = self.fixture.tool_results.get(key)
+        if entry is None:
+            raise FixtureMissError(f"No recorded result for tool call {key} in fixture '{self.fixture.topic}'.")
+        return entry["result"], entry["latency_ms"] * self.latency_scale / 1000
+
+    def _record(self, key: str, result: Any, started: float) -> Any:
+        # Store the JSON round-tripped value so record and replay return identical data
+        result = json.loads(json.dumps(result, default=str))
+        self.fixture.tool_results[key] = {"result": result, "latency_ms": (time.perf_counter() - started) * 1000}
+        return result
+
+    def wrap(self, func: Callable) -> Callable:
+        """Return a wrapper with the same name, signature and docstring as `func`."""
+        # Re-wrapping (a second harness in the same process) replaces the earlier wrapper
+        func = getattr(func, "__fixture_original__", func)
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                key = _tool_key(func, args, kwargs)
+                if self.mode == REPLAY:
+                    result, delay = self._replay(key)
+                    await asyncio.sleep(delay)
+                    return result
+                started = time.perf_counter()
+                return self._record(key, await func(*args, **kwargs), started)
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                key = _tool_key(func, args, kwargs)
+                if self.mode == REPLAY:
+                    result, delay = self._replay(key)
+                    time.sleep(delay)
+                    return result
+                started = time.perf_counter()
+                return self._record(key, func(*args, **kwargs), started)
+
+        wrapper.__fixture_original__ = func
+        return wrapper
+
+
+class ModelFixturePlugin(BasePlugin):
+    """Records every final model response per agent, or answers model calls from the fixture."""
+
+    def __init__(self, mode: str, latency_scale: float = 0.0) -> None:
+        super().__init__(name="model_fixture")
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.fixture: Optional[Fixture] = None
+        self._cursors: dict[str, int] = {}  # agent name -> next recorded response to replay
+        self._started: dict[tuple, float] = {}
+
+    async def before_run_callback(self, *, invocation_context: InvocationContext) -> None:
+        self._cursors.clear()
+        return None
+
+    async def before_model_callback(
+            self, *, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        agent_name = callback_context.agent_name
+        if self.mode == RECORD:
+            self._started[(callback_context.invocation_id, callback_context.branch, agent_name)] = time.perf_counter()
+            return None
+
+        index = self._cursors.get(agent_name, 0)
+        recorded = self.fixture.model_responses.get(agent_name, [])
+        if index >= len(recorded):
+            raise FixtureMissError(
+                f"Model call #{index + 1} of {agent_name} was not recorded in fixture '{self.fixture.topic}'."
+            )
+        self._cursors[agent_name] = index + 1
+        await asyncio.sleep(recorded[index]["latency_ms"] * self.latency_scale / 1000)
+        return LlmResponse.model_validate(recorded[index]["response"])
+
+    async def after_model_callback(
+            self, *, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> None:
+        if self.mode != RECORD or llm_response.partial:
+            return None
+        started = self._started.pop(
+            (callback_context.invocation_id, callback_context.branch, callback_context.agent_name), time.perf_counter()
+        )
+        self.fixture.model_responses.setdefault(callback_context.agent_name, []).append({
+            "response": llm_response.model_dump(mode="json", exclude_none=True),
+            "latency_ms": (time.perf_counter() - started) * 1000,
+        })
+        return None
+
+
+def send_email(subject: str, html_body: str, recipient: Optional[str] = None) -> str:
+    """
+    Sends an HTML email using SMTP.
+
+    Args:
+        subject: The subject line of the email.
+        html_body: The content of the email (HTML format supported).
+        recipient: The email address of the receiver.
+    """
+    return f"Email '{subject}' not sent: the pipeline is running under the record/replay harness."
+
+
+def _walk(agent: BaseAgent):
+    yield agent
+    for sub_agent in agent.sub_agents:
+        yield from _walk(sub_agent)
+
+
+class ReplayHarness:
+    """
+    The production agent tree wired for recording or replaying fixtures.
+
+    Only the fixture plugins and an `InstrumentationPlugin` (for stage timings) are
+    installed; the app's caches are left out so every run exercises the whole pipeline.
+    """
+
+    def __init__(self, mode: str, latency_scale: float = 0.0) -> None:
+        self.mode = mode
+        self.tools = ToolFixtures(mode, latency_scale)
+        self.model_plugin = ModelFixturePlugin(mode, latency_scale)
+        self.instrumentation = InstrumentationPlugin(output_dir=None)
+
+        email_dispatch_agent.sender = send_email
+        email_dispatch_agent.max_attempts = 1  # The stub never sends, retrying would only add sleeps
+        for agent in _walk(root_agent):
+            if isinstance(agent, DeterministicAnalystAgent):
+                agent.tool = self.tools.wrap(agent.tool)
+            elif isinstance(agent, LlmAgent):
+                agent.tools = [
+                    tool if isinstance(tool, (BaseTool, BaseToolset)) else self.tools.wrap(tool)
+                    for tool in agent.tools
+                ]
+
+        self.app = App(
+            name="TradingIdeaApp",
+            root_agent=root_agent,
+            plugins=[self.instrumentation, self.model_plugin],
+        )
+
+    async def run(self, fixture: Fixture) -> list[Span]:
+        """Run the pipeline once for the fixture's topic and return the run's spans."""
+        self.tools.fixture = self.model_plugin.fixture = fixture
+        runner = InMemoryRunner(app=self.app)
+        await runner.run_debug(thematic_topic_query(fixture.topic), quiet=True)
+        return self.instrumentation.last_run_spans
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Record or replay offline fixtures of the agent pipeline.")
+    parser.add_argument("mode", choices=[RECORD, REPLAY])
+    parser.add_argument("topics", nargs="+", help="Thematic topics (or fixture paths when replaying).")
+    args = parser.parse_args()
+
+    harness = ReplayHarness(args.mode)
+    for topic in args.topics:
+        fixture = Fixture(topic) if args.mode == RECORD else Fixture.load(topic)
+        spans = await harness.run(fixture)
+        total = next((span.duration_ms for span in spans if span.kind == "agent" and span.name == root_agent.name), None)
+        # No root span (or an unfinished one) when the run failed before the root agent completed
+        duration = "n/a" if total is None else f"{total:.0f} ms"
+        if args.mode == RECORD:
+            print(f"Recorded '{topic}' to {fixture.save()} ({duration})")
+        else:
+            print(f"Replayed '{fixture.topic}' in {duration}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
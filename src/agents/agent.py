@@ -5,14 +5,46 @@ from agents.analysts_team.social_media_sentiment_analyst import (
     root_social_media_sentiment_analyst_agent,
 )
 from agents.analysts_team.technical_analyst import root_technical_analyst_agent
+from agents.configs.context_budget_config import (
+    CONTEXT_BUDGET_AGENT_TOKENS,
+    CONTEXT_BUDGET_DEFAULT_TOKENS,
+    CONTEXT_BUDGET_ENABLED,
+    CONTEXT_BUDGET_KEEP_RECENT,
+    CONTEXT_BUDGET_PART_MAX_CHARS,
+)
 from agents.configs.context_compaction_config import context_compaction_config
+from agents.configs.instrumentation_config import (
+    INSTRUMENTATION_ENABLED,
+    TRACE_DIR,
+    TRACE_KEEP_RUNS,
+    TRACE_MAX_SPANS_MB,
+)
+from agents.configs.llm_response_cache_config import (
+    LLM_CACHE_AGENT_TTLS,
+    LLM_CACHE_BACKEND,
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_PATH,
+    LLM_CACHE_TTL_SECONDS,
+)
+from agents.configs.pipeline_cache_config import (
+    PIPELINE_CACHE_ENABLED,
+    PIPELINE_CACHE_PATH,
+    PIPELINE_CACHE_TTL_SECONDS,
+)
+from agents.plugin.context_budget_plugin import ContextBudgetPlugin
 from agents.plugin.count_model_call_plugin import CountModelCallPlugin
+from agents.plugin.instrumentation_plugin import InstrumentationPlugin
+from agents.plugin.llm_response_cache_plugin import LlmResponseCachePlugin
+from agents.plugin.pipeline_cache_plugin import PipelineCachePlugin
 from agents.ticker_scanner_agent import root_ticker_scanner_agent
 from agents.summarize_agent import summarizer_agent
-from agents.email_agent import email_agent
+from agents.report_renderer import report_renderer_agent
+from agents.email_dispatch import email_dispatch_agent
 
 from google.adk.agents import SequentialAgent, ParallelAgent
 from google.adk.apps import App
+from utils.cache_utils import InMemoryLRUCache, SQLiteCache, TieredCache
 
 parallel_analyst_agent_team = ParallelAgent(
     name="ParallelAnalystAgentTeam",
@@ -26,7 +58,7 @@ parallel_analyst_agent_team = ParallelAgent(
 
 analysis_summary_agent = SequentialAgent(
     name="AnalysisSummaryAgent",
-    sub_agents=[parallel_analyst_agent_team, summarizer_agent],
+    sub_agents=[parallel_analyst_agent_team, summarizer_agent, report_renderer_agent],
 )
 
 root_agent = SequentialAgent(
@@ -34,14 +66,61 @@ root_agent = SequentialAgent(
     sub_agents=[
         root_ticker_scanner_agent,
         analysis_summary_agent,
-        email_agent,
+        email_dispatch_agent,
     ],
 )
 
+plugins = [CountModelCallPlugin()]
+if LLM_CACHE_ENABLED:
+    llm_response_cache = InMemoryLRUCache(max_entries=LLM_CACHE_MAX_ENTRIES)
+    if LLM_CACHE_BACKEND == "sqlite":
+        llm_response_cache = TieredCache(
+            llm_response_cache,
+            SQLiteCache(LLM_CACHE_PATH, max_entries=LLM_CACHE_MAX_ENTRIES, table="llm_responses"),
+        )
+    # Placed first so that CountModelCallPlugin only counts requests that reach the model
+    plugins.insert(
+        0,
+        LlmResponseCachePlugin(
+            cache=llm_response_cache,
+            default_ttl=LLM_CACHE_TTL_SECONDS,
+            ttl_by_agent=LLM_CACHE_AGENT_TTLS,
+        ),
+    )
+if CONTEXT_BUDGET_ENABLED:
+    # Placed ahead of the LLM cache so that cache keys are computed on the trimmed request
+    plugins.insert(
+        0,
+        ContextBudgetPlugin(
+            default_budget=CONTEXT_BUDGET_DEFAULT_TOKENS,
+            budget_by_agent=CONTEXT_BUDGET_AGENT_TOKENS,
+            keep_recent=CONTEXT_BUDGET_KEEP_RECENT,
+            part_max_chars=CONTEXT_BUDGET_PART_MAX_CHARS,
+        ),
+    )
+if PIPELINE_CACHE_ENABLED:
+    # Repeat themes on the same trading day reuse the scanner, analyst and summary outputs
+    plugins.append(
+        PipelineCachePlugin(
+            cache=TieredCache(InMemoryLRUCache(max_entries=256), SQLiteCache(PIPELINE_CACHE_PATH, table="pipeline_stages")),
+            ttl_seconds=PIPELINE_CACHE_TTL_SECONDS,
+        )
+    )
+if INSTRUMENTATION_ENABLED:
+    # Placed first so that agents and model calls short-circuited by the caches are still timed
+    plugins.insert(
+        0,
+        InstrumentationPlugin(
+            output_dir=TRACE_DIR or None,
+            max_spans_bytes=int(TRACE_MAX_SPANS_MB * 1024 * 1024),
+            keep_traces=TRACE_KEEP_RUNS,
+        ),
+    )
+
 app = App(
     name="TradingIdeaApp",
     root_agent=root_agent,
-    plugins=[CountModelCallPlugin()],
+    plugins=plugins,
     events_compaction_config=context_compaction_config,
 )
 
@@ -0,0 +1,126 @@
+import asyncio
+import inspect
+import json
+import logging
+from typing import Any, AsyncGenerator, Callable, Dict, List, Tuple
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+from pydantic import BaseModel, ValidationError
+
+
+def scanned_tickers_from_state(value: Any) -> List[Dict[str, Any]]:
+    """
+    Extract the scanned tickers from the `structured_ticker_scanner_findings` state value.
+
+    Accepts the `ScannerAgentListOutput` dict written by the scanner (or its JSON string),
+    the legacy `scanned_stocks` key, or a bare list of tickers.
+    """
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError:
+            return []
+    if isinstance(value, dict):
+        value = value.get("scanned_tickers", value.get("scanned_stocks", []))
+    if not isinstance(value, list):
+        return []
+    return [ticker for ticker in value if isinstance(ticker, dict) and ticker.get("symbol")]
+
+
+class DeterministicAnalystAgent(BaseAgent):
+    """
+    An analyst that calls its analysis tool directly instead of asking an LLM to do it.
+
+    Reads the scanned tickers from `input_key`, passes their symbols to `tool`, validates
+    each result against `item_model` (adding the company name from the scanner findings)
+    and writes the results as a JSON list to `output_key`, the same format the LLM analyst
+    used to produce.
+
+    Failures are contained per ticker: if the tool raises for the whole list it is called
+    again one symbol at a time, and a ticker whose call fails or whose result does not
+    validate is reported without a sentiment instead of failing the analyst team.
+    """
+
+    tool: Callable[[List[str]], Any]
+    item_model: type[BaseModel]
+    output_key: str
+    input_key: str = "structured_ticker_scanner_findings"
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        scanned_tickers = scanned_tickers_from_state(ctx.session.state.get(self.input_key))
+        company_names = {ticker["symbol"]: ticker.get("company_name") or ticker["symbol"] for ticker in scanned_tickers}
+
+        symbols = list(company_names)
+        results, errors = await self._analyze(symbols) if symbols else ([], {})
+        findings = [self._finding(result, company_names) for result in results]
+        findings += [
+            _failed_finding(symbol, company_names[symbol], f"{type(error).__name__}: {error}")
+            for symbol, error in errors.items()
+        ]
+        output = json.dumps(findings, indent=2)
+
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=output)]),
+            actions=EventActions(state_delta={self.output_key: output}),
+        )
+
+    async def _call_tool(self, symbols: List[str]) -> List[Dict[str, Any]]:
+        if inspect.iscoroutinefunction(self.tool):
+            return await self.tool(symbols)
+        return await asyncio.to_thread(self.tool, symbols)
+
+    async def _analyze(self, symbols: List[str]) -> Tuple[List[Dict[str, Any]], Dict[str, Exception]]:
+        """The tool's results, and the error of each symbol it failed for."""
+        try:
+            return await self._call_tool(symbols), {}
+        except Exception as e:
+            if len(symbols) == 1:
+                logging.warning(f"[Analyst] {self.name} failed for {symbols[0]}: {e}")
+                return [], {symbols[0]: e}
+            logging.warning(f"[Analyst] {self.name} failed for {len(symbols)} tickers, retrying one at a time: {e}")
+
+        results, errors = [], {}
+        for symbol in symbols:
+            try:
+                results.extend(await self._call_tool([symbol]))
+            except Exception as e:
+                logging.warning(f"[Analyst] {self.name} failed for {symbol}: {e}")
+                errors[symbol] = e
+        return results, errors
+
+    def _finding(self, result: Any, company_names: Dict[str, str]) -> Dict[str, Any]:
+        """`result` validated against `item_model`, or a finding without a sentiment if it does not validate."""
+        symbol = str(result.get("symbol", "")) if isinstance(result, dict) else ""
+        company_name = company_names.get(symbol, symbol)
+        try:
+            return self.item_model.model_validate({
+                **result,
+                "company_name": company_name,
+                "aggregated_sentiment": _normalize_sentiment(result.get("aggregated_sentiment")),
+            }).model_dump(mode="json")
+        except (ValidationError, TypeError) as e:
+            logging.warning(f"[Analyst] {self.name} returned an invalid result for {symbol or '?'}: {e}")
+            return _failed_finding(symbol, company_name, "the result did not match the expected format")
+
+
+def _failed_finding(symbol: str, company_name: str, reason: str) -> Dict[str, Any]:
+    """A finding without a sentiment (rendered as N/A), for a ticker that could not be analyzed."""
+    return {
+        "symbol": symbol,
+        "company_name": company_name,
+        "aggregated_sentiment": None,
+        "justification": f"Analysis failed: {reason}.",
+    }
+
+
+def _normalize_sentiment(sentiment: Any) -> Any:
+    """Map tool labels (`BULLISH`, `bullish`, ...) onto `Sentiment` values; `N/A` means no rating."""
+    if not isinstance(sentiment, str) or sentiment.upper() == "N/A":
+        return None
+    return sentiment.lower()
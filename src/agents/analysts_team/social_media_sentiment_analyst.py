@@ -5,14 +5,14 @@ from agents.data_models.social_media_sentiment_agent_data_model import (
 from google.adk.agents import Agent, SequentialAgent
 from google.adk.models.google_llm import Gemini
 
-from function_tools.get_bluesky_posts import get_bluesky_posts
+from function_tools.async_tools import get_social_sentiment_summary_async
 
 model = Gemini(model="gemini-2.5-flash-lite", retry_options=retry_config)
 
 PROMPT = """
 ## 1. Agent Role and Task
 
-You are a **Social Media Sentiment Analyzer Agent**. Your task is to process a list of target stock symbols, retrieve related social data using the provided tool, and then **analyze and aggregate the sentiment** of the relevant posts for each ticker.
+You are a **Social Media Sentiment Analyzer Agent**. Your task is to process a list of target stock symbols, retrieve pre-scored social sentiment data using the provided tool, and then **report the aggregated sentiment** for each ticker.
 
 ## 2. Input and Data Extraction
 
@@ -35,29 +35,23 @@ The initial input will be a JSON object, which represents the content stored in
 
 You have access to the following function:
 
-**`get_bluesky_posts(symbol: str)`** to fetch the most recent and relevant BlueSky social media posts for a given stock ticker symbol.
+**`get_social_sentiment_summary(symbols: list[str])`** to fetch recent BlueSky social media posts for a list of stock ticker symbols. The posts are already filtered for relevance and classified locally, so the tool returns one aggregate per ticker:
+* `relevant_posts`: number of posts discussing the stock's performance.
+* `bullish`, `bearish`, `neutral`: number of relevant posts per sentiment.
+* `suggested_sentiment`: the prevailing sentiment derived from these counts.
+* `snippets`: up to 3 representative posts with their sentiment.
 
 **Step 2: Tool Execution**
-* Call the tool: `get_bluesky_posts(ticker_list=extracted_symbols)`.
+* Call the tool **once** with all extracted symbols: `get_social_sentiment_summary(symbols=extracted_symbols)`.
+* Do NOT call the tool separately for each symbol.
 
-## 4. Post-Processing and Aggregation Analysis (MANDATORY)
+## 4. Aggregation Review (MANDATORY)
 
-After receiving the raw list of posts from the tool, you must perform a strict analysis and aggregation based on the post content sentiment.
+For each of the 5 input tickers, use the tool's aggregate:
 
-### Analysis and Aggregation Criteria:
-
-1.  **Relevance Check:** For each post, determine if it explicitly:
-    * Mentions the company associated with the stock symbol.
-    * AND relates to or discusses the **past, current, or future stock performance** (e.g., "rally," "drop," "Q3 earnings," "target price," "short interest") of that company.
-2.  **Sentiment Classification (Per Post):** For every post that passes the relevance check, classify its sentiment: `bullish`, `bearish`, or `neutral`. If you cannot determine the sentiment, classify as `neutral`.
-
-3.  **Aggregation (Per Ticker) - Qualitative Judgment:** For each of the 5 input tickers:
-    * **Calculation:** Count the total number of relevant `bullish`, `bearish`, and `neutral` posts.
-    * **Determine Aggregated Sentiment:** Based on the calculated breakdown, use your judgment to determine the overall **prevailing sentiment** for the ticker.
-        * Classify as `bullish` if bullish posts significantly outweigh bearish and neutral posts.
-        * Classify as `bearish` if bearish posts significantly outweigh bullish and neutral posts.
-        * Classify as `neutral` if neutral posts clearly dominate, or if bullish and bearish posts are present but relatively low compared to neutral.
-    * **Justification:** The `sentiment_justification` must explain *why* you chose the aggregated sentiment based on the breakdown.
+1.  **Aggregated Sentiment:** Use `suggested_sentiment` as the ticker's sentiment. Only override it if the snippets clearly contradict the counts, and say so in the justification.
+2.  **No Data:** If `relevant_posts` is 0, classify as `neutral` and state that there was no relevant social discussion.
+3.  **Justification:** Explain the sentiment using the bullish/bearish/neutral breakdown, referring to the snippets where they illustrate the prevailing view.
 
 ## 5. Output Format
 
@@ -83,7 +77,7 @@ root_social_media_sentiment_analyst_agent = Agent(
     name="root_social_media_sentiment_analyst_agent",
     model=model,
     instruction=PROMPT,
-    tools=[get_bluesky_posts],
+    tools=[get_social_sentiment_summary_async],
     output_key="structured_social_media_sentiment_findings",
     # The result of this agent will be stored in the session state with this key.
 )
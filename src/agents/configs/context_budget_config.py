@@ -0,0 +1,37 @@
+"""
+Per-agent prompt token budgets.
+
+Notes:
+- CONTEXT_BUDGET_ENABLED: trim the conversation history of requests whose estimated prompt
+  size exceeds the agent's budget.
+- CONTEXT_BUDGET_DEFAULT_TOKENS: budget of agents without an override.
+- CONTEXT_BUDGET_AGENT_TOKENS: per-agent overrides as `agent_name=tokens` pairs separated by commas.
+- CONTEXT_BUDGET_KEEP_RECENT: trailing contents (the agent's own latest turns) that are never trimmed.
+- CONTEXT_BUDGET_PART_MAX_CHARS: older text and tool results over budget are cut down to this many characters.
+- Token counts are estimated at 4 characters per token, before the request is sent.
+"""
+
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _parse_agent_budgets(value: str) -> dict[str, int]:
+    budgets = {}
+    for pair in filter(None, (item.strip() for item in value.split(","))):
+        agent_name, _, tokens = pair.partition("=")
+        budgets[agent_name.strip()] = int(tokens)
+    return budgets
+
+
+CONTEXT_BUDGET_ENABLED: bool = os.getenv("CONTEXT_BUDGET_ENABLED", "true").lower() == "true"
+CONTEXT_BUDGET_DEFAULT_TOKENS: int = int(os.getenv("CONTEXT_BUDGET_DEFAULT_TOKENS", "16000"))
+CONTEXT_BUDGET_AGENT_TOKENS: dict[str, int] = {
+    # The findings reach the summarizer through its instruction, so the history is mostly noise
+    "SummarizerAgent": 6000,
+    **_parse_agent_budgets(os.getenv("CONTEXT_BUDGET_AGENT_TOKENS", "")),
+}
+CONTEXT_BUDGET_KEEP_RECENT: int = int(os.getenv("CONTEXT_BUDGET_KEEP_RECENT", "3"))
+CONTEXT_BUDGET_PART_MAX_CHARS: int = int(os.getenv("CONTEXT_BUDGET_PART_MAX_CHARS", "1500"))
@@ -1,19 +1,33 @@
 """
 Context Compaction configs uses a sliding window approach for collecting and summarizing agent workflow
 event data within a Session.
+
+Besides the sliding window, compaction also runs before a model call once the previous prompt
+of the session reached COMPACTION_TOKEN_THRESHOLD tokens; all but the newest
+COMPACTION_EVENT_RETENTION events are then summarized. Per-request trimming against each
+agent's budget is done by `ContextBudgetPlugin`.
 """
 
+import os
 import warnings
 
+from dotenv import load_dotenv
 from google.adk.apps.app import EventsCompactionConfig
 
+load_dotenv()
+
 warnings.filterwarnings(
     action="ignore",
     message=".*Experimental.*",
     category=UserWarning
 )
 
+COMPACTION_TOKEN_THRESHOLD: int = int(os.getenv("COMPACTION_TOKEN_THRESHOLD", "32000"))
+COMPACTION_EVENT_RETENTION: int = int(os.getenv("COMPACTION_EVENT_RETENTION", "8"))
+
 context_compaction_config: EventsCompactionConfig = EventsCompactionConfig(
     compaction_interval=5,  # Trigger compaction every 5 new invocations.
-    overlap_size=1  # Include last invocation from the previous window.
+    overlap_size=1,  # Include last invocation from the previous window.
+    token_threshold=COMPACTION_TOKEN_THRESHOLD,  # Also compact once a prompt grows past this size.
+    event_retention_size=COMPACTION_EVENT_RETENTION,  # Events kept verbatim when that happens.
 )
@@ -0,0 +1,20 @@
+"""
+Email dispatch settings.
+
+Notes:
+- EMAIL_DISPATCH_TRANSPORT: `mcp` calls `send_email` on the email MCP server; `smtp` sends from this
+  process over a pooled SMTP connection, without starting the MCP server.
+- EMAIL_DISPATCH_MAX_ATTEMPTS: sends are retried until one succeeds or this many were made.
+- EMAIL_DISPATCH_RETRY_SECONDS: wait before the first retry; doubled for every further one.
+"""
+
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+EMAIL_DISPATCH_TRANSPORT: str = os.getenv("EMAIL_DISPATCH_TRANSPORT", "mcp").lower()
+EMAIL_DISPATCH_MAX_ATTEMPTS: int = int(os.getenv("EMAIL_DISPATCH_MAX_ATTEMPTS", "3"))
+EMAIL_DISPATCH_RETRY_SECONDS: float = float(os.getenv("EMAIL_DISPATCH_RETRY_SECONDS", "2"))
+EMAIL_SUBJECT: str = os.getenv("EMAIL_SUBJECT", "Daily Trading Idea Analysis")
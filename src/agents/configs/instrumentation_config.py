@@ -0,0 +1,24 @@
+"""
+Run instrumentation settings.
+
+Notes:
+- INSTRUMENTATION_ENABLED: record per-agent model, tool and token timings for every run.
+- TRACE_DIR: where `spans.jsonl` and the per-run Chrome traces (`<invocation_id>.trace.json`) are written;
+  set it to an empty string to only log the per-agent summary.
+- TRACE_MAX_SPANS_MB: once `spans.jsonl` reaches this size it is rotated to `spans.jsonl.1` (replacing the
+  previous one), so at most about twice this much is kept; 0 disables the cap.
+- TRACE_KEEP_RUNS: keep only the newest N per-run Chrome traces; 0 keeps them all.
+"""
+
+import os
+
+from dotenv import load_dotenv
+
+from configs.settings import settings
+
+load_dotenv()
+
+INSTRUMENTATION_ENABLED: bool = os.getenv("INSTRUMENTATION_ENABLED", "true").lower() == "true"
+TRACE_DIR: str = os.getenv("TRACE_DIR", os.path.join(settings.cache_dir, "traces"))
+TRACE_MAX_SPANS_MB: float = float(os.getenv("TRACE_MAX_SPANS_MB", "50"))
+TRACE_KEEP_RUNS: int = int(os.getenv("TRACE_KEEP_RUNS", "100"))
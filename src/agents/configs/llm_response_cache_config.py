@@ -0,0 +1,37 @@
+"""
+LLM response cache settings.
+
+Notes:
+- LLM_CACHE_BACKEND: `memory` (process-local LRU) or `sqlite` (memory in front of a file under CACHE_DIR).
+- LLM_CACHE_TTL_SECONDS: default lifetime of a cached response.
+- LLM_CACHE_AGENT_TTLS: per-agent overrides as `agent_name=seconds` pairs separated by commas;
+  `0` disables caching for that agent.
+"""
+
+import os
+
+from dotenv import load_dotenv
+
+from configs.settings import settings
+
+load_dotenv()
+
+
+def _parse_agent_ttls(value: str) -> dict[str, float]:
+    ttls = {}
+    for pair in filter(None, (item.strip() for item in value.split(","))):
+        agent_name, _, seconds = pair.partition("=")
+        ttls[agent_name.strip()] = float(seconds)
+    return ttls
+
+
+LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_BACKEND: str = os.getenv("LLM_CACHE_BACKEND", "sqlite").lower()
+LLM_CACHE_PATH: str = os.getenv("LLM_CACHE_PATH", os.path.join(settings.cache_dir, "llm_response_cache.sqlite"))
+LLM_CACHE_MAX_ENTRIES: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+LLM_CACHE_TTL_SECONDS: float = float(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))  # One day
+LLM_CACHE_AGENT_TTLS: dict[str, float] = {
+    # Search-grounded answers go stale faster than reformatting or summarizing
+    "ticker_scanner_agent": 6 * 3600,
+    **_parse_agent_ttls(os.getenv("LLM_CACHE_AGENT_TTLS", "")),
+}
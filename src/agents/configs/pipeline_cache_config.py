@@ -0,0 +1,35 @@
+"""
+Run-level pipeline cache settings.
+
+Notes:
+- Stage outputs are cached per (normalized theme, trading date, model config) and reused by later runs.
+- PIPELINE_STAGE_INPUTS lists the cached session-state keys and the upstream keys each one was computed from;
+  a cached output is only reused while those upstream values are identical.
+- Agents whose output_key is not listed (and agents without one, such as the email agent) always run;
+  this includes the report renderer, which rebuilds `final_summary` from the cached narrative locally.
+"""
+
+import os
+
+from dotenv import load_dotenv
+
+from configs.settings import settings
+
+load_dotenv()
+
+PIPELINE_CACHE_ENABLED: bool = os.getenv("PIPELINE_CACHE_ENABLED", "true").lower() == "true"
+PIPELINE_CACHE_TTL_SECONDS: int = int(os.getenv("PIPELINE_CACHE_TTL_SECONDS", "86400"))  # One day
+PIPELINE_CACHE_PATH: str = os.getenv("PIPELINE_CACHE_PATH", os.path.join(settings.cache_dir, "pipeline_cache.sqlite"))
+
+ANALYST_OUTPUT_KEYS = [
+    "structured_social_media_sentiment_findings",
+    "structured_institution_rating_findings",
+    "structured_technical_analyst_findings",
+]
+
+PIPELINE_STAGE_INPUTS: dict[str, list[str]] = {
+    "raw_ticker_scanner_findings": [],  # Depends on the theme only
+    "structured_ticker_scanner_findings": ["raw_ticker_scanner_findings"],
+    **{key: ["structured_ticker_scanner_findings"] for key in ANALYST_OUTPUT_KEYS},
+    "summary_narrative": ANALYST_OUTPUT_KEYS,
+}
@@ -0,0 +1,25 @@
+"""
+Session storage settings.
+
+Notes:
+- SESSION_STORE: `sqlite` keeps sessions in a local SQLite file so they survive restarts; `memory` keeps
+  the previous unbounded in-memory behaviour.
+- SESSION_MAX_EVENTS: events kept per session; older events are dropped as new ones arrive.
+- SESSION_CACHE_MAX_SESSIONS: sessions held in memory; the least recently used ones are dropped from
+  memory and reloaded from disk when they are used again.
+- SESSION_TTL_SECONDS: sessions idle for longer are deleted from disk.
+"""
+
+import os
+
+from dotenv import load_dotenv
+
+from configs.settings import settings
+
+load_dotenv()
+
+SESSION_STORE: str = os.getenv("SESSION_STORE", "sqlite").lower()
+SESSION_DB_PATH: str = os.getenv("SESSION_DB_PATH", os.path.join(settings.cache_dir, "sessions.sqlite3"))
+SESSION_MAX_EVENTS: int = int(os.getenv("SESSION_MAX_EVENTS", "200"))
+SESSION_CACHE_MAX_SESSIONS: int = int(os.getenv("SESSION_CACHE_MAX_SESSIONS", "64"))
+SESSION_TTL_SECONDS: float = float(os.getenv("SESSION_TTL_SECONDS", str(7 * 24 * 60 * 60)))  # One week
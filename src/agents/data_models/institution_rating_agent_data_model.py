@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 from agents.data_models.sentiment import Sentiment
 from pydantic import BaseModel, Field
@@ -7,9 +7,14 @@ from pydantic import BaseModel, Field
 class InstitutionRating(BaseModel):
     symbol: str = Field(description="The official ticker symbol of the stock (e.g., 'GOOGL', 'AAPL').")
     company_name: str = Field(description="The full legal name of the company corresponding to the ticker symbol.")
-    aggregated_sentiment: Sentiment = Field(description="The overall sentiment of symbol.")
+    aggregated_sentiment: Optional[Sentiment] = Field(
+        description="The overall sentiment of symbol, or null when no rating data is available.")
     justification: str = Field(
         description="A 1-2 sentence summary explaining the sentiment and why it was classified as such.")
+    period: Optional[str] = Field(
+        default=None, description="The month of the recommendation trend the sentiment is based on (YYYY-MM-DD).")
+    cache_hit: Optional[bool] = Field(
+        default=None, description="Whether the recommendation trend was served from the local cache.")
 
 
 class InstitutionRatingOutput(BaseModel):
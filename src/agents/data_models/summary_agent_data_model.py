@@ -0,0 +1,24 @@
+import enum
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class OverallSignal(enum.Enum):
+    """The verdict that opens the briefing."""
+    STRONG_BUY = "STRONG BUY"
+    BUY = "BUY"
+    NEUTRAL = "NEUTRAL"
+    SELL = "SELL"
+    STRONG_SELL = "STRONG SELL"
+
+
+class SummaryNarrative(BaseModel):
+    """
+    The prose part of the daily briefing; the signal tables are rendered from the analyst outputs.
+    """
+    overall_signal: OverallSignal = Field(description="The overall verdict for the theme's stocks.")
+    executive_summary: str = Field(
+        description="A 2-3 sentence high-level verdict that connects the technical, social and institutional findings.")
+    key_drivers: List[str] = Field(
+        description="The 3 most critical factors driving these stocks right now, one short sentence each.")
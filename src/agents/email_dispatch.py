@@ -0,0 +1,134 @@
+import asyncio
+import inspect
+import logging
+from datetime import datetime, timezone
+from typing import Any, AsyncGenerator, Callable, Dict, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.events import Event, EventActions
+from google.adk.tools.tool_context import ToolContext
+from google.genai import types
+
+from agents.configs.email_dispatch_config import (
+    EMAIL_DISPATCH_MAX_ATTEMPTS,
+    EMAIL_DISPATCH_RETRY_SECONDS,
+    EMAIL_DISPATCH_TRANSPORT,
+    EMAIL_SUBJECT,
+)
+from agents.email_agent import email_mcp_connection
+from mcp_server.email_server import SENT_PREFIX, send_html_email
+
+SENT, FAILED, SKIPPED = "sent", "failed", "skipped"
+
+
+def _reply_text(result: Any) -> str:
+    """The text of an MCP tool result (`{"content": [{"type": "text", "text": ...}], ...}`)."""
+    if isinstance(result, dict):
+        texts = [item.get("text", "") for item in result.get("content") or [] if isinstance(item, dict)]
+        if texts:
+            return "".join(texts)
+        if "error" in result:
+            return str(result["error"])
+    return str(result)
+
+
+class EmailDispatchAgent(BaseAgent):
+    """
+    Emails the rendered report (`source_key`) without an LLM call and records a
+    delivery receipt in `output_key`.
+
+    The body is sent exactly as rendered, through the email MCP server (`transport="mcp"`)
+    or a pooled SMTP connection in this process (`transport="smtp"`). Failed sends are
+    retried with exponential backoff. `sender`, if set, replaces the transport; it takes
+    the subject and the body and returns a reply in the MCP tool's format.
+    """
+
+    source_key: str = "final_summary"
+    output_key: str = "email_receipt"
+    subject: str = EMAIL_SUBJECT
+    transport: str = EMAIL_DISPATCH_TRANSPORT
+    max_attempts: int = EMAIL_DISPATCH_MAX_ATTEMPTS
+    retry_seconds: float = EMAIL_DISPATCH_RETRY_SECONDS
+    sender: Optional[Callable[[str, str], Any]] = None
+
+    async def _send_via_mcp(self, ctx: InvocationContext, body: str) -> str:
+        tools = await email_mcp_connection.get_tools(ReadonlyContext(ctx))
+        send_email = next((tool for tool in tools if tool.name == "send_email"), None)
+        if send_email is None:
+            raise RuntimeError("The email MCP server does not offer a send_email tool.")
+        result = await send_email.run_async(
+            args={"subject": self.subject, "html_body": body}, tool_context=ToolContext(ctx)
+        )
+        return _reply_text(result)
+
+    async def _send(self, ctx: InvocationContext, body: str) -> str:
+        """Send once; returns the recipient, raises if the email was not sent (ValueError if it never will be)."""
+        if self.sender is not None:
+            reply = self.sender(self.subject, body)
+            reply = await reply if inspect.isawaitable(reply) else reply
+        elif self.transport == "smtp":
+            return await asyncio.to_thread(send_html_email, self.subject, body)
+        else:
+            reply = await self._send_via_mcp(ctx, body)
+
+        reply = str(reply)
+        if reply.startswith("Error:"):
+            raise ValueError(reply)  # Missing settings; retrying would not help
+        if not reply.startswith(SENT_PREFIX):
+            raise RuntimeError(reply)
+        return reply[len(SENT_PREFIX):].strip()
+
+    async def _dispatch(self, ctx: InvocationContext, body: Optional[str]) -> Dict[str, Any]:
+        receipt: Dict[str, Any] = {
+            "status": SKIPPED,
+            "transport": "custom" if self.sender is not None else self.transport,
+            "subject": self.subject,
+            "recipient": None,
+            "attempts": 0,
+            "sent_at": None,
+            "body_chars": len(body or ""),
+            "error": None,
+        }
+        if not body:
+            receipt["error"] = f"No '{self.source_key}' in the session state."
+            return receipt
+
+        for attempt in range(1, self.max_attempts + 1):
+            receipt["attempts"] = attempt
+            try:
+                receipt["recipient"] = await self._send(ctx, body)
+            except Exception as e:
+                receipt.update(status=FAILED, error=f"{type(e).__name__}: {e}")
+                logging.warning(f"[Email] Attempt {attempt}/{self.max_attempts} failed: {e}")
+                if isinstance(e, ValueError):
+                    break
+                if attempt < self.max_attempts:
+                    await asyncio.sleep(self.retry_seconds * 2 ** (attempt - 1))
+            else:
+                receipt.update(status=SENT, error=None, sent_at=datetime.now(timezone.utc).isoformat())
+                break
+        return receipt
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        body = ctx.session.state.get(self.source_key)
+        receipt = await self._dispatch(ctx, body if isinstance(body, str) else None)
+        if receipt["status"] == SENT:
+            text = f"Email '{self.subject}' sent to {receipt['recipient']}."
+            logging.info(f"[Email] {text}")
+        else:
+            text = f"Email '{self.subject}' was not sent: {receipt['error']}"
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=text)]),
+            actions=EventActions(state_delta={self.output_key: receipt}),
+        )
+
+
+email_dispatch_agent = EmailDispatchAgent(
+    name="EmailDispatchAgent",
+    description="Emails the rendered report and records a delivery receipt.",
+)
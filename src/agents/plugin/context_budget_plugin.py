@@ -0,0 +1,183 @@
+import json
+import logging
+import math
+from typing import Any, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+from google.genai import types
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(chars: int) -> int:
+    return math.ceil(chars / CHARS_PER_TOKEN)
+
+
+def _part_chars(part: types.Part) -> int:
+    chars = len(part.text or "")
+    if part.function_call is not None:
+        chars += len(part.function_call.name or "") + len(json.dumps(part.function_call.args or {}, default=str))
+    if part.function_response is not None:
+        chars += len(part.function_response.name or "") + len(json.dumps(part.function_response.response or {}, default=str))
+    return chars
+
+
+def _content_chars(content: types.Content) -> int:
+    return sum(_part_chars(part) for part in content.parts or [])
+
+
+def _instruction_chars(llm_request: LlmRequest) -> int:
+    instruction = llm_request.config.system_instruction if llm_request.config else None
+    if instruction is None:
+        return 0
+    if isinstance(instruction, str):
+        return len(instruction)
+    if isinstance(instruction, types.Content):
+        return _content_chars(instruction)
+    return len(str(instruction))
+
+
+def estimate_request_tokens(llm_request: LlmRequest) -> int:
+    """Rough prompt size: system instruction plus contents, at `CHARS_PER_TOKEN` characters per token."""
+    return estimate_tokens(_instruction_chars(llm_request) + sum(_content_chars(c) for c in llm_request.contents))
+
+
+def _shorten(text: str, max_chars: int) -> str:
+    return text[:max_chars] + f"\n... [{len(text) - max_chars} characters trimmed to fit the context budget]"
+
+
+def _trim_part(part: types.Part, max_chars: int) -> Optional[types.Part]:
+    """A shortened copy of `part`, or None if it is small enough already."""
+    if part.text and len(part.text) > max_chars:
+        return part.model_copy(update={"text": _shorten(part.text, max_chars)})
+    if part.function_response is not None:
+        response = json.dumps(part.function_response.response or {}, default=str)
+        if len(response) > max_chars:
+            function_response = part.function_response.model_copy(update={"response": {"result": _shorten(response, max_chars)}})
+            return part.model_copy(update={"function_response": function_response})
+    if part.function_call is not None and part.function_call.args:
+        args = {
+            name: _shorten(value, max_chars) if isinstance(value, str) and len(value) > max_chars else value
+            for name, value in part.function_call.args.items()
+        }
+        if args != part.function_call.args:
+            return part.model_copy(update={"function_call": part.function_call.model_copy(update={"args": args})})
+    return None
+
+
+def _has_function_call(content: types.Content) -> bool:
+    return any(part.function_call is not None for part in content.parts or [])
+
+
+def _only_function_responses(content: types.Content) -> bool:
+    return bool(content.parts) and all(part.function_response is not None for part in content.parts)
+
+
+def fit_contents_to_budget(
+        contents: list[types.Content], budget_tokens: int, fixed_tokens: int, keep_recent: int, part_max_chars: int,
+) -> list[types.Content]:
+    """
+    Shrink the conversation history until `fixed_tokens` (the system instruction) plus the
+    contents fit in `budget_tokens`.
+
+    The first content (the user's request) and the last `keep_recent` contents are kept as
+    they are. Oldest first, long texts and tool results are cut down to `part_max_chars`
+    characters; if that is not enough, the oldest contents are dropped, a function call
+    together with its responses. Contents and parts are replaced rather than modified, as
+    the request shares them with the session events.
+    """
+    contents = list(contents)
+    chars = [_content_chars(content) for content in contents]
+    budget_chars = (budget_tokens - fixed_tokens) * CHARS_PER_TOKEN
+    protected = max(len(contents) - keep_recent, 1)
+
+    for index in range(1, protected):
+        if sum(chars) <= budget_chars:
+            return contents
+        content = contents[index]
+        parts = [_trim_part(part, part_max_chars) or part for part in content.parts or []]
+        contents[index] = content.model_copy(update={"parts": parts})
+        chars[index] = _content_chars(contents[index])
+
+    index = 1
+    while sum(chars) > budget_chars and index < len(contents) - keep_recent:
+        if _has_function_call(contents[index]) and not (
+                index + 1 < len(contents) - keep_recent and _only_function_responses(contents[index + 1])):
+            index += 1  # Its responses are kept, so the call has to stay as well
+            continue
+        del contents[index], chars[index]
+        while index < len(contents) - keep_recent and _only_function_responses(contents[index]):
+            del contents[index], chars[index]
+    return contents
+
+
+class ContextBudgetPlugin(BasePlugin):
+    """
+    Keeps each agent's prompt within a token budget by trimming its conversation history.
+
+    The budget is `budget_by_agent[agent_name]`, falling back to `default_budget`. Requests
+    estimated above it have older text and tool results shortened, then the oldest turns
+    dropped (see `fit_contents_to_budget`); the tokens saved are counted per agent.
+    """
+
+    def __init__(
+            self,
+            default_budget: int,
+            budget_by_agent: Optional[dict[str, int]] = None,
+            keep_recent: int = 3,
+            part_max_chars: int = 1500,
+    ) -> None:
+        super().__init__(name="context_budget")
+        self.default_budget = default_budget
+        self.budget_by_agent = budget_by_agent or {}
+        self.keep_recent = keep_recent
+        self.part_max_chars = part_max_chars
+        self.trimmed_count: int = 0
+        self.saved_tokens: int = 0
+        self.per_agent_saved: dict[str, dict[str, Any]] = {}
+
+    def _budget(self, agent_name: str) -> int:
+        return self.budget_by_agent.get(agent_name, self.default_budget)
+
+    # Callback: Runs before a model is called; the request can be modified in place.
+    async def before_model_callback(
+            self, *, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        agent_name = callback_context.agent_name
+        budget = self._budget(agent_name)
+        before = estimate_request_tokens(llm_request)
+        if before <= budget:
+            return None
+
+        llm_request.contents = fit_contents_to_budget(
+            llm_request.contents,
+            budget_tokens=budget,
+            fixed_tokens=estimate_tokens(_instruction_chars(llm_request)),
+            keep_recent=self.keep_recent,
+            part_max_chars=self.part_max_chars,
+        )
+        after = estimate_request_tokens(llm_request)
+        saved = before - after
+        self.trimmed_count += 1
+        self.saved_tokens += saved
+        counts = self.per_agent_saved.setdefault(agent_name, {"requests": 0, "tokens_saved": 0})
+        counts["requests"] += 1
+        counts["tokens_saved"] += saved
+        logging.info(
+            f"[Plugin] Context budget: {agent_name} prompt ~{before} -> ~{after} tokens "
+            f"(budget {budget}, saved ~{saved})"
+        )
+        if after > budget:
+            logging.info(f"[Plugin] Context budget: {agent_name} is still over budget after trimming its history")
+        return None
+
+    # Callback: Runs once the whole run has finished.
+    async def after_run_callback(self, *, invocation_context: InvocationContext) -> None:
+        logging.info(
+            f"[Plugin] Context budget trimmed {self.trimmed_count} requests, saved ~{self.saved_tokens} tokens "
+            f"{self.per_agent_saved}"
+        )
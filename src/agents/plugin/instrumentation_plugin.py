@@ -0,0 +1,286 @@
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Optional
+
+from google.adk.agents import ParallelAgent
+from google.adk.agents.base_agent import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.tool_context import ToolContext
+
+
+@dataclass
+class Span:
+    """One timed agent run, model call or tool call."""
+    invocation_id: str
+    kind: str  # agent | model | tool
+    name: str
+    agent: str
+    branch: Optional[str]
+    start: float  # Epoch seconds
+    duration_ms: Optional[float] = None
+    queued_ms: Optional[float] = None  # Time a ParallelAgent sub-agent waited after its parent started
+    prompt_tokens: Optional[int] = None
+    response_tokens: Optional[int] = None
+    total_tokens: Optional[int] = None
+    cache_hit: Optional[bool] = None
+    status: str = "ok"  # ok | error | short_circuited
+    error: Optional[str] = None
+    _started: float = field(default=0.0, repr=False)  # perf_counter at start
+
+    def finish(self, status: str = "ok", error: Optional[BaseException] = None) -> None:
+        self.duration_ms = round((time.perf_counter() - self._started) * 1000, 3)
+        self.status = status
+        self.error = None if error is None else f"{type(error).__name__}: {error}"
+
+    def to_record(self) -> dict[str, Any]:
+        return {key: value for key, value in asdict(self).items() if not key.startswith("_")}
+
+
+class InstrumentationPlugin(BasePlugin):
+    """
+    Records wall time per agent, model call and tool call, plus token usage, for every run.
+
+    When a run finishes, its spans are appended to `<output_dir>/spans.jsonl` (one JSON
+    record per span) and written as a Chrome trace (`<output_dir>/<invocation_id>.trace.json`)
+    that can be opened in Perfetto (ui.perfetto.dev) or chrome://tracing. `spans.jsonl` is
+    rotated once it reaches `max_spans_bytes` and only the newest `keep_traces` traces are
+    kept (0 disables either limit).
+
+    Register it first so its `before_*` callbacks run even when a later plugin (such as a
+    cache) short-circuits an agent or model call; such spans are closed as `short_circuited`.
+    """
+
+    def __init__(self, output_dir: Optional[str], max_spans_bytes: int = 0, keep_traces: int = 0) -> None:
+        super().__init__(name="instrumentation")
+        self.output_dir = output_dir
+        self.max_spans_bytes = max_spans_bytes
+        self.keep_traces = keep_traces
+        self._spans: dict[str, list[Span]] = {}  # invocation id -> finished and open spans
+        self._open: dict[tuple, Span] = {}  # (invocation, kind, branch, name/call id) -> open span
+        self.last_run_spans: list[Span] = []  # Spans of the most recently finished run
+
+    def _start(self, key: tuple, **fields) -> Span:
+        span = Span(invocation_id=key[0], kind=key[1], start=time.time(), _started=time.perf_counter(), **fields)
+        self._spans.setdefault(key[0], []).append(span)
+        self._open[key] = span
+        return span
+
+    def _finish(self, key: tuple, status: str = "ok", error: Optional[BaseException] = None) -> Optional[Span]:
+        span = self._open.pop(key, None)
+        if span is not None:
+            span.finish(status, error)
+        return span
+
+    # Callback: Runs before an agent starts.
+    async def before_agent_callback(self, *, agent: BaseAgent, callback_context: CallbackContext) -> None:
+        key = (callback_context.invocation_id, "agent", callback_context.branch, agent.name)
+        span = self._start(key, name=agent.name, agent=agent.name, branch=callback_context.branch)
+
+        parent = agent.parent_agent
+        if isinstance(parent, ParallelAgent):
+            parent_span = next(
+                (open_span for (invocation_id, kind, _, name), open_span in self._open.items()
+                 if invocation_id == callback_context.invocation_id and kind == "agent" and name == parent.name),
+                None,
+            )
+            if parent_span is not None:
+                span.queued_ms = round((span._started - parent_span._started) * 1000, 3)
+        return None
+
+    # Callback: Runs after an agent that was not short-circuited.
+    async def after_agent_callback(self, *, agent: BaseAgent, callback_context: CallbackContext) -> None:
+        self._finish((callback_context.invocation_id, "agent", callback_context.branch, agent.name))
+        return None
+
+    async def on_agent_error_callback(
+            self, *, agent: BaseAgent, callback_context: CallbackContext, error: Exception
+    ) -> None:
+        self._finish((callback_context.invocation_id, "agent", callback_context.branch, agent.name), "error", error)
+
+    # Callback: Runs before a model is called.
+    async def before_model_callback(self, *, callback_context: CallbackContext, llm_request: LlmRequest) -> None:
+        key = (callback_context.invocation_id, "model", callback_context.branch, callback_context.agent_name)
+        self._start(key, name=llm_request.model or "model", agent=callback_context.agent_name,
+                    branch=callback_context.branch)
+        return None
+
+    # Callback: Runs after a model response is received.
+    async def after_model_callback(self, *, callback_context: CallbackContext, llm_response: LlmResponse) -> None:
+        if llm_response.partial:
+            return None
+        span = self._finish((callback_context.invocation_id, "model", callback_context.branch, callback_context.agent_name))
+        if span is not None:
+            _record_usage(span, llm_response)
+        return None
+
+    async def on_model_error_callback(
+            self, *, callback_context: CallbackContext, llm_request: LlmRequest, error: Exception
+    ) -> None:
+        self._finish((callback_context.invocation_id, "model", callback_context.branch, callback_context.agent_name),
+                     "error", error)
+        return None
+
+    # Callback: Runs before a tool is called.
+    async def before_tool_callback(
+            self, *, tool: BaseTool, tool_args: dict[str, Any], tool_context: ToolContext
+    ) -> None:
+        key = (tool_context.invocation_id, "tool", tool_context.branch, tool_context.function_call_id or tool.name)
+        self._start(key, name=tool.name, agent=tool_context.agent_name, branch=tool_context.branch)
+        return None
+
+    # Callback: Runs after a tool returns.
+    async def after_tool_callback(
+            self, *, tool: BaseTool, tool_args: dict[str, Any], tool_context: ToolContext, result: dict
+    ) -> None:
+        self._finish((tool_context.invocation_id, "tool", tool_context.branch, tool_context.function_call_id or tool.name))
+        return None
+
+    async def on_tool_error_callback(
+            self, *, tool: BaseTool, tool_args: dict[str, Any], tool_context: ToolContext, error: Exception
+    ) -> None:
+        self._finish((tool_context.invocation_id, "tool", tool_context.branch, tool_context.function_call_id or tool.name),
+                     "error", error)
+        return None
+
+    # Callback: Runs for every event; closes model calls answered by a before_model plugin.
+    async def on_event_callback(self, *, invocation_context: InvocationContext, event: Event) -> None:
+        if event.partial:
+            return None
+        span = self._finish((invocation_context.invocation_id, "model", event.branch, event.author), "short_circuited")
+        if span is not None:
+            _record_usage(span, event)
+        return None
+
+    # Callback: Runs once the whole run has finished.
+    async def after_run_callback(self, *, invocation_context: InvocationContext) -> None:
+        invocation_id = invocation_context.invocation_id
+        # Agents skipped by a before_agent plugin never reach after_agent_callback
+        for key in [key for key in self._open if key[0] == invocation_id]:
+            self._finish(key, "short_circuited")
+
+        spans = self._spans.pop(invocation_id, [])
+        if not spans:
+            return
+        self.last_run_spans = spans
+
+        for line in summarize_spans(spans):
+            logging.info(f"[Plugin] {line}")
+
+        if self.output_dir:
+            try:
+                paths = write_spans(spans, self.output_dir, invocation_id, self.max_spans_bytes, self.keep_traces)
+                logging.info(f"[Plugin] Trace written to {paths[1]}")
+            except OSError as e:
+                logging.warning(f"[Plugin] Could not write trace files: {e}")
+
+
+def _record_usage(span: Span, response: LlmResponse) -> None:
+    usage = response.usage_metadata
+    if usage is not None:
+        span.prompt_tokens = usage.prompt_token_count
+        span.response_tokens = usage.candidates_token_count
+        span.total_tokens = usage.total_token_count
+    span.cache_hit = bool((response.custom_metadata or {}).get("llm_cache_hit"))
+
+
+def summarize_spans(spans: list[Span]) -> list[str]:
+    """One line per agent with its wall time, model time, tool time and token usage."""
+    totals: dict[str, dict[str, float]] = {}
+    for span in spans:
+        agent_totals = totals.setdefault(span.agent, {"agent_ms": 0, "model_ms": 0, "model_calls": 0,
+                                                      "tool_ms": 0, "tool_calls": 0, "tokens": 0})
+        duration = span.duration_ms or 0
+        if span.kind == "agent":
+            agent_totals["agent_ms"] += duration
+        elif span.kind == "model":
+            agent_totals["model_ms"] += duration
+            agent_totals["model_calls"] += 1
+            agent_totals["tokens"] += span.total_tokens or 0
+        else:
+            agent_totals["tool_ms"] += duration
+            agent_totals["tool_calls"] += 1
+
+    return [
+        f"{agent}: {t['agent_ms']:.0f} ms total, {t['model_calls']:.0f} model calls ({t['model_ms']:.0f} ms, "
+        f"{t['tokens']:.0f} tokens), {t['tool_calls']:.0f} tool calls ({t['tool_ms']:.0f} ms)"
+        for agent, t in totals.items()
+    ]
+
+
+def to_chrome_trace(spans: list[Span]) -> dict[str, Any]:
+    """Convert spans to the Chrome trace event format (complete `X` events, one lane per agent)."""
+    origin = min(span.start for span in spans)
+    lanes: dict[str, int] = {}
+    events = []
+    for span in sorted(spans, key=lambda s: s.start):
+        tid = lanes.setdefault(span.branch or span.agent, len(lanes) + 1)
+        events.append({
+            "name": span.name if span.kind == "agent" else f"{span.kind}: {span.name}",
+            "cat": span.kind,
+            "ph": "X",
+            "ts": round((span.start - origin) * 1_000_000),
+            "dur": round((span.duration_ms or 0) * 1000),
+            "pid": 1,
+            "tid": tid,
+            "args": {key: value for key, value in span.to_record().items()
+                     if value is not None and key not in ("name", "start", "duration_ms")},
+        })
+    events.extend(
+        {"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": lane}}
+        for lane, tid in lanes.items()
+    )
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def write_spans(
+        spans: list[Span],
+        output_dir: str,
+        invocation_id: str,
+        max_spans_bytes: int = 0,
+        keep_traces: int = 0,
+) -> tuple[str, str]:
+    """
+    Append the spans to `spans.jsonl` and write the run's Chrome trace; returns both paths.
+
+    A `spans.jsonl` of `max_spans_bytes` or more is first moved to `spans.jsonl.1` (replacing
+    the previous one), and afterwards only the newest `keep_traces` trace files are kept.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    jsonl_path = os.path.join(output_dir, "spans.jsonl")
+    trace_path = os.path.join(output_dir, f"{invocation_id}.trace.json")
+
+    if max_spans_bytes > 0 and os.path.exists(jsonl_path) and os.path.getsize(jsonl_path) >= max_spans_bytes:
+        os.replace(jsonl_path, f"{jsonl_path}.1")
+    with open(jsonl_path, "a", encoding="utf-8") as f:
+        for span in spans:
+            f.write(json.dumps(span.to_record()) + "\n")
+    with open(trace_path, "w", encoding="utf-8") as f:
+        json.dump(to_chrome_trace(spans), f)
+    if keep_traces > 0:
+        prune_traces(output_dir, keep_traces)
+    return jsonl_path, trace_path
+
+
+def prune_traces(output_dir: str, keep: int) -> None:
+    """Delete all but the `keep` most recently written `*.trace.json` files in `output_dir`."""
+    traces = []
+    for entry in os.scandir(output_dir):
+        if entry.name.endswith(".trace.json"):
+            try:
+                traces.append((entry.stat().st_mtime, entry.path))
+            except FileNotFoundError:  # Pruned concurrently by another process
+                pass
+    for _, path in sorted(traces, reverse=True)[keep:]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
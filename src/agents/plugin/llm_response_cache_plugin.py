@@ -0,0 +1,108 @@
+import hashlib
+import json
+import logging
+from typing import Any, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+
+# Per-call or transport-only fields that do not change what the model answers
+_IGNORED_CONFIG_FIELDS = {"http_options", "labels"}
+
+
+def _content_for_key(content: dict[str, Any]) -> dict[str, Any]:
+    """Drop the function call / response ids, which are generated anew for every call."""
+    parts = []
+    for part in content.get("parts", []):
+        part = dict(part)
+        for field in ("function_call", "function_response"):
+            if field in part:
+                part[field] = {key: value for key, value in part[field].items() if key != "id"}
+        parts.append(part)
+    return {**content, "parts": parts}
+
+
+def llm_request_key(llm_request: LlmRequest) -> str:
+    """Hash the model, config (system instruction, tools, schema, ...) and contents of a request."""
+    config = llm_request.config.model_dump(mode="json", exclude_none=True, exclude=_IGNORED_CONFIG_FIELDS)
+    contents = [_content_for_key(content.model_dump(mode="json", exclude_none=True)) for content in llm_request.contents]
+    payload = json.dumps(
+        {"model": llm_request.model, "config": config, "contents": contents},
+        sort_keys=True,
+    )
+    return "llm:" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LlmResponseCachePlugin(BasePlugin):
+    """
+    Serves repeated, identical LLM requests from a cache instead of the model.
+
+    `cache` is any backend from `utils.cache_utils` (in-memory LRU, SQLite, tiered). A
+    response is stored for `ttl_by_agent[agent_name]` seconds, falling back to
+    `default_ttl`; a TTL of 0 disables caching for that agent.
+    """
+
+    def __init__(self, cache, default_ttl: Optional[float], ttl_by_agent: Optional[dict[str, float]] = None) -> None:
+        super().__init__(name="llm_response_cache")
+        self.cache = cache
+        self.default_ttl = default_ttl
+        self.ttl_by_agent = ttl_by_agent or {}
+        self.hit_count: int = 0
+        self.miss_count: int = 0
+        self.per_agent_counts: dict[str, dict[str, int]] = {}
+        self._pending_keys: dict[tuple, str] = {}  # (invocation, branch, agent) -> key of the request in flight
+
+    def _ttl(self, agent_name: str) -> Optional[float]:
+        return self.ttl_by_agent.get(agent_name, self.default_ttl)
+
+    def _count(self, agent_name: str, outcome: str) -> None:
+        counts = self.per_agent_counts.setdefault(agent_name, {"hits": 0, "misses": 0})
+        counts[outcome] += 1
+
+    # Callback: Runs before a model is called; returning a response skips the call.
+    async def before_model_callback(
+            self, *, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        agent_name = callback_context.agent_name
+        if self._ttl(agent_name) == 0:
+            return None
+
+        key = llm_request_key(llm_request)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.hit_count += 1
+            self._count(agent_name, "hits")
+            logging.info(f"[Plugin] LLM cache hit for {agent_name} (hits: {self.hit_count}, misses: {self.miss_count})")
+            response = LlmResponse.model_validate(cached)
+            response.custom_metadata = {**(response.custom_metadata or {}), "llm_cache_hit": True}
+            return response
+
+        self.miss_count += 1
+        self._count(agent_name, "misses")
+        self._pending_keys[(callback_context.invocation_id, callback_context.branch, agent_name)] = key
+        return None
+
+    # Callback: Runs after a model response is received.
+    async def after_model_callback(
+            self, *, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> None:
+        if llm_response.partial:
+            return None
+
+        agent_name = callback_context.agent_name
+        key = self._pending_keys.pop((callback_context.invocation_id, callback_context.branch, agent_name), None)
+        if key is None or llm_response.error_code or llm_response.content is None:
+            return None
+
+        self.cache.set(key, llm_response.model_dump(mode="json", exclude_none=True), ttl=self._ttl(agent_name))
+        return None
+
+    # Callback: Runs once the whole run has finished.
+    async def after_run_callback(self, *, invocation_context: InvocationContext) -> None:
+        # Requests that failed never reach after_model_callback
+        for pending in [pending for pending in self._pending_keys if pending[0] == invocation_context.invocation_id]:
+            del self._pending_keys[pending]
+        logging.info(f"[Plugin] LLM cache hits: {self.hit_count}, misses: {self.miss_count}")
@@ -0,0 +1,149 @@
+import datetime
+import hashlib
+import json
+import logging
+import re
+from typing import Any, Optional
+from zoneinfo import ZoneInfo
+
+from google.adk.agents.base_agent import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.plugins.base_plugin import BasePlugin
+from google.genai import types
+
+from agents.configs.pipeline_cache_config import PIPELINE_STAGE_INPUTS
+
+MARKET_TIMEZONE = ZoneInfo("America/New_York")
+_THEME_RE = re.compile(r"The thematic topic is: '(?P<theme>.*)'\.", re.DOTALL)
+
+
+def normalize_theme(text: str) -> str:
+    """Case-fold the theme and collapse whitespace and surrounding punctuation."""
+    theme_match = _THEME_RE.search(text)
+    theme = theme_match.group("theme") if theme_match else text
+    return " ".join(theme.casefold().split()).strip(" '\".,;:!?")
+
+
+def trading_date(now: Optional[datetime.datetime] = None) -> str:
+    """The latest US trading weekday (in New York time) on or before `now`; holidays are not skipped."""
+    today = (now or datetime.datetime.now(MARKET_TIMEZONE)).astimezone(MARKET_TIMEZONE).date()
+    while today.weekday() >= 5:  # Saturday / Sunday -> Friday
+        today -= datetime.timedelta(days=1)
+    return today.isoformat()
+
+
+def model_config_fingerprint(agent: BaseAgent) -> str:
+    """Hash the models, instructions and output keys of every agent in the tree."""
+    config = []
+
+    def collect(node: BaseAgent) -> None:
+        model = getattr(node, "model", None)
+        instruction = getattr(node, "instruction", None)
+        config.append([
+            node.name,
+            getattr(model, "model", model) if model is not None else None,
+            instruction if isinstance(instruction, str) else None,
+            getattr(node, "output_key", None),
+        ])
+        for sub_agent in node.sub_agents:
+            collect(sub_agent)
+
+    collect(agent)
+    return _hash(config)
+
+
+def _hash(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class PipelineCachePlugin(BasePlugin):
+    """
+    Reuses stage outputs of earlier runs for the same theme, trading day and model config.
+
+    Before an agent whose `output_key` is listed in `stage_inputs` runs, its output is looked
+    up under the run key plus a hash of the upstream state it depends on. On a hit the output
+    is written to the session state and the agent is skipped; on a miss the output the agent
+    writes during this run is stored once it finishes.
+    """
+
+    def __init__(self, cache, ttl_seconds: Optional[float], stage_inputs: dict[str, list[str]] = None) -> None:
+        super().__init__(name="pipeline_cache")
+        self.cache = cache
+        self.ttl_seconds = ttl_seconds
+        self.stage_inputs = PIPELINE_STAGE_INPUTS if stage_inputs is None else stage_inputs
+        self.hit_count: int = 0
+        self.miss_count: int = 0
+        self._run_keys: dict[str, str] = {}  # invocation id -> run key
+        self._fingerprints: dict[int, str] = {}  # id(root agent) -> model config fingerprint
+
+    def _stage_key(self, invocation_id: str, output_key: str, state) -> Optional[str]:
+        run_key = self._run_keys.get(invocation_id)
+        if run_key is None or output_key not in self.stage_inputs:
+            return None
+        upstream = {key: state.get(key) for key in self.stage_inputs[output_key]}
+        return f"pipeline:{run_key}:{output_key}:{_hash(upstream)}"
+
+    # Callback: Runs when a user message starts a new invocation.
+    async def on_user_message_callback(
+            self, *, invocation_context: InvocationContext, user_message: types.Content
+    ) -> None:
+        text = "".join(part.text or "" for part in (user_message.parts or []))
+        theme = normalize_theme(text)
+        if not theme:
+            return None
+
+        root_agent = invocation_context.agent
+        if id(root_agent) not in self._fingerprints:
+            self._fingerprints[id(root_agent)] = model_config_fingerprint(root_agent)
+
+        self._run_keys[invocation_context.invocation_id] = _hash(
+            [theme, trading_date(), self._fingerprints[id(root_agent)]]
+        )
+        logging.info(f"[Plugin] Pipeline cache key for theme '{theme}' on {trading_date()}")
+        return None
+
+    # Callback: Runs before an agent; returning content skips the agent.
+    async def before_agent_callback(
+            self, *, agent: BaseAgent, callback_context: CallbackContext
+    ) -> Optional[types.Content]:
+        output_key = getattr(agent, "output_key", None)
+        stage_key = output_key and self._stage_key(callback_context.invocation_id, output_key, callback_context.state)
+        if stage_key is None:
+            return None
+
+        cached = self.cache.get(stage_key)
+        if cached is None:
+            self.miss_count += 1
+            return None
+
+        self.hit_count += 1
+        logging.info(f"[Plugin] Pipeline cache hit: {agent.name} ({output_key}) skipped")
+        callback_context.state[output_key] = cached
+        text = cached if isinstance(cached, str) else json.dumps(cached)
+        return types.Content(role="model", parts=[types.Part(text=text)])
+
+    # Callback: Runs after an agent that was not skipped.
+    async def after_agent_callback(
+            self, *, agent: BaseAgent, callback_context: CallbackContext
+    ) -> None:
+        output_key = getattr(agent, "output_key", None)
+        stage_key = output_key and self._stage_key(callback_context.invocation_id, output_key, callback_context.state)
+        if stage_key is None:
+            return None
+
+        # Only store output written in this invocation, not a value left over from an earlier run
+        written = any(
+            event.invocation_id == callback_context.invocation_id
+            and output_key in (event.actions.state_delta or {})
+            for event in callback_context.session.events
+        )
+        value = callback_context.state.get(output_key)
+        if written and value is not None:
+            self.cache.set(stage_key, value, ttl=self.ttl_seconds)
+        return None
+
+    # Callback: Runs once the whole run has finished.
+    async def after_run_callback(self, *, invocation_context: InvocationContext) -> None:
+        self._run_keys.pop(invocation_context.invocation_id, None)
+        logging.info(f"[Plugin] Pipeline cache hits: {self.hit_count}, misses: {self.miss_count}")
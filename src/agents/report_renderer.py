@@ -0,0 +1,184 @@
+import html
+from typing import Any, AsyncGenerator, Dict, List, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+from pydantic import ValidationError
+
+from agents.analysts_team.deterministic_analyst import scanned_tickers_from_state
+from agents.data_models.summary_agent_data_model import SummaryNarrative
+from utils.json_utils import iter_json_values
+
+SIGNAL_COLORS = {
+    "bullish": "#137333",
+    "bearish": "#c5221f",
+    "neutral": "#5f6368",
+    "STRONG BUY": "#137333",
+    "BUY": "#137333",
+    "NEUTRAL": "#5f6368",
+    "SELL": "#c5221f",
+    "STRONG SELL": "#c5221f",
+}
+NO_SIGNAL_COLOR = "#5f6368"
+
+# (state key, label) of the analyst outputs, in table column order
+ANALYSIS_SOURCES = [
+    ("structured_technical_analyst_findings", "Technical Analysis"),
+    ("structured_institution_rating_findings", "Institutional Ratings"),
+    ("structured_social_media_sentiment_findings", "Social Sentiment"),
+]
+
+TABLE_STYLE = "border-collapse: collapse; width: 100%; border-color: #e0e0e0;"
+HEADER_STYLE = "background-color: #f3f4f6; text-align: left; padding: 8px;"
+CELL_STYLE = "padding: 8px; vertical-align: top;"
+
+
+def findings_by_symbol(value: Any) -> Dict[str, Dict[str, Any]]:
+    """
+    Index an analyst's findings by ticker symbol.
+
+    Accepts a list of findings, an object wrapping the list under any key (for example
+    `aggregated_sentiment` or `institution_ratings`), or either of those as JSON text,
+    possibly with surrounding prose or code fences.
+    """
+    candidates = iter_json_values(value) if isinstance(value, str) else [value]
+    for candidate in candidates:
+        if isinstance(candidate, dict):
+            candidate = next((item for item in candidate.values() if isinstance(item, list)), None)
+        if isinstance(candidate, list):
+            findings = {
+                str(item["symbol"]).upper(): item
+                for item in candidate if isinstance(item, dict) and item.get("symbol")
+            }
+            if findings:
+                return findings
+    return {}
+
+
+def parse_narrative(value: Any) -> Optional[SummaryNarrative]:
+    """The summarizer's structured output (a dict, or JSON text), or None if it is missing or invalid."""
+    candidates = iter_json_values(value) if isinstance(value, str) else [value]
+    for candidate in candidates:
+        try:
+            return SummaryNarrative.model_validate(candidate)
+        except ValidationError:
+            continue
+    return None
+
+
+def _signal_cell(signal: Optional[str]) -> str:
+    label = signal.capitalize() if signal else "N/A"
+    color = SIGNAL_COLORS.get(signal or "", NO_SIGNAL_COLOR)
+    return f'<td style="{CELL_STYLE} color: {color}; font-weight: bold;">{html.escape(label)}</td>'
+
+
+def _signal(finding: Optional[Dict[str, Any]]) -> Optional[str]:
+    signal = (finding or {}).get("aggregated_sentiment")
+    return signal.lower() if isinstance(signal, str) and signal.upper() != "N/A" else None
+
+
+def render_report(state: Dict[str, Any]) -> str:
+    """
+    Render the email body from the session state.
+
+    The executive summary and key drivers come from `summary_narrative`; the signal
+    overview and the per-ticker deep dive tables are built from the three analyst
+    outputs. All values are HTML-escaped and only inline CSS is used.
+    """
+    narrative = parse_narrative(state.get("summary_narrative"))
+    findings = {key: findings_by_symbol(state.get(key)) for key, _ in ANALYSIS_SOURCES}
+
+    company_names = {
+        ticker["symbol"].upper(): ticker.get("company_name") or ticker["symbol"]
+        for ticker in scanned_tickers_from_state(state.get("structured_ticker_scanner_findings"))
+    }
+    symbols: List[str] = list(company_names)
+    for source_findings in findings.values():
+        for symbol, finding in source_findings.items():
+            if symbol not in company_names:
+                symbols.append(symbol)
+                company_names[symbol] = finding.get("company_name") or symbol
+
+    parts = ['<div style="max-width: 600px; font-family: Arial, Helvetica, sans-serif; color: #202124;">']
+
+    parts.append('<h2 style="margin: 0 0 12px 0;">Executive Summary</h2>')
+    if narrative is not None:
+        signal = narrative.overall_signal.value
+        parts.append(
+            f'<p style="margin: 0 0 16px 0;"><strong style="color: {SIGNAL_COLORS[signal]};">{signal}</strong> '
+            f"&mdash; {html.escape(narrative.executive_summary)}</p>"
+        )
+        parts.append('<h3 style="margin: 16px 0 8px 0;">Key Drivers</h3><ul style="margin: 0; padding-left: 20px;">')
+        parts.extend(f"<li>{html.escape(driver)}</li>" for driver in narrative.key_drivers)
+        parts.append("</ul>")
+    else:
+        parts.append('<p style="margin: 0 0 16px 0;">No written summary is available for this run.</p>')
+
+    if symbols:
+        parts.append('<h3 style="margin: 24px 0 8px 0;">Signal Overview</h3>')
+        parts.append(f'<table border="1" cellpadding="0" cellspacing="0" style="{TABLE_STYLE}"><tr>')
+        parts.append(f'<th style="{HEADER_STYLE}">Ticker</th>')
+        parts.extend(f'<th style="{HEADER_STYLE}">{label}</th>' for _, label in ANALYSIS_SOURCES)
+        parts.append("</tr>")
+        for symbol in symbols:
+            parts.append(
+                f'<tr><td style="{CELL_STYLE}"><strong>{html.escape(symbol)}</strong><br>'
+                f'<span style="color: #5f6368;">{html.escape(company_names[symbol])}</span></td>'
+            )
+            parts.extend(_signal_cell(_signal(findings[key].get(symbol))) for key, _ in ANALYSIS_SOURCES)
+            parts.append("</tr>")
+        parts.append("</table>")
+
+        parts.append('<h3 style="margin: 24px 0 8px 0;">Deep Dive</h3>')
+        for symbol in symbols:
+            parts.append(
+                f'<p style="margin: 16px 0 6px 0;"><strong>{html.escape(symbol)}</strong> '
+                f"&middot; {html.escape(company_names[symbol])}</p>"
+            )
+            parts.append(
+                f'<table border="1" cellpadding="0" cellspacing="0" style="{TABLE_STYLE}"><tr>'
+                f'<th style="{HEADER_STYLE}">Analysis Source</th>'
+                f'<th style="{HEADER_STYLE}">Signal (Bullish/Bearish/Neutral)</th>'
+                f'<th style="{HEADER_STYLE}">Key Justification</th></tr>'
+            )
+            for key, label in ANALYSIS_SOURCES:
+                finding = findings[key].get(symbol)
+                justification = (finding or {}).get("justification") or "No data available."
+                if (finding or {}).get("period"):
+                    # Institutional ratings are monthly; say which month the signal is from
+                    justification = f"{justification} (Period: {finding['period']})"
+                parts.append(
+                    f'<tr><td style="{CELL_STYLE}">{label}</td>{_signal_cell(_signal(finding))}'
+                    f'<td style="{CELL_STYLE}">{html.escape(str(justification))}</td></tr>'
+                )
+            parts.append("</table>")
+
+    parts.append("</div>")
+    return "\n".join(parts)
+
+
+class ReportRendererAgent(BaseAgent):
+    """
+    Renders the final email body (`output_key`) from the summarizer's narrative and the
+    analyst outputs, without an LLM call.
+    """
+
+    output_key: str = "final_summary"
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        report = render_report(dict(ctx.session.state))
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=report)]),
+            actions=EventActions(state_delta={self.output_key: report}),
+        )
+
+
+report_renderer_agent = ReportRendererAgent(
+    name="ReportRendererAgent",
+    description="Renders the HTML email body from the summary narrative and the analyst findings.",
+)
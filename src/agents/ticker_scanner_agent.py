@@ -1,8 +1,20 @@
+import logging
+import os
+from typing import AsyncGenerator, Optional
+
 from agents.configs.retry_config import retry_config
 from agents.data_models.ticker_scanner_agent_data_model import ScannerAgentListOutput
-from google.adk.agents import Agent, SequentialAgent
+from google.adk.agents import Agent, BaseAgent, SequentialAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
 from google.adk.models.google_llm import Gemini
 from google.adk.tools import google_search
+from pydantic import PrivateAttr, ValidationError
+
+from utils.json_utils import iter_json_values
+
+# Parse the raw scanner output locally and only use the JSON enforcement agent when that fails
+SCANNER_LOCAL_PARSE: bool = os.getenv("SCANNER_LOCAL_PARSE", "true").lower() == "true"
 
 model = Gemini(
     model="gemini-2.5-flash-lite",
@@ -107,9 +119,88 @@ structured_ticker_scanner_agent = Agent(
 print("✅ Structured Ticker Scanner Agent created.")
 
 # -----  FULL TICKER SCANNER AGENT -----
-root_ticker_scanner_agent = SequentialAgent(
-    name="root_ticker_scanner_agent",
-    sub_agents=[raw_ticker_scanner_agent, structured_ticker_scanner_agent],
-)
+def parse_scanner_output(text: str) -> Optional[ScannerAgentListOutput]:
+    """
+    Parse the raw scanner text into `ScannerAgentListOutput` without an LLM.
+
+    Accepts a bare list of tickers (the format the raw prompt asks for) or an object with a
+    `scanned_tickers` / `scanned_stocks` list, wrapped in any prose or code fences.
+
+    Returns:
+        The validated output, or None if no JSON value in the text matches the schema.
+    """
+    for value in iter_json_values(text):
+        if isinstance(value, dict):
+            value = value.get("scanned_tickers", value.get("scanned_stocks"))
+        if not isinstance(value, list) or not value:
+            continue
+        try:
+            output = ScannerAgentListOutput.model_validate({"scanned_tickers": value})
+        except ValidationError:
+            continue
+        for ticker in output.scanned_tickers:
+            ticker.symbol = ticker.symbol.strip().upper()
+        return output
+    return None
+
+
+class LocalParseScannerAgent(BaseAgent):
+    """
+    Runs the raw (google_search) scanner, then parses its output locally.
+
+    The JSON enforcement agent only runs when local parsing fails. How often that happens
+    is counted for the lifetime of the process and logged after every scan.
+    """
+
+    raw_agent: BaseAgent
+    fallback_agent: BaseAgent
+    raw_output_key: str = "raw_ticker_scanner_findings"
+    structured_output_key: str = "structured_ticker_scanner_findings"
+
+    _scan_count: int = PrivateAttr(default=0)
+    _fallback_count: int = PrivateAttr(default=0)
+
+    def __init__(self, **data) -> None:
+        super().__init__(sub_agents=[data["raw_agent"], data["fallback_agent"]], **data)
+
+    @property
+    def fallback_rate(self) -> float:
+        return self._fallback_count / self._scan_count if self._scan_count else 0.0
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        async for event in self.raw_agent.run_async(ctx):
+            yield event
+
+        self._scan_count += 1
+        parsed = parse_scanner_output(ctx.session.state.get(self.raw_output_key) or "")
+        if parsed is not None:
+            yield Event(
+                invocation_id=ctx.invocation_id,
+                author=self.name,
+                branch=ctx.branch,
+                actions=EventActions(state_delta={self.structured_output_key: parsed.model_dump()}),
+            )
+        else:
+            self._fallback_count += 1
+            async for event in self.fallback_agent.run_async(ctx):
+                yield event
+
+        logging.info(
+            f"[Scanner] JSON enforcement fallback used in {self._fallback_count} of {self._scan_count} scans "
+            f"({self.fallback_rate:.0%})"
+        )
+
+
+if SCANNER_LOCAL_PARSE:
+    root_ticker_scanner_agent = LocalParseScannerAgent(
+        name="root_ticker_scanner_agent",
+        raw_agent=raw_ticker_scanner_agent,
+        fallback_agent=structured_ticker_scanner_agent,
+    )
+else:
+    root_ticker_scanner_agent = SequentialAgent(
+        name="root_ticker_scanner_agent",
+        sub_agents=[raw_ticker_scanner_agent, structured_ticker_scanner_agent],
+    )
 
 print("✅ Root Ticker Scanner Agent created.")
@@ -0,0 +1,67 @@
+"""
+Analyze many thematic topics in one batch run.
+
+Usage (from the repository root):
+    python src/batch_main.py "Mega 7" "AI Datacenter" "Robotics"
+    python src/batch_main.py --themes-file themes.txt --max-concurrency 8 --no-email
+    python src/batch_main.py --themes-file themes.txt --workers 8
+
+`themes.txt` holds one theme per line; empty lines and lines starting with `#` are ignored.
+"""
+
+import argparse
+import asyncio
+import logging
+
+from dotenv import load_dotenv
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(name)s - %(message)s")
+
+# load API keys and settings
+load_dotenv()
+
+from agents.email_agent import email_mcp_connection
+from orchestration.batch_runner import BATCH_MAX_CONCURRENCY, BatchRunner
+from orchestration.worker_pool import WorkerPool
+
+
+def read_themes_file(path: str) -> list[str]:
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the trading idea pipeline for several themes.")
+    parser.add_argument("themes", nargs="*", help="Thematic topics to analyze.")
+    parser.add_argument("--themes-file", help="File with one thematic topic per line.")
+    parser.add_argument("--max-concurrency", type=int, default=BATCH_MAX_CONCURRENCY,
+                        help="Themes processed at the same time.")
+    parser.add_argument("--no-email", action="store_true", help="Do not email the summaries.")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Run one job per theme in this many worker processes instead of in this process.")
+    args = parser.parse_args()
+
+    themes = list(args.themes)
+    if args.themes_file:
+        themes += read_themes_file(args.themes_file)
+    if not themes:
+        parser.error("no themes given")
+
+    try:
+        if args.workers > 0:
+            with WorkerPool(num_workers=args.workers, send_email=not args.no_email) as pool:
+                results = await asyncio.to_thread(pool.run, themes)
+        else:
+            runner = BatchRunner(max_concurrency=args.max_concurrency, send_email=not args.no_email)
+            results = await runner.run(themes)
+    finally:
+        # Explicitly close the MCP connection to avoid asyncio errors on exit
+        await email_mcp_connection.close()
+
+    for result in results:
+        status = "FAILED: " + result.error if result.error else f"{len(result.tickers)} tickers"
+        print(f"{result.theme}: {status}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -11,16 +11,22 @@ except Exception:
     pass
 
 
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "thematic-trading-idea")
+
+
 @dataclass(frozen=True)
 class Settings:
     default_agent_name: str = "hello-agent"
     google_api_key: Optional[str] = None
+    # Root directory for on-disk caches and local stores (price history, sessions, ...)
+    cache_dir: str = DEFAULT_CACHE_DIR
 
     @staticmethod
     def from_env() -> "Settings":
         return Settings(
             default_agent_name=os.getenv("DEFAULT_AGENT_NAME", "hello-agent"),
             google_api_key=os.getenv("GOOGLE_API_KEY"),
+            cache_dir=os.getenv("CACHE_DIR", DEFAULT_CACHE_DIR),
         )
 
 settings = Settings.from_env()
\ No newline at end of file
@@ -0,0 +1,56 @@
+"""
+Non-blocking variants of the analyst tools.
+
+The analyst tools do blocking network I/O (Yahoo Finance, Finnhub, Bluesky). ADK calls
+synchronous tools directly on the event loop thread, so the analysts in
+`ParallelAnalystAgentTeam` would wait for each other's tool calls. The wrappers below run
+the same functions in a worker thread and return awaitables, so the tool calls of the
+three analysts overlap.
+
+The wrappers keep the wrapped function's name, signature and docstring, so the tool
+declarations seen by the LLM are unchanged.
+
+The batch runner registers per-ticker memoized variants of these tools instead (see
+`memoized_analyst_tools`), so tickers shared by several themes are fetched once.
+"""
+
+import asyncio
+import functools
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+from function_tools.fetch_prce_and_technical_analysis import fetch_price_and_technical_analysis
+from function_tools.get_and_analyze_institution_rating import run_analysis_for_multiple_tickers
+from function_tools.get_bluesky_posts import get_bluesky_posts
+from function_tools.score_social_sentiment import get_social_sentiment_summary
+from function_tools.ticker_memo import memoize_per_ticker
+
+T = TypeVar("T")
+
+
+def run_in_thread(func: Callable[..., T]) -> Callable[..., Awaitable[T]]:
+    """Wrap a blocking function as a coroutine function that runs it via `asyncio.to_thread`."""
+
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> T:
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    return wrapper
+
+
+fetch_price_and_technical_analysis_async = run_in_thread(fetch_price_and_technical_analysis)
+run_analysis_for_multiple_tickers_async = run_in_thread(run_analysis_for_multiple_tickers)
+get_bluesky_posts_async = run_in_thread(get_bluesky_posts)
+get_social_sentiment_summary_async = run_in_thread(get_social_sentiment_summary)
+
+
+def memoized_analyst_tools() -> Dict[Callable[..., Any], Callable[..., Awaitable[Any]]]:
+    """Map each analyst tool above to a variant that memoizes its results per ticker."""
+    return {
+        fetch_price_and_technical_analysis_async: run_in_thread(
+            memoize_per_ticker(fetch_price_and_technical_analysis)
+        ),
+        run_analysis_for_multiple_tickers_async: run_in_thread(
+            memoize_per_ticker(run_analysis_for_multiple_tickers, symbols_arg="tickers")
+        ),
+        get_social_sentiment_summary_async: run_in_thread(memoize_per_ticker(get_social_sentiment_summary)),
+    }
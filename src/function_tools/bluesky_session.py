@@ -0,0 +1,151 @@
+"""
+Shared, authenticated Bluesky client for all post searches in this process.
+
+Logging in is a network round-trip with its own rate limit, so instead of creating a
+new `atproto.Client` per search, `BlueskySessionManager` logs in once and hands the
+same client to every caller. The session string is exported to disk whenever it is
+created or refreshed, so the next process can resume the session without a password
+login. Access tokens are refreshed by the client itself when they expire; if the
+stored session is rejected (for example an expired refresh token), the manager falls
+back to a fresh password login once.
+
+Environment variables:
+- BLUESKY_USERNAME / BLUESKY_APP_PASSWORD: Account credentials.
+- BLUESKY_SESSION_PATH: Where to persist the session string
+  (default `<CACHE_DIR>/bluesky_session.txt`).
+"""
+
+import os
+import threading
+from typing import Callable, Optional, TypeVar
+
+from atproto import Client, SessionEvent
+from atproto.exceptions import BadRequestError, LoginRequiredError, UnauthorizedError
+from dotenv import load_dotenv
+
+from configs.settings import settings
+
+load_dotenv()
+
+# --- Configuration ---
+# To get an App Password, go to Bluesky > Settings > Privacy & Security > App Passwords.
+BLUESKY_USERNAME: str | None = os.getenv("BLUESKY_USERNAME")
+BLUESKY_APP_PASSWORD: str | None = os.getenv("BLUESKY_APP_PASSWORD")
+BLUESKY_SESSION_PATH: str = os.getenv("BLUESKY_SESSION_PATH", os.path.join(settings.cache_dir, "bluesky_session.txt"))
+
+T = TypeVar("T")
+
+
+def _is_session_error(error: Exception) -> bool:
+    """True if the error means the current session is no longer accepted by the server."""
+    if isinstance(error, (UnauthorizedError, LoginRequiredError)):
+        return True
+    return isinstance(error, BadRequestError) and "token" in str(error).lower()
+
+
+class BlueskySessionManager:
+    """
+    Lazily logs in once and shares the authenticated client between callers and threads.
+
+    Args:
+        username: Bluesky handle used for password logins.
+        password: Bluesky app password.
+        session_path: File used to persist the exported session string (None disables it).
+    """
+
+    def __init__(self, username: str | None, password: str | None, session_path: Optional[str]) -> None:
+        self.username = username
+        self.password = password
+        self.session_path = session_path
+        self._client: Optional[Client] = None
+        self._lock = threading.Lock()
+
+    def get_client(self) -> Client:
+        """
+        Return the shared authenticated client, logging in on first use.
+
+        :raises ValueError: If no credentials are configured.
+        :raises atproto.exceptions.AtProtocolError: If the login fails.
+        """
+        with self._lock:
+            if self._client is None:
+                self._client = self._login()
+            return self._client
+
+    def invalidate(self, client: Client) -> None:
+        """Drop `client` (if it is still the shared one) and its stored session."""
+        with self._lock:
+            if self._client is client:
+                self._client = None
+                self._remove_session_string()
+
+    def call(self, request: Callable[[Client], T]) -> T:
+        """
+        Run `request` with the shared client, re-authenticating once if the session was rejected.
+        """
+        client = self.get_client()
+        try:
+            return request(client)
+        except Exception as e:
+            if not _is_session_error(e):
+                raise
+
+            print(f"Bluesky session rejected ({e}); logging in again.")
+            self.invalidate(client)
+            return request(self.get_client())
+
+    def _login(self) -> Client:
+        client = Client()
+        client.on_session_change(lambda event, session: self._on_session_change(client, event))
+
+        session_string = self._load_session_string()
+        if session_string:
+            try:
+                # Resuming a session needs no network call; the token is refreshed on demand
+                client.login(session_string=session_string, fetch_bsky_profile=False)
+                return client
+            except Exception as e:
+                print(f"Stored Bluesky session could not be restored ({e}); logging in with password.")
+                self._remove_session_string()
+
+        if not self.username or not self.password:
+            raise ValueError("Bluesky username and app password are not set.")
+
+        client.login(self.username, self.password, fetch_bsky_profile=False)
+        return client
+
+    def _on_session_change(self, client: Client, event: SessionEvent) -> None:
+        if event in (SessionEvent.CREATE, SessionEvent.REFRESH):
+            self._save_session_string(client.export_session_string())
+
+    def _load_session_string(self) -> Optional[str]:
+        if not self.session_path or not os.path.exists(self.session_path):
+            return None
+        try:
+            with open(self.session_path, encoding="utf-8") as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    def _save_session_string(self, session_string: str) -> None:
+        if not self.session_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.session_path)), exist_ok=True)
+            # The session string is a credential: keep it readable by the owner only
+            fd = os.open(self.session_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(session_string)
+        except OSError as e:
+            print(f"Warning: Could not persist Bluesky session ({e}).")
+
+    def _remove_session_string(self) -> None:
+        if self.session_path and os.path.exists(self.session_path):
+            try:
+                os.remove(self.session_path)
+            except OSError:
+                pass
+
+
+# Shared by every Bluesky search in this process
+bluesky_session_manager = BlueskySessionManager(BLUESKY_USERNAME, BLUESKY_APP_PASSWORD, BLUESKY_SESSION_PATH)
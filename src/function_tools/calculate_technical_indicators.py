@@ -1,5 +1,9 @@
-import ta as ta_lib
 import warnings
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+import ta as ta_lib
 
 warnings.filterwarnings(
     action="ignore",
@@ -74,33 +78,50 @@ def generate_aggregated_signal(symbol, df):
 
     latest = valid_df.iloc[-1]
 
+    return _build_signal(
+        symbol,
+        close=latest['Close'],
+        sma=latest['SMA_20'],
+        rsi=latest['RSI_14'],
+        macd_hist=latest['MACDh_12_26_9'],
+    )
+
+
+def _build_signal(symbol, close, sma, rsi, macd_hist):
+    """
+    Apply the majority-of-three vote to the latest indicator values of one symbol.
+
+    Shared by the per-symbol (`generate_aggregated_signal`) and the batched
+    (`generate_aggregated_signals`) paths so both produce identical votes and
+    justification strings.
+    """
     bullish_count = 0
     bearish_count = 0
     indicator_status = {}
 
     # --- Indicator Status Check ---
-    if latest['Close'] > latest['SMA_20']:
+    if close > sma:
         bullish_count += 1
         indicator_status['SMA'] = "Bullish (Price > SMA)"
-    elif latest['Close'] < latest['SMA_20']:
+    elif close < sma:
         bearish_count += 1
         indicator_status['SMA'] = "Bearish (Price < SMA)"
     else:
         indicator_status['SMA'] = "Neutral (Price = SMA)"
 
-    if latest['RSI_14'] > 50:
+    if rsi > 50:
         bullish_count += 1
         indicator_status['RSI'] = "Bullish (Momentum > 50)"
-    elif latest['RSI_14'] < 50:
+    elif rsi < 50:
         bearish_count += 1
         indicator_status['RSI'] = "Bearish (Momentum < 50)"
     else:
         indicator_status['RSI'] = "Neutral (RSI = 50)"
 
-    if latest['MACDh_12_26_9'] > 0:
+    if macd_hist > 0:
         bullish_count += 1
         indicator_status['MACD'] = "Bullish (MACD Line > Signal Line)"
-    elif latest['MACDh_12_26_9'] < 0:
+    elif macd_hist < 0:
         bearish_count += 1
         indicator_status['MACD'] = "Bearish (MACD Line < Signal Line)"
     else:
@@ -125,4 +146,112 @@ def generate_aggregated_signal(symbol, df):
         'symbol': symbol,
         'aggregated_sentiment': final_signal,
         'justification': justification
-    }
\ No newline at end of file
+    }
+
+
+def _bottom_justify(close_df):
+    """
+    Shift every column's non-`NaN` values to the bottom of the matrix, keeping their order.
+
+    A per-symbol series is analysed after `dropna()`, so gaps inside one column must not
+    shift the indicator windows. Pushing the valid values down (and the `NaN`s up as
+    leading padding) makes each column equivalent to its own `dropna()`'d series while
+    keeping a single aligned matrix whose last row is every symbol's latest bar.
+    """
+    values = close_df.to_numpy(dtype=float)
+    order = np.argsort(~np.isnan(values), axis=0, kind="stable")
+    return pd.DataFrame(
+        np.take_along_axis(values, order, axis=0),
+        columns=close_df.columns,
+    )
+
+
+def calculate_technical_indicators_wide(close_df):
+    """
+    Compute SMA \(20\), RSI \(14\), and MACD histogram \(12, 26, 9\) for many symbols at once.
+
+    This is the batched counterpart of `calculate_technical_indicators`: every indicator is
+    evaluated column-wise on a single (dates x symbols) matrix instead of once per symbol.
+    The formulas mirror the `ta` implementations (Wilder smoothing for RSI, `adjust=False`
+    EMAs for MACD) so the results match the per-symbol path.
+
+    Parameters:
+        close_df (pandas.DataFrame): Wide close-price matrix, one column per symbol, rows in
+            ascending chronological order. Leading `NaN`s (e.g. a later listing) are
+            allowed; interior gaps should be removed first (see `generate_aggregated_signals`).
+
+    Returns:
+        dict: Maps `SMA_20`, `RSI_14` and `MACDh_12_26_9` to DataFrames shaped like `close_df`.
+    """
+    close = close_df.astype(float)
+    has_close = close.notna()
+
+    sma = close.rolling(window=20, min_periods=20).mean()
+
+    # `ta` turns the undefined first diff into a 0.0 move; only do that where a close exists so
+    # the leading padding of a column does not count towards the RSI warm-up.
+    diff = close.diff(1)
+    up_direction = diff.where(diff > 0, 0.0).where(has_close)
+    down_direction = (-diff.where(diff < 0, 0.0)).where(has_close)
+    emaup = up_direction.ewm(alpha=1 / 14, min_periods=14, adjust=False).mean()
+    emadn = down_direction.ewm(alpha=1 / 14, min_periods=14, adjust=False).mean()
+    rsi = pd.DataFrame(
+        np.where(emadn == 0, 100, 100 - (100 / (1 + emaup / emadn))),
+        index=close.index,
+        columns=close.columns,
+    ).where(has_close)
+
+    ema_fast = close.ewm(span=12, min_periods=12, adjust=False).mean()
+    ema_slow = close.ewm(span=26, min_periods=26, adjust=False).mean()
+    macd = ema_fast - ema_slow
+    macd_signal = macd.ewm(span=9, min_periods=9, adjust=False).mean()
+
+    return {
+        'SMA_20': sma,
+        'RSI_14': rsi,
+        'MACDh_12_26_9': macd - macd_signal,
+    }
+
+
+def generate_aggregated_signals(close_df) -> List[Dict[str, Any]]:
+    """
+    Produce the majority-of-three signal for every symbol of a wide close-price matrix.
+
+    Gives the same votes and justifications as calling `generate_aggregated_signal` once per
+    symbol, but computes all indicators in one vectorized pass.
+
+    Parameters:
+        close_df (pandas.DataFrame): Wide close-price matrix (dates x symbols) in ascending
+            chronological order. Missing bars may be `NaN`; each column is evaluated on its
+            non-`NaN` values only.
+
+    Returns:
+        list of dict: One result per column of `close_df`, in column order, shaped like the
+        return value of `generate_aggregated_signal`.
+    """
+    if close_df.empty:
+        return []
+
+    justified_df = _bottom_justify(close_df)
+    indicators = calculate_technical_indicators_wide(justified_df)
+
+    # Indicators stay defined once warmed up, so the last row holds each symbol's latest bar.
+    latest_close = justified_df.iloc[-1]
+    latest_sma = indicators['SMA_20'].iloc[-1]
+    latest_rsi = indicators['RSI_14'].iloc[-1]
+    latest_macd_hist = indicators['MACDh_12_26_9'].iloc[-1]
+
+    results = []
+    for symbol in close_df.columns:
+        values = (latest_close[symbol], latest_sma[symbol], latest_rsi[symbol], latest_macd_hist[symbol])
+        if any(pd.isna(value) for value in values):
+            results.append({
+                'symbol': symbol,
+                'aggregated_sentiment': "NEUTRAL",
+                'justification': "Insufficient historical data (min ~26 days required)"
+            })
+            continue
+
+        results.append(_build_signal(symbol, *values))
+
+    return results
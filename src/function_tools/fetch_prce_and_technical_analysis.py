@@ -1,4 +1,4 @@
-from function_tools.calculate_technical_indicators import generate_aggregated_signal
+from function_tools.calculate_technical_indicators import generate_aggregated_signals
 from function_tools.fetch_yahoo_finance_stock_price import fetch_historical_close_prices
 
 from typing import Dict, Any, List
@@ -31,22 +31,12 @@ def fetch_price_and_technical_analysis(symbols: List[str]) -> List[Dict[str, Any
       'aggregated_sentiment': 'BEARISH',
       'justification': 'Consensus: 0/3 Bullish, 3/3 Bearish. SMA: Bearish (Price < SMA); RSI: Bearish (Momentum < 50); MACD: Bearish (MACD Line < Signal Line)'}]
     """
-    structured_data_df = fetch_historical_close_prices(symbols)
+    # Wide (dates x symbols) matrix, so every symbol is analysed in a single pass
+    close_matrix = fetch_historical_close_prices(symbols, columnar=True)
 
-    # Iterate through each symbol, perform analysis, and collect results
-    final_analysis_list = []
+    if close_matrix.empty:
+        return []
 
-    unique_symbols = structured_data_df['Symbol'].unique()
-    print(f"\n--- Starting Technical Analysis for {len(unique_symbols)} Symbols ---")
+    print(f"\n--- Starting Technical Analysis for {len(close_matrix.columns)} Symbols ---")
 
-    for symbol in unique_symbols:
-        # Get data for the current symbol only
-        symbol_df = structured_data_df[structured_data_df['Symbol'] == symbol].copy().reset_index(drop=True)
-
-        # Generate the signal and justification based on the latest data point
-        aggregated_json = generate_aggregated_signal(symbol, symbol_df)
-
-        # Store the result
-        final_analysis_list.append(aggregated_json)
-
-    return final_analysis_list
+    return generate_aggregated_signals(close_matrix)
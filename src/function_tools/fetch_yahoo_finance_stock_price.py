@@ -1,10 +1,14 @@
 import datetime
+from collections import defaultdict
+from typing import Dict, List
 
 import pandas as pd
 import yfinance as yf
 
+from function_tools.price_store import PriceStore, get_price_store
 
-def fetch_historical_close_prices(symbols: list, days: int = 100) -> pd.DataFrame:
+
+def fetch_historical_close_prices(symbols: list, days: int = 100, columnar: bool = False) -> pd.DataFrame:
     """
     Fetches the last N days of daily closing prices for a list of stock symbols
     and formats the output into a single pandas DataFrame.
@@ -12,10 +16,15 @@ def fetch_historical_close_prices(symbols: list, days: int = 100) -> pd.DataFram
     Args:
         symbols (list): A list of stock ticker strings (e.g., ["GOOG", "TSLA"]).
         days (int): The number of days of historical data to retrieve.
+        columnar (bool): If True, return the wide (dates x symbols) close matrix as
+                         downloaded instead of the long per-row format.
 
     Returns:
-        pd.DataFrame: A single DataFrame containing all fetched data,
-                      with columns: ['Symbol', 'data' (Date), 'price' (Close Price)].
+        pd.DataFrame: By default a single long DataFrame containing all fetched data,
+                      with columns: ['Symbol', 'Date', 'Close'].
+                      With `columnar=True`, a float64 DataFrame indexed by a DatetimeIndex
+                      with one column per symbol; each column holds that symbol's last
+                      `days` bars (older or missing bars are NaN).
     """
     if not symbols:
         print("Error: The list of symbols is empty.")
@@ -26,11 +35,31 @@ def fetch_historical_close_prices(symbols: list, days: int = 100) -> pd.DataFram
     # Use 1.5x days to account for weekends/holidays and ensure 100 trading days are captured
     start_date = end_date - datetime.timedelta(days=days * 1.5)
 
+    price_store = get_price_store()
+    if price_store is not None:
+        close_data = _load_close_prices_with_store(price_store, symbols, start_date, end_date)
+    else:
+        close_data = _download_close_prices(symbols, start_date, end_date)
+
+    if close_data is None or close_data.empty:
+        print("No data retrieved.")
+        return pd.DataFrame()
+
+    close_matrix = _trim_close_matrix(close_data, symbols, days)
+
+    if columnar:
+        return close_matrix
+
+    return to_long_format(close_matrix)
+
+
+def _download(symbols: List[str], start_date: datetime.date, end_date: datetime.date) -> pd.DataFrame | None:
+    """Bulk-download daily bars for `symbols` in `[start_date, end_date)`; None on failure."""
     print(f"Fetching data for {symbols} from {start_date} to {end_date}...")
 
     # Use yfinance.download for bulk fetching, which is usually faster
     try:
-        data = yf.download(
+        return yf.download(
             tickers=symbols,
             start=start_date,
             end=end_date,
@@ -39,40 +68,131 @@ def fetch_historical_close_prices(symbols: list, days: int = 100) -> pd.DataFram
         )
     except Exception as e:
         print(f"An error occurred during data download: {e}")
-        return pd.DataFrame()
+        return None
 
-    if data.empty:
-        print("No data retrieved.")
-        return pd.DataFrame()
+
+def _download_close_prices(symbols: List[str], start_date: datetime.date, end_date: datetime.date) -> pd.DataFrame | None:
+    """Download the full window and return the wide Close matrix (no on-disk cache)."""
+    data = _download(symbols, start_date, end_date)
+    if data is None or data.empty:
+        return None
 
     # Extract only the 'Close' column(s)
     close_data = data['Close']
 
     # Handle a single ticker case (yfinance returns a Series instead of a DataFrame with one column)
-    if len(symbols) == 1:
+    if isinstance(close_data, pd.Series):
         close_data = close_data.to_frame(name=symbols[0])
 
-    # --- Collect all records into a single list ---
-    all_records = []
+    return close_data
+
 
+def _split_ohlcv(data: pd.DataFrame, symbols: List[str]) -> Dict[str, pd.DataFrame]:
+    """Split a `yf.download` result into one OHLCV DataFrame per symbol."""
+    if not isinstance(data.columns, pd.MultiIndex):
+        # Older yfinance versions return flat columns for a single ticker
+        return {symbols[0]: data}
+
+    tickers = data.columns.get_level_values(-1)
+    return {
+        symbol: data.xs(symbol, axis=1, level=-1)
+        for symbol in symbols
+        if symbol in tickers
+    }
+
+
+def _load_close_prices_with_store(
+        price_store: PriceStore,
+        symbols: List[str],
+        start_date: datetime.date,
+        end_date: datetime.date,
+) -> pd.DataFrame:
+    """
+    Serve the Close matrix from the on-disk price store, downloading only what is missing.
+
+    Symbols whose stored window does not reach back to `start_date` are downloaded in full;
+    the others only need the tail since their last download. Symbols sharing the same
+    missing window are fetched together in a single `yf.download` call.
+    """
+    coverage = price_store.coverage(symbols)
+
+    missing_windows = defaultdict(list)
     for symbol in symbols:
-        if symbol in close_data.columns:
-            # Drop NaN and get the last N days
-            df_ticker = close_data[symbol].dropna().tail(days)
-
-            # Convert the Series to the required list of dictionary format for the DataFrame
-            for date, close_price in df_ticker.items():
-                all_records.append({
-                    "Symbol": symbol,
-                    "Date": date.strftime('%Y-%m-%d'),
-                    "Close": round(close_price, 4)
-                })
-
-            print(f"Successfully processed {symbol}: Retrieved {len(df_ticker)} records.")
-        else:
+        fetched_from, fetched_through = coverage.get(symbol, (None, None))
+        if fetched_from is None or fetched_from > start_date:
+            missing_windows[start_date].append(symbol)
+        elif fetched_through < end_date:
+            missing_windows[fetched_through].append(symbol)
+
+    cached_count = len(symbols) - sum(len(group) for group in missing_windows.values())
+    if cached_count:
+        print(f"Price cache: {cached_count} of {len(symbols)} symbols are up to date on disk.")
+
+    for window_start, window_symbols in missing_windows.items():
+        data = _download(window_symbols, window_start, end_date)
+        if data is None:
+            # Keep serving whatever is already stored; the window is retried on the next call
+            continue
+
+        if data.empty:
+            # No bars in the window (weekend, holiday, before the close): a stored symbol is up to
+            # date through `end_date`. A symbol without stored bars more likely failed to download
+            # and is retried on the next call.
+            for symbol in window_symbols:
+                if symbol in coverage:
+                    price_store.upsert(symbol, pd.DataFrame(), fetched_from=window_start, fetched_through=end_date)
+            continue
+
+        bars_by_symbol = _split_ohlcv(data, window_symbols)
+        for symbol in window_symbols:
+            bars = bars_by_symbol.get(symbol)
+            if bars is None or "Close" not in bars or not bars["Close"].notna().any():
+                # Missing (or all-NaN) in a download that returned bars for other symbols; recording
+                # the window as covered would leave a permanent hole, so it is retried instead
+                continue
+            price_store.upsert(symbol, bars, fetched_from=window_start, fetched_through=end_date)
+
+    return price_store.load_close_matrix(symbols, start_date)
+
+
+def _trim_close_matrix(close_data: pd.DataFrame, symbols: list, days: int) -> pd.DataFrame:
+    """
+    Keep the requested symbols (in request order) and only their last `days` non-NaN bars.
+
+    Works on the whole matrix at once; symbols without any data are dropped with a warning.
+    """
+    present = [symbol for symbol in symbols if symbol in close_data.columns]
+    for symbol in symbols:
+        if symbol not in close_data.columns:
             print(f"Warning: Could not find close price data for {symbol}.")
 
-    # Convert the list of dictionaries into a single DataFrame
-    final_df = pd.DataFrame(all_records)
+    close_matrix = close_data[present].astype("float64").round(4)
+    close_matrix.index = pd.DatetimeIndex(close_matrix.index).tz_localize(None)
+
+    # Count the valid bars from each row to the end of its column; keep the most recent `days`
+    bars_from_end = close_matrix.notna()[::-1].cumsum()[::-1]
+    close_matrix = close_matrix.where(bars_from_end <= days)
+
+    record_counts = close_matrix.count()
+    for symbol in present:
+        print(f"Successfully processed {symbol}: Retrieved {record_counts[symbol]} records.")
+
+    close_matrix = close_matrix.loc[:, record_counts > 0]
+    return close_matrix.dropna(how="all")
+
+
+def to_long_format(close_matrix: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert a wide close matrix from `fetch_historical_close_prices(..., columnar=True)`
+    into the long format with columns ['Symbol', 'Date' (YYYY-MM-DD), 'Close'].
+
+    Rows are grouped by symbol (in column order) and sorted by date within each symbol.
+    """
+    if close_matrix.empty:
+        return pd.DataFrame()
+
+    long_series = close_matrix.T.stack().dropna()
+    final_df = long_series.rename_axis(["Symbol", "Date"]).reset_index(name="Close")
+    final_df["Date"] = final_df["Date"].dt.strftime('%Y-%m-%d')
 
     return final_df
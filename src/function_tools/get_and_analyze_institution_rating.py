@@ -6,21 +6,149 @@ Hold, Sell, Strong Sell) and aggregates them into a simple, three-category senti
 
 The Finnhub API key is loaded from an environment variable named 'FINNHUB_API_KEY'
 using the python-dotenv library.
+
+Tickers are processed concurrently by a small thread pool. All requests share a
+token-bucket rate limiter (per-second and per-minute quotas) and HTTP 429 responses
+are retried with exponential backoff, so large ticker lists stay within the Finnhub
+quota instead of failing.
+
+Recommendation trends only change once per monthly `period`, so responses are cached
+per symbol (in memory, plus an optional SQLite file shared between runs). A cached
+entry is served until its TTL expires or, once a newer monthly period is expected,
+until it is old enough to be re-checked.
 """
+import datetime
 import json
 import os
+import sqlite3
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List
 
 import finnhub
 from dotenv import load_dotenv
 
+from configs.settings import settings
+from function_tools.rate_limiter import RateLimiter, TokenBucket
+from utils.cache_utils import InMemoryLRUCache, SQLiteCache, TieredCache
+
 load_dotenv()
 
 # --- Configuration ---
 # API_KEY is loaded from the environment variable FINNHUB_API_KEY
 API_KEY: str | None = os.getenv("FINNHUB_API_KEY")
 
+# Finnhub free tier: 30 calls/second and 60 calls/minute
+FINNHUB_MAX_CALLS_PER_SECOND: int = int(os.getenv("FINNHUB_MAX_CALLS_PER_SECOND", 30))
+FINNHUB_MAX_CALLS_PER_MINUTE: int = int(os.getenv("FINNHUB_MAX_CALLS_PER_MINUTE", 60))
+FINNHUB_MAX_WORKERS: int = int(os.getenv("FINNHUB_MAX_WORKERS", 8))
+FINNHUB_MAX_RETRIES: int = int(os.getenv("FINNHUB_MAX_RETRIES", 4))
+FINNHUB_BACKOFF_SECONDS: float = float(os.getenv("FINNHUB_BACKOFF_SECONDS", 1.0))
+
+# Recommendation trends cache
+FINNHUB_CACHE_TTL_SECONDS: float = float(os.getenv("FINNHUB_CACHE_TTL_SECONDS", 24 * 60 * 60))
+# How often to re-check a symbol whose latest period is older than the current month
+FINNHUB_CACHE_NEW_PERIOD_RECHECK_SECONDS: float = float(os.getenv("FINNHUB_CACHE_NEW_PERIOD_RECHECK_SECONDS", 60 * 60))
+FINNHUB_CACHE_SQLITE: bool = os.getenv("FINNHUB_CACHE_SQLITE", "true").lower() not in ("0", "false", "no")
+FINNHUB_CACHE_PATH: str = os.getenv("FINNHUB_CACHE_PATH", os.path.join(settings.cache_dir, "finnhub_cache.sqlite3"))
+
+# Shared by every thread (and every call) in this process
+finnhub_rate_limiter = RateLimiter([
+    TokenBucket(capacity=FINNHUB_MAX_CALLS_PER_SECOND, period=1),
+    TokenBucket(capacity=FINNHUB_MAX_CALLS_PER_MINUTE, period=60),
+])
+
+
+def _build_recommendation_cache() -> InMemoryLRUCache | TieredCache:
+    memory_cache = InMemoryLRUCache(max_entries=2048)
+    if not FINNHUB_CACHE_SQLITE:
+        return memory_cache
+
+    try:
+        return TieredCache(memory_cache, SQLiteCache(FINNHUB_CACHE_PATH, table="recommendation_trends"))
+    except (OSError, sqlite3.Error) as e:
+        print(f"Warning: Finnhub SQLite cache unavailable ({e}); using memory only.", file=sys.stderr)
+        return memory_cache
+
+
+recommendation_cache = _build_recommendation_cache()
+
+
+def fetch_recommendation_trends(finnhub_client: finnhub.Client, ticker: str) -> List[Dict[str, Any]]:
+    """
+    Calls the Finnhub recommendation_trends endpoint through the shared rate limiter.
+
+    HTTP 429 (Too Many Requests) responses are retried up to `FINNHUB_MAX_RETRIES` times
+    with exponential backoff (`FINNHUB_BACKOFF_SECONDS * 2 ** attempt`).
+
+    :param finnhub_client: An initialized Finnhub client instance.
+    :type finnhub_client: finnhub.Client
+    :param ticker: The stock ticker symbol (e.g., 'GOOG', 'TSLA').
+    :type ticker: str
+    :raises finnhub.exceptions.FinnhubAPIException: On non-429 errors, or on 429 once the
+        retries are exhausted.
+    :returns: The list of monthly recommendation trends, most recent first.
+    :rtype: List[Dict[str, Any]]
+    """
+    attempt = 0
+    while True:
+        finnhub_rate_limiter.acquire()
+        try:
+            return finnhub_client.recommendation_trends(symbol=ticker)
+        except finnhub.exceptions.FinnhubAPIException as api_err:
+            if api_err.status_code != 429 or attempt >= FINNHUB_MAX_RETRIES:
+                raise
+
+            delay = FINNHUB_BACKOFF_SECONDS * (2 ** attempt)
+            print(f"Rate limited on {ticker}; retrying in {delay:.1f}s...", file=sys.stderr)
+            time.sleep(delay)
+            attempt += 1
+
+
+def _new_period_expected(entry: Dict[str, Any], now: float) -> bool:
+    """
+    True if a newer monthly period should be available than the cached one and the entry is
+    old enough to be re-checked.
+    """
+    current_period = datetime.date.today().replace(day=1).isoformat()
+    period = entry.get("period")
+    is_outdated = not period or period < current_period
+    return is_outdated and now - entry["fetched_at"] >= FINNHUB_CACHE_NEW_PERIOD_RECHECK_SECONDS
+
+
+def get_recommendation_trends(finnhub_client: finnhub.Client, ticker: str) -> tuple[List[Dict[str, Any]], bool]:
+    """
+    Returns the recommendation trends for a ticker, serving them from the cache when possible.
+
+    :param finnhub_client: An initialized Finnhub client instance.
+    :type finnhub_client: finnhub.Client
+    :param ticker: The stock ticker symbol (e.g., 'GOOG', 'TSLA').
+    :type ticker: str
+    :raises finnhub.exceptions.FinnhubAPIException: If the Finnhub API returns an error on a cache miss.
+    :returns: The list of monthly recommendation trends (most recent first) and whether it
+              was served from the cache.
+    :rtype: tuple[List[Dict[str, Any]], bool]
+    """
+    cache_key = f"recommendation_trends:{ticker.upper()}"
+    now = time.time()
+
+    entry = recommendation_cache.get(cache_key)
+    if entry is not None and not _new_period_expected(entry, now):
+        return entry["trends"], True
+
+    trends = fetch_recommendation_trends(finnhub_client, ticker)
+    recommendation_cache.set(
+        cache_key,
+        {
+            "period": trends[0].get("period") if trends else None,
+            "trends": trends,
+            "fetched_at": now,
+        },
+        ttl=FINNHUB_CACHE_TTL_SECONDS,
+    )
+    return trends, False
+
 
 def analyze_recommendation_sentiment(finnhub_client: finnhub.Client, ticker: str) -> Dict[str, Any]:
     """
@@ -34,12 +162,14 @@ def analyze_recommendation_sentiment(finnhub_client: finnhub.Client, ticker: str
     :raises finnhub.exceptions.FinnhubAPIException: If the Finnhub API returns an error.
     :raises Exception: For any other unexpected error during processing.
     :returns: A dictionary containing the symbol, aggregated sentiment, and a detailed
-              justification for the sentiment calculation.
+              justification for the sentiment calculation. Results computed from trend data
+              also carry the trend `period` and a `cache_hit` flag telling whether the data
+              was served from the cache instead of the Finnhub API.
     :rtype: Dict[str, Any]
     """
     try:
-        # 1. Call the recommendation_trends endpoint
-        data = finnhub_client.recommendation_trends(symbol=ticker)
+        # 1. Get the recommendation trends (cached, or rate limited API call retried on 429)
+        data, cache_hit = get_recommendation_trends(finnhub_client, ticker)
 
         if not data:
             return {
@@ -79,10 +209,20 @@ def analyze_recommendation_sentiment(finnhub_client: finnhub.Client, ticker: str
         return {
             "symbol": ticker,
             "aggregated_sentiment": sentiment,
-            "justification": justification
+            "justification": justification,
+            "period": latest_data.get('period'),
+            "cache_hit": cache_hit
         }
 
     except finnhub.exceptions.FinnhubAPIException as api_err:
+        if api_err.status_code == 429:
+            # Do not report a rate-limited ticker as "neutral": there is no rating to aggregate
+            return {
+                "symbol": ticker,
+                "aggregated_sentiment": "N/A",
+                "justification": f"Finnhub rate limit still exceeded after {FINNHUB_MAX_RETRIES} retries; "
+                                 f"no recommendation data available."
+            }
         return {
             "symbol": ticker,
             "aggregated_sentiment": "neutral",
@@ -100,6 +240,9 @@ def run_analysis_for_multiple_tickers(tickers: List[str]) -> List[Dict[str, Any]
     """
     Initializes the Finnhub client and runs the sentiment analysis for all provided tickers.
 
+    Tickers are fetched concurrently (up to `FINNHUB_MAX_WORKERS` threads) under the shared
+    rate limiter; results are returned in the same order as `tickers`.
+
     :param tickers: A list of stock ticker symbols to analyze.
     :type tickers: List[str]
     :returns: A list of dictionaries, where each dictionary contains the analysis
@@ -117,14 +260,17 @@ def run_analysis_for_multiple_tickers(tickers: List[str]) -> List[Dict[str, Any]
         print(f"Error initializing Finnhub client: {e}", file=sys.stderr)
         return []
 
-    results = []
-    for ticker in tickers:
+    if not tickers:
+        return []
+
+    def analyze(ticker: str) -> Dict[str, Any]:
         # Log status to standard error to keep standard output clean for JSON
         print(f"Processing {ticker}...", file=sys.stderr)
-        result = analyze_recommendation_sentiment(finnhub_client, ticker)
-        results.append(result)
+        return analyze_recommendation_sentiment(finnhub_client, ticker)
 
-    return results
+    # executor.map preserves the input order of the tickers
+    with ThreadPoolExecutor(max_workers=min(FINNHUB_MAX_WORKERS, len(tickers))) as executor:
+        return list(executor.map(analyze, tickers))
 
 
 if __name__ == "__main__":
@@ -1,10 +1,11 @@
 """
-Fetch Bluesky posts for a given stock ticker.
+Fetch Bluesky posts for a given stock ticker, or for a list of tickers at once.
 
 This module provides a small wrapper around the `atproto` SDK to search for
 recent posts that include a cashtag (for example, `\$AAPL`). It expects Bluesky
-credentials to be provided via environment variables and will authenticate the
-client before issuing a search.
+credentials to be provided via environment variables. All searches share one
+authenticated client from `function_tools.bluesky_session`, so the login happens
+once per process (or not at all when a persisted session can be resumed).
 
 Requirements:
 - atproto
@@ -22,17 +23,17 @@ Notes:
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any
 
-from atproto import Client
-from dotenv import load_dotenv
+from function_tools.bluesky_session import (
+    BLUESKY_APP_PASSWORD,
+    BLUESKY_USERNAME,
+    bluesky_session_manager,
+)
 
-load_dotenv()
-
-# --- Configuration ---
-# To get an App Password, go to Bluesky > Settings > Privacy & Security > App Passwords.
-BLUESKY_USERNAME: str | None = os.getenv("BLUESKY_USERNAME")
-BLUESKY_APP_PASSWORD: str | None = os.getenv("BLUESKY_APP_PASSWORD")
+# Maximum number of concurrent searches issued by `get_bluesky_posts_batch`
+BLUESKY_MAX_WORKERS: int = int(os.getenv("BLUESKY_MAX_WORKERS", 8))
 
 
 def get_bluesky_posts(symbol: str, limit: int = 10) -> List[Dict[str, Any]]:
@@ -57,19 +58,18 @@ def get_bluesky_posts(symbol: str, limit: int = 10) -> List[Dict[str, Any]]:
         search, an empty list is returned and a short message is printed.
 
     Notes:
-        - This function authenticates using the `BLUESKY_USERNAME` and
-          `BLUESKY_APP_PASSWORD` environment variables.
+        - This function uses the shared session of `bluesky_session_manager`, which
+          authenticates with the `BLUESKY_USERNAME` and `BLUESKY_APP_PASSWORD`
+          environment variables on first use.
         - The query uses the `\$SYMBOL` convention to match cashtags.
     """
     if not BLUESKY_USERNAME or not BLUESKY_APP_PASSWORD:
         print("🚨 Error: Please set your Bluesky username and app password.")
         return []
 
-    # 1. Initialize and authenticate
-    # print(f"Connecting to Bluesky as {BLUESKY_USERNAME}...")
+    # 1. Reuse the shared authenticated client (logs in on first use)
     try:
-        client = Client()
-        client.login(BLUESKY_USERNAME, BLUESKY_APP_PASSWORD)
+        bluesky_session_manager.get_client()
     except Exception as e:
         print(f"Authentication failed: {e}")
         return []
@@ -80,13 +80,15 @@ def get_bluesky_posts(symbol: str, limit: int = 10) -> List[Dict[str, Any]]:
 
     # 3. Perform the search
     try:
-        response = client.app.bsky.feed.search_posts(
-            params={
-                "q": search_query,
-                "sort": "top",
-                "lang": "en",
-                "limit": limit,
-            },
+        response = bluesky_session_manager.call(
+            lambda client: client.app.bsky.feed.search_posts(
+                params={
+                    "q": search_query,
+                    "sort": "top",
+                    "lang": "en",
+                    "limit": limit,
+                },
+            )
         )
     except Exception as e:
         print(f"Error during post search: {e}")
@@ -113,6 +115,42 @@ def get_bluesky_posts(symbol: str, limit: int = 10) -> List[Dict[str, Any]]:
     return posts
 
 
+def get_bluesky_posts_batch(symbols: List[str], limit: int = 10) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Search recent Bluesky posts for several stock tickers at once.
+
+    The searches run concurrently over the shared authenticated client, so a
+    single call covers every ticker.
+
+    Args:
+        symbols: Stock tickers to search for (for example, `["GOOG", "AAPL"]`).
+        limit: Maximum number of posts to request per ticker.
+
+    Returns:
+        A dictionary keyed by the upper-cased ticker symbol, in input order. Each
+        value is the list of posts for that ticker, in the same format as
+        `get_bluesky_posts`. A ticker whose search fails maps to an empty list.
+    """
+    unique_symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+    if not unique_symbols:
+        return {}
+
+    if not BLUESKY_USERNAME or not BLUESKY_APP_PASSWORD:
+        print("🚨 Error: Please set your Bluesky username and app password.")
+        return {symbol: [] for symbol in unique_symbols}
+
+    # Authenticate once up front instead of racing the first login from every worker
+    try:
+        bluesky_session_manager.get_client()
+    except Exception as e:
+        print(f"Authentication failed: {e}")
+        return {symbol: [] for symbol in unique_symbols}
+
+    with ThreadPoolExecutor(max_workers=min(BLUESKY_MAX_WORKERS, len(unique_symbols))) as executor:
+        results = executor.map(lambda symbol: get_bluesky_posts(symbol, limit), unique_symbols)
+        return dict(zip(unique_symbols, results))
+
+
 # --- Execution ---
 if __name__ == "__main__":
     # REPLACE 'GOOG' with the stock ticker you want to search
@@ -0,0 +1,188 @@
+"""
+Streaming (incremental) versions of the SMA (20), RSI (14), and MACD histogram (12, 26, 9)
+indicators used by `calculate_technical_indicators`.
+
+`IncrementalIndicatorState` keeps only the running state each indicator needs
+(a rolling window and sum for SMA, Wilder-smoothed gain/loss averages for RSI, and
+EMA values for the MACD and signal lines), so appending a new daily bar costs O(1)
+instead of recomputing the whole history. The state is JSON-serializable, so it can
+be persisted between runs and advanced when new bars arrive.
+
+The update rules replicate the `ta` implementations (`adjust=False` EMAs with the same
+warm-up lengths), so the values match `calculate_technical_indicators` up to floating
+point rounding.
+"""
+
+import json
+import math
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterable, Optional
+
+from function_tools.calculate_technical_indicators import _build_signal
+
+SMA_WINDOW = 20
+RSI_WINDOW = 14
+MACD_FAST_WINDOW = 12
+MACD_SLOW_WINDOW = 26
+MACD_SIGNAL_WINDOW = 9
+
+
+def _ema_step(previous: Optional[float], value: float, alpha: float) -> float:
+    """One `adjust=False` EMA step; the first observation seeds the average."""
+    if previous is None:
+        return value
+    return (1 - alpha) * previous + alpha * value
+
+
+@dataclass
+class IncrementalIndicatorState:
+    """
+    Running indicator state for a single symbol.
+
+    Feed closes in ascending chronological order with `update`. Each indicator
+    reports `None` until it has seen as many bars as its batch counterpart needs
+    before producing a non-`NaN` value.
+    """
+    bar_count: int = 0
+    last_close: Optional[float] = None
+
+    # SMA: last SMA_WINDOW closes and their running sum
+    sma_window: Deque[float] = field(default_factory=lambda: deque(maxlen=SMA_WINDOW))
+    sma_sum: float = 0.0
+
+    # RSI: Wilder-smoothed average gain and loss
+    avg_gain: Optional[float] = None
+    avg_loss: Optional[float] = None
+
+    # MACD: fast/slow EMAs of the close and the EMA of the MACD line (signal line)
+    ema_fast: Optional[float] = None
+    ema_slow: Optional[float] = None
+    macd_signal: Optional[float] = None
+    macd_count: int = 0
+
+    def update(self, close: float) -> Dict[str, Optional[float]]:
+        """
+        Advance every indicator by one bar.
+
+        Args:
+            close: The new closing price.
+
+        Returns:
+            dict: The latest `SMA_20`, `RSI_14` and `MACDh_12_26_9` values (see `values`).
+        """
+        close = float(close)
+
+        # SMA: O(1) rolling sum, re-synchronised once per window to stop float drift
+        if len(self.sma_window) == SMA_WINDOW:
+            self.sma_sum -= self.sma_window[0]
+        self.sma_window.append(close)
+        self.sma_sum += close
+        if (self.bar_count + 1) % SMA_WINDOW == 0:
+            self.sma_sum = math.fsum(self.sma_window)
+
+        # RSI: like `ta`, the undefined first change counts as a 0.0 move
+        change = 0.0 if self.last_close is None else close - self.last_close
+        alpha = 1 / RSI_WINDOW
+        self.avg_gain = _ema_step(self.avg_gain, max(change, 0.0), alpha)
+        self.avg_loss = _ema_step(self.avg_loss, max(-change, 0.0), alpha)
+
+        # MACD: the EMAs run from the first bar; the signal line starts with the first valid MACD
+        self.ema_fast = _ema_step(self.ema_fast, close, 2 / (MACD_FAST_WINDOW + 1))
+        self.ema_slow = _ema_step(self.ema_slow, close, 2 / (MACD_SLOW_WINDOW + 1))
+        self.bar_count += 1
+        if self.bar_count >= MACD_SLOW_WINDOW:
+            self.macd_signal = _ema_step(self.macd_signal, self.ema_fast - self.ema_slow, 2 / (MACD_SIGNAL_WINDOW + 1))
+            self.macd_count += 1
+
+        self.last_close = close
+        return self.values()
+
+    def update_many(self, closes: Iterable[float]) -> Dict[str, Optional[float]]:
+        """Advance the state over several bars and return the values after the last one."""
+        for close in closes:
+            self.update(close)
+        return self.values()
+
+    @property
+    def sma(self) -> Optional[float]:
+        if self.bar_count < SMA_WINDOW:
+            return None
+        return self.sma_sum / SMA_WINDOW
+
+    @property
+    def rsi(self) -> Optional[float]:
+        if self.bar_count < RSI_WINDOW:
+            return None
+        if self.avg_loss == 0:
+            return 100.0
+        return 100 - (100 / (1 + self.avg_gain / self.avg_loss))
+
+    @property
+    def macd_hist(self) -> Optional[float]:
+        if self.macd_count < MACD_SIGNAL_WINDOW:
+            return None
+        return (self.ema_fast - self.ema_slow) - self.macd_signal
+
+    def values(self) -> Dict[str, Optional[float]]:
+        """Return the latest indicator values, keyed like the `calculate_technical_indicators` columns."""
+        return {
+            'Close': self.last_close,
+            'SMA_20': self.sma,
+            'RSI_14': self.rsi,
+            'MACDh_12_26_9': self.macd_hist,
+        }
+
+    def signal(self, symbol: str) -> Dict[str, Any]:
+        """
+        Produce the majority-of-three signal from the current state.
+
+        Returns the same structure (and justification wording) as `generate_aggregated_signal`.
+        """
+        if self.sma is None or self.rsi is None or self.macd_hist is None:
+            return {
+                'symbol': symbol,
+                'aggregated_sentiment': "NEUTRAL",
+                'justification': "Insufficient historical data (min ~26 days required)"
+            }
+
+        return _build_signal(symbol, self.last_close, self.sma, self.rsi, self.macd_hist)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serializable snapshot of the state."""
+        return {
+            'bar_count': self.bar_count,
+            'last_close': self.last_close,
+            'sma_window': list(self.sma_window),
+            'sma_sum': self.sma_sum,
+            'avg_gain': self.avg_gain,
+            'avg_loss': self.avg_loss,
+            'ema_fast': self.ema_fast,
+            'ema_slow': self.ema_slow,
+            'macd_signal': self.macd_signal,
+            'macd_count': self.macd_count,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "IncrementalIndicatorState":
+        """Restore a state previously produced by `to_dict`."""
+        return cls(
+            **{
+                **data,
+                'sma_window': deque(data.get('sma_window', []), maxlen=SMA_WINDOW),
+            }
+        )
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, payload: str) -> "IncrementalIndicatorState":
+        return cls.from_dict(json.loads(payload))
+
+    @classmethod
+    def from_closes(cls, closes: Iterable[float]) -> "IncrementalIndicatorState":
+        """Warm up a new state from a close-price history in ascending chronological order."""
+        state = cls()
+        state.update_many(closes)
+        return state
@@ -0,0 +1,209 @@
+"""
+Persistent on-disk store for daily OHLCV bars downloaded from Yahoo Finance.
+
+Bars are kept in a local SQLite database keyed by (symbol, date). For every symbol
+the store also remembers which calendar window has already been downloaded, so a
+repeated scan only needs to fetch the missing tail since the last download and can
+serve the rest of the history from disk.
+
+The store is capped by number of symbols: when the cap is exceeded, the least
+recently used symbols (and all their bars) are evicted.
+
+Environment variables:
+- PRICE_CACHE_ENABLED: Set to `false` to disable the store (default `true`).
+- PRICE_CACHE_PATH: SQLite file location (default `<CACHE_DIR>/prices.sqlite3`).
+- PRICE_CACHE_MAX_SYMBOLS: Maximum number of symbols kept on disk (default 2000).
+"""
+
+import datetime
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from configs.settings import settings
+
+# --- Configuration ---
+PRICE_CACHE_ENABLED: bool = os.getenv("PRICE_CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
+PRICE_CACHE_PATH: str = os.getenv("PRICE_CACHE_PATH", os.path.join(settings.cache_dir, "prices.sqlite3"))
+PRICE_CACHE_MAX_SYMBOLS: int = int(os.getenv("PRICE_CACHE_MAX_SYMBOLS", 2000))
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bars (
+    symbol TEXT NOT NULL,
+    date TEXT NOT NULL,
+    open REAL,
+    high REAL,
+    low REAL,
+    close REAL,
+    volume REAL,
+    PRIMARY KEY (symbol, date)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS symbols (
+    symbol TEXT PRIMARY KEY,
+    fetched_from TEXT NOT NULL,
+    fetched_through TEXT NOT NULL,
+    last_access REAL NOT NULL
+);
+"""
+
+
+class PriceStore:
+    """
+    SQLite-backed daily bar store with per-symbol download coverage and LRU eviction.
+
+    Coverage is tracked as the `[fetched_from, fetched_through)` calendar window that
+    has already been requested from Yahoo Finance, mirroring the exclusive `end`
+    argument of `yf.download`. A window with no bars (weekend, holiday) still counts as
+    covered, so it is not downloaded again.
+    """
+
+    def __init__(self, path: str, max_symbols: int = PRICE_CACHE_MAX_SYMBOLS) -> None:
+        self.path = path
+        self.max_symbols = max_symbols
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def coverage(self, symbols: List[str]) -> Dict[str, Tuple[datetime.date, datetime.date]]:
+        """
+        Return the downloaded `(fetched_from, fetched_through)` window for each stored symbol.
+
+        Symbols that were never downloaded are omitted from the result.
+        """
+        if not symbols:
+            return {}
+
+        placeholders = ",".join("?" * len(symbols))
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT symbol, fetched_from, fetched_through FROM symbols WHERE symbol IN ({placeholders})",
+                list(symbols),
+            ).fetchall()
+
+        return {
+            symbol: (datetime.date.fromisoformat(fetched_from), datetime.date.fromisoformat(fetched_through))
+            for symbol, fetched_from, fetched_through in rows
+        }
+
+    def upsert(
+            self,
+            symbol: str,
+            bars: pd.DataFrame,
+            fetched_from: datetime.date,
+            fetched_through: datetime.date,
+    ) -> None:
+        """
+        Merge downloaded bars for one symbol and record the window they were requested for.
+
+        Args:
+            symbol: The ticker symbol.
+            bars: DataFrame indexed by date with (a subset of) the `OHLCV_COLUMNS`.
+                  Rows without a close price are ignored.
+            fetched_from: First calendar day covered by the download (inclusive).
+            fetched_through: End of the downloaded window (exclusive).
+        """
+        bars = bars.reindex(columns=OHLCV_COLUMNS).dropna(subset=["Close"])
+        rows = [
+            (symbol, date.strftime("%Y-%m-%d"), *(None if pd.isna(value) else float(value) for value in values))
+            for date, values in zip(bars.index, bars.to_numpy())
+        ]
+
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO bars (symbol, date, open, high, low, close, volume) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.execute(
+                "INSERT INTO symbols (symbol, fetched_from, fetched_through, last_access) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(symbol) DO UPDATE SET "
+                "fetched_from = MIN(fetched_from, excluded.fetched_from), "
+                "fetched_through = MAX(fetched_through, excluded.fetched_through), "
+                "last_access = excluded.last_access",
+                (symbol, fetched_from.isoformat(), fetched_through.isoformat(), time.time()),
+            )
+            self._evict(conn)
+
+    def load_close_matrix(self, symbols: List[str], start_date: datetime.date) -> pd.DataFrame:
+        """
+        Read stored close prices from `start_date` onwards as a wide (dates x symbols) matrix.
+
+        Reading a symbol refreshes its LRU timestamp. Symbols without stored bars are
+        missing from the returned columns.
+        """
+        if not symbols:
+            return pd.DataFrame()
+
+        placeholders = ",".join("?" * len(symbols))
+        with self._lock, self._connect() as conn:
+            long_df = pd.read_sql_query(
+                f"SELECT symbol, date, close FROM bars WHERE symbol IN ({placeholders}) AND date >= ?",
+                conn,
+                params=[*symbols, start_date.isoformat()],
+            )
+            conn.execute(
+                f"UPDATE symbols SET last_access = ? WHERE symbol IN ({placeholders})",
+                [time.time(), *symbols],
+            )
+
+        if long_df.empty:
+            return pd.DataFrame()
+
+        close_matrix = long_df.pivot(index="date", columns="symbol", values="close")
+        close_matrix.index = pd.DatetimeIndex(close_matrix.index, name="Date")
+        close_matrix.columns.name = None
+        return close_matrix.sort_index()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Drop the least recently used symbols once the store holds more than `max_symbols`."""
+        (symbol_count,) = conn.execute("SELECT COUNT(*) FROM symbols").fetchone()
+        excess = symbol_count - self.max_symbols
+        if excess <= 0:
+            return
+
+        evicted = [
+            symbol for (symbol,) in conn.execute(
+                "SELECT symbol FROM symbols ORDER BY last_access ASC LIMIT ?", (excess,)
+            )
+        ]
+        placeholders = ",".join("?" * len(evicted))
+        conn.execute(f"DELETE FROM bars WHERE symbol IN ({placeholders})", evicted)
+        conn.execute(f"DELETE FROM symbols WHERE symbol IN ({placeholders})", evicted)
+        print(f"Price cache: evicted {len(evicted)} least recently used symbols.")
+
+
+_price_store: Optional[PriceStore] = None
+_price_store_lock = threading.Lock()
+
+
+def get_price_store() -> Optional[PriceStore]:
+    """
+    Return the shared `PriceStore`, or None if the cache is disabled or cannot be opened.
+    """
+    global _price_store
+
+    if not PRICE_CACHE_ENABLED:
+        return None
+
+    with _price_store_lock:
+        if _price_store is None:
+            try:
+                _price_store = PriceStore(PRICE_CACHE_PATH)
+            except (OSError, sqlite3.Error) as e:
+                print(f"Warning: Price cache unavailable ({e}); downloading directly.")
+                return None
+
+    return _price_store
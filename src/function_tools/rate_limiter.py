@@ -0,0 +1,87 @@
+"""
+Thread-safe token-bucket rate limiting for third-party API clients.
+
+A `TokenBucket` allows `capacity` calls per `period` seconds, refilling continuously.
+A `RateLimiter` combines several buckets (for example a per-second and a per-minute
+quota) and only lets a call through once every bucket has a token available.
+"""
+
+import threading
+import time
+from typing import List
+
+
+class TokenBucket:
+    """
+    A continuously refilling token bucket.
+
+    Args:
+        capacity: Maximum number of calls allowed within `period` seconds (also the burst size).
+        period: Length of the window in seconds.
+    """
+
+    def __init__(self, capacity: int, period: float) -> None:
+        if capacity <= 0 or period <= 0:
+            raise ValueError("capacity and period must be positive.")
+
+        self.capacity = capacity
+        self.period = period
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._last_refill
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.capacity / self.period)
+        self._last_refill = now
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until a token is available (0 if one is available now)."""
+        self._refill(now)
+        if self._tokens >= 1:
+            return 0.0
+        return (1 - self._tokens) * self.period / self.capacity
+
+    def consume(self) -> None:
+        self._tokens -= 1
+
+    def resize(self, capacity: int) -> None:
+        """Change the quota; tokens above the new capacity are dropped."""
+        if capacity <= 0:
+            raise ValueError("capacity must be positive.")
+        self.capacity = capacity
+        self._tokens = min(self._tokens, capacity)
+
+
+class RateLimiter:
+    """
+    Blocks callers until every configured bucket has capacity, then consumes one token from each.
+
+    Safe to share between threads.
+    """
+
+    def __init__(self, buckets: List[TokenBucket]) -> None:
+        self.buckets = buckets
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                delay = max((bucket.wait_time(now) for bucket in self.buckets), default=0.0)
+                if delay == 0:
+                    for bucket in self.buckets:
+                        bucket.consume()
+                    return
+
+            time.sleep(delay)
+
+    def share(self, parts: int) -> None:
+        """
+        Divide every bucket's quota between `parts` processes using the same API key.
+
+        Each process holds its own limiter, so a quota shared by worker processes has to be
+        split between them up front (every bucket keeps at least one call per period).
+        """
+        with self._lock:
+            for bucket in self.buckets:
+                bucket.resize(max(1, bucket.capacity // parts))
@@ -0,0 +1,208 @@
+"""
+Deterministic sentiment pre-scoring of Bluesky posts.
+
+Instead of sending every raw post to the LLM, posts are classified locally with a
+small finance lexicon and aggregated per ticker into bullish / bearish / neutral
+counts plus a few representative snippets. The LLM only sees these aggregates, so
+the prompt size no longer grows with the number of posts fetched.
+
+Scoring rules:
+- Relevance: the post must mention the ticker's cashtag (or, for tickers of three or
+  more letters, the bare ticker) and contain at least one market/stock-performance
+  term or sentiment term.
+- Sentiment: bullish terms count +1 and bearish terms -1 (flipped when one of the
+  `NEGATION_WINDOW` preceding words is a negation, so "not really bullish" is
+  bearish); the sign of the total gives the label. Everyday words that are only
+  directional next to a price ("up", "red", "long", "record", ...) count only when
+  a market term, the ticker or a number is within `CONTEXT_WINDOW` words of them,
+  so "long way to go" or "red carpet" carry no sentiment.
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+from function_tools.get_bluesky_posts import get_bluesky_posts_batch
+
+BULLISH_TERMS = {
+    "bull", "bullish", "buy", "buying", "bought", "calls", "moon", "mooning", "rally", "rallying",
+    "breakout", "beat", "beats", "upgrade", "upgraded", "outperform", "overweight", "strong", "surge",
+    "surging", "soar", "soaring", "rip", "ripping", "gain", "gains",
+    "undervalued", "accumulate", "growth", "raised", "raise", "bounce", "uptrend", "squeeze",
+}
+
+BEARISH_TERMS = {
+    "bear", "bearish", "sell", "selling", "sold", "shorting", "puts", "dump", "dumping", "crash",
+    "crashing", "miss", "missed", "misses", "downgrade", "downgraded", "underperform", "underweight", "weak",
+    "plunge", "plunging", "tank", "tanking", "drop", "dropping", "loss", "losses",
+    "overvalued", "bubble", "lawsuit", "probe", "downtrend", "fraud", "bagholder",
+}
+
+# Directional only in a market context ("shares up 5%", "record revenue", "long $NVDA")
+CONTEXT_BULLISH_TERMS = {"up", "higher", "green", "long", "record"}
+CONTEXT_BEARISH_TERMS = {"down", "lower", "red", "short"}
+CONTEXT_WINDOW = 2
+
+BULLISH_EMOJIS = ("🚀", "📈", "🐂", "💎", "🟢")
+BEARISH_EMOJIS = ("📉", "🐻", "🔻", "🩸", "🔴")
+
+MARKET_TERMS = {
+    "stock", "stocks", "share", "shares", "price", "earnings", "eps", "revenue", "guidance", "target",
+    "valuation", "market", "trading", "trade", "options", "call", "put", "analyst", "analysts", "quarter",
+    "q1", "q2", "q3", "q4", "dividend", "investors", "portfolio", "position", "chart", "ath", "ipo",
+}
+
+NEGATIONS = {
+    "not", "no", "never", "isn't", "isnt", "don't", "dont", "won't", "wont", "ain't", "aint",
+    "doesn't", "doesnt", "didn't", "didnt", "aren't", "arent", "wasn't", "wasnt", "can't", "cant", "cannot",
+}
+NEGATION_WINDOW = 3
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+SNIPPET_LENGTH = 160
+
+
+def score_post(text: str, symbol: str) -> Optional[str]:
+    """
+    Classify one post for one ticker.
+
+    Args:
+        text: The post content.
+        symbol: The ticker the post was retrieved for (e.g. `NVDA`).
+
+    Returns:
+        `bullish`, `bearish` or `neutral` for a relevant post, or None if the post is
+        not about the stock's performance.
+    """
+    # Typographic apostrophes ("don’t") would otherwise split negations into two words
+    lowered = text.lower().replace("\u2019", "'").replace("\u2018", "'")
+    symbol = symbol.lower()
+    # Short bare tickers ("A", "ON") are ordinary words, so those need the cashtag
+    mentions_bare_ticker = len(symbol) >= 3 and re.search(rf"\b{re.escape(symbol)}\b", lowered)
+    if f"${symbol}" not in lowered and not mentions_bare_ticker:
+        return None
+
+    words = _WORD_RE.findall(lowered)
+    score = 0
+    has_sentiment_term = False
+    for index, word in enumerate(words):
+        polarity = _polarity(words, index, symbol)
+        if not polarity:
+            continue
+        has_sentiment_term = True
+        if any(previous in NEGATIONS for previous in words[max(index - NEGATION_WINDOW, 0):index]):
+            polarity = -polarity
+        score += polarity
+
+    score += sum(lowered.count(emoji) for emoji in BULLISH_EMOJIS)
+    score -= sum(lowered.count(emoji) for emoji in BEARISH_EMOJIS)
+
+    if not has_sentiment_term and not any(word in MARKET_TERMS for word in words) and "%" not in lowered:
+        return None
+
+    if score > 0:
+        return "bullish"
+    if score < 0:
+        return "bearish"
+    return "neutral"
+
+
+def _polarity(words: List[str], index: int, symbol: str) -> int:
+    """+1 / -1 for a bullish / bearish term at `words[index]`, 0 otherwise (or out of context)."""
+    word = words[index]
+    if word in BULLISH_TERMS:
+        return 1
+    if word in BEARISH_TERMS:
+        return -1
+    if word not in CONTEXT_BULLISH_TERMS and word not in CONTEXT_BEARISH_TERMS:
+        return 0
+
+    context = words[max(index - CONTEXT_WINDOW, 0):index] + words[index + 1:index + 1 + CONTEXT_WINDOW]
+    if not any(
+            neighbour in MARKET_TERMS or neighbour == symbol or any(char.isdigit() for char in neighbour)
+            for neighbour in context
+    ):
+        return 0
+    return 1 if word in CONTEXT_BULLISH_TERMS else -1
+
+
+def aggregate_sentiment(bullish: int, bearish: int, neutral: int) -> str:
+    """
+    Derive the prevailing sentiment from the per-ticker counts.
+
+    Bullish (bearish) needs more bullish than bearish (bearish than bullish) posts and at
+    least as many as neutral ones; anything else, including no relevant posts, is neutral.
+    """
+    if bullish > bearish and bullish >= neutral:
+        return "bullish"
+    if bearish > bullish and bearish >= neutral:
+        return "bearish"
+    return "neutral"
+
+
+def summarize_posts(symbol: str, posts: List[Dict[str, Any]], max_snippets: int = 3) -> Dict[str, Any]:
+    """
+    Score and aggregate the posts fetched for one ticker.
+
+    Args:
+        symbol: The ticker symbol.
+        posts: Posts in the format returned by `get_bluesky_posts`.
+        max_snippets: Number of representative snippets to keep.
+
+    Returns:
+        dict: `symbol`, `posts_fetched`, `relevant_posts`, `bullish`, `bearish`, `neutral`,
+        `suggested_sentiment` and `snippets` (the most engaged relevant posts, truncated).
+    """
+    counts = {"bullish": 0, "bearish": 0, "neutral": 0}
+    relevant = []
+    for post in posts:
+        label = score_post(post.get("content") or "", symbol)
+        if label is None:
+            continue
+        counts[label] += 1
+        relevant.append((label, post))
+
+    def engagement(item) -> int:
+        post = item[1]
+        return (post.get("like_count") or 0) + (post.get("repost_count") or 0)
+
+    snippets = [
+        {
+            "sentiment": label,
+            "text": " ".join(post["content"].split())[:SNIPPET_LENGTH],
+            "likes": post.get("like_count"),
+        }
+        for label, post in sorted(relevant, key=engagement, reverse=True)[:max_snippets]
+    ]
+
+    return {
+        "symbol": symbol,
+        "posts_fetched": len(posts),
+        "relevant_posts": len(relevant),
+        **counts,
+        "suggested_sentiment": aggregate_sentiment(counts["bullish"], counts["bearish"], counts["neutral"]),
+        "snippets": snippets,
+    }
+
+
+def get_social_sentiment_summary(symbols: List[str], limit: int = 25) -> List[Dict[str, Any]]:
+    """
+    Fetch recent Bluesky posts for several tickers and return pre-scored sentiment aggregates.
+
+    Posts are classified locally (relevance filter plus a finance sentiment lexicon), so
+    only per-ticker counts and a few representative snippets are returned.
+
+    Args:
+        symbols: Stock tickers to analyze (for example, `["GOOG", "AAPL"]`).
+        limit: Maximum number of posts to fetch per ticker.
+
+    Returns:
+        A list with one entry per ticker, each containing:
+        - `symbol` (str): The ticker symbol.
+        - `posts_fetched` (int): Number of posts retrieved.
+        - `relevant_posts` (int): Posts discussing the stock's performance.
+        - `bullish` / `bearish` / `neutral` (int): Relevant posts per sentiment.
+        - `suggested_sentiment` (str): `bullish` | `bearish` | `neutral` from the counts.
+        - `snippets` (list): Up to 3 representative posts with their sentiment.
+    """
+    posts_by_symbol = get_bluesky_posts_batch(symbols, limit)
+    return [summarize_posts(symbol, posts) for symbol, posts in posts_by_symbol.items()]
@@ -0,0 +1,97 @@
+"""
+Per-ticker memoization for the batch analyst tools.
+
+The analyst tools take a list of symbols and return one result dict (with a `symbol`
+key) per symbol. `memoize_per_ticker` wraps such a tool so that results are cached per
+symbol: a call only fetches the symbols that are not cached yet and assembles the rest
+from the cache, in the order they were requested. When several themes share tickers
+(and the batch runner prefetches the union of their tickers once), every ticker is
+fetched once no matter how many themes it appears in.
+
+Only usable results are remembered: symbols the tool returned nothing for, and results
+that report a failure (see `is_cacheable_result`), are fetched again on the next call.
+Entries expire after `TICKER_MEMO_TTL_SECONDS`.
+
+The memo is applied by the batch runner only; interactive runs always fetch fresh data.
+"""
+
+import functools
+import inspect
+import json
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+from utils.cache_utils import InMemoryLRUCache
+
+load_dotenv()
+
+# --- Configuration ---
+TICKER_MEMO_TTL_SECONDS: float = float(os.getenv("TICKER_MEMO_TTL_SECONDS", 15 * 60))
+TICKER_MEMO_MAX_ENTRIES: int = int(os.getenv("TICKER_MEMO_MAX_ENTRIES", 4096))
+
+# Shared by every memoized tool in this process; keys are prefixed with the tool name
+ticker_memo_cache = InMemoryLRUCache(max_entries=TICKER_MEMO_MAX_ENTRIES)
+
+
+def is_cacheable_result(result: Dict[str, Any]) -> bool:
+    """
+    False for results that describe a failure rather than data: an `N/A` sentiment (no
+    ratings, rate limited), an error in the justification (Finnhub API errors are reported
+    as "neutral"), or a social summary without any posts (e.g. after a Bluesky login failure).
+    """
+    sentiment = str(result.get("aggregated_sentiment", "")).upper()
+    justification = str(result.get("justification", "")).lower()
+    if sentiment == "N/A" or "error" in justification:
+        return False
+    return result.get("posts_fetched", 1) != 0
+
+
+def memoize_per_ticker(
+        func: Callable[..., List[Dict[str, Any]]],
+        symbols_arg: str = "symbols",
+        ttl: float = TICKER_MEMO_TTL_SECONDS,
+        cacheable: Callable[[Dict[str, Any]], bool] = is_cacheable_result,
+) -> Callable[..., List[Dict[str, Any]]]:
+    """
+    Wrap a batch tool `func(symbols, **options)` with a per-symbol result cache.
+
+    The wrapper keeps `func`'s name, signature and docstring, so it can be registered as
+    an agent tool in place of `func`.
+
+    Args:
+        func: The tool; its `symbols_arg` parameter is the list of symbols.
+        symbols_arg: Name of the symbols parameter.
+        ttl: Seconds a cached result stays valid.
+        cacheable: Decides whether a symbol's result may be remembered.
+    """
+
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> List[Dict[str, Any]]:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        options = dict(bound.arguments)
+        symbols = options.pop(symbols_arg)
+        # Other arguments (e.g. the post `limit`) are part of the key
+        prefix = f"{func.__name__}:{json.dumps(options, sort_keys=True, default=str)}:"
+
+        requested = list(dict.fromkeys(str(symbol).upper() for symbol in symbols))
+        cached: Dict[str, Optional[Dict[str, Any]]] = {
+            symbol: ticker_memo_cache.get(prefix + symbol) for symbol in requested
+        }
+        missing = [symbol for symbol, result in cached.items() if result is None]
+
+        if missing:
+            print(f"[TickerMemo] {func.__name__}: fetching {len(missing)} of {len(requested)} symbols")
+            fetched = {str(result.get("symbol", "")).upper(): result for result in func(missing, **options)}
+            for symbol in missing:
+                cached[symbol] = fetched.get(symbol)
+                if cached[symbol] is not None and cacheable(cached[symbol]):
+                    ticker_memo_cache.set(prefix + symbol, cached[symbol], ttl=ttl)
+
+        return [cached[symbol] for symbol in requested if cached[symbol] is not None]
+
+    return wrapper
@@ -0,0 +1,75 @@
+"""
+Submit theme jobs to the job queue, check on them, or run a queue worker.
+
+Usage (from the repository root):
+    python src/job_worker.py submit "Mega 7" "AI Datacenter"
+    python src/job_worker.py status <job_id> [<job_id> ...]
+    python src/job_worker.py work [--worker-id node-1] [--no-email] [--exit-when-idle]
+
+Start as many `work` processes (on as many nodes sharing `JOB_QUEUE_PATH`) as needed;
+each pulls one theme at a time from the queue.
+"""
+
+import argparse
+import asyncio
+import logging
+
+from dotenv import load_dotenv
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(name)s - %(message)s")
+
+# load API keys and settings
+load_dotenv()
+
+from orchestration.job_queue import JOB_QUEUE_PATH, SQLiteJobQueue
+
+
+async def work(queue: SQLiteJobQueue, args: argparse.Namespace) -> None:
+    from agents.email_agent import email_mcp_connection
+    from orchestration.queue_worker import QueueWorker
+
+    worker = QueueWorker(queue, worker_id=args.worker_id, send_email=not args.no_email)
+    try:
+        processed = await worker.run(exit_when_idle=args.exit_when_idle)
+        print(f"Worker {worker.worker_id} processed {processed} jobs.")
+    finally:
+        # Explicitly close the MCP connection to avoid asyncio errors on exit
+        await email_mcp_connection.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Theme job queue.")
+    parser.add_argument("--queue-path", default=JOB_QUEUE_PATH, help="SQLite job queue file.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    submit = commands.add_parser("submit", help="Enqueue one job per theme.")
+    submit.add_argument("themes", nargs="+")
+
+    status = commands.add_parser("status", help="Show the state of jobs.")
+    status.add_argument("job_ids", nargs="+")
+
+    worker = commands.add_parser("work", help="Run a worker that processes queued jobs.")
+    worker.add_argument("--worker-id", default=None)
+    worker.add_argument("--no-email", action="store_true", help="Do not email the summaries.")
+    worker.add_argument("--exit-when-idle", action="store_true", help="Stop once the queue is empty.")
+
+    args = parser.parse_args()
+    queue = SQLiteJobQueue(args.queue_path)
+
+    if args.command == "submit":
+        for theme in args.themes:
+            print(f"{queue.enqueue(theme)}  {theme}")
+    elif args.command == "status":
+        for job_id in args.job_ids:
+            job = queue.get(job_id)
+            if job is None:
+                print(f"{job_id}  unknown job")
+            else:
+                detail = job.error or (f"{len(job.result['tickers'])} tickers" if job.result else "")
+                print(f"{job.id}  {job.theme}  {job.status} (attempt {job.attempts})  {detail}")
+    else:
+        asyncio.run(work(queue, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,14 @@
 import asyncio
 import sys
 import logging
+import uuid
 
 from dotenv import load_dotenv
-from google.adk.runners import InMemoryRunner
+from google.adk.runners import Runner
 from termcolor import colored
 
 from agents.agent import app
+from orchestration.session_service import create_session_service
 from utils.cli_utils import print_centered_title, print_centered, center_text
 
 # For debugging purposes
@@ -18,8 +20,8 @@ logging.basicConfig(
 # load API keys and settings
 load_dotenv()
 
-# Set a Runner using the imported application object
-runner = InMemoryRunner(app=app)
+# Set a Runner using the imported application object; sessions are kept on disk (see SESSION_STORE)
+runner = Runner(app=app, session_service=create_session_service())
 
 
 def print_cli_title() -> None:
@@ -119,7 +121,9 @@ async def main():
     print_waiting_analysis(thematic_topic)
 
     try:  # run_debug() requires ADK Python 1.18 or higher:
-        response = await runner.run_debug(agent_query)
+        # A new session per run: sessions persist on disk, and resuming run_debug's default
+        # session would feed the previous themes' events and state into this run's prompts
+        response = await runner.run_debug(agent_query, session_id=uuid.uuid4().hex)
         print_centered(
             colored(
                 f"--- AGENT ANALYSIS COMPLETE for the thematic topic '{thematic_topic}' ---",
@@ -1,63 +1,157 @@
+import atexit
+import html
 import os
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from typing import Dict, List, Optional, Tuple
+
 from fastmcp import FastMCP
 from dotenv import load_dotenv
+from pydantic import BaseModel, Field
+
+try:
+    from mcp_server.smtp_pool import SMTPConnectionPool
+except ImportError:  # Loaded by file path, e.g. `fastmcp run src/mcp_server/email_server.py`
+    from smtp_pool import SMTPConnectionPool
 
 # Load environment variables from a .env file if present
 load_dotenv()
 email_recipient = os.getenv("EMAIL_USER")
 
+# The server lives as long as the client's MCP session, so connections are reused across sends
+smtp_pool = SMTPConnectionPool(
+    host=os.getenv("SMTP_SERVER", "smtp.gmail.com"),
+    port=int(os.getenv("SMTP_PORT", 587)),
+    username=os.getenv("EMAIL_USER"),
+    password=os.getenv("EMAIL_PASSWORD"),
+)
+atexit.register(smtp_pool.close)
+
+# Tool replies for a delivered email start with this; anything else is an error
+SENT_PREFIX = "Successfully sent email to"
+
 # Initialize the MCP Server
 mcp = FastMCP("email-service")
 
 
+class OutgoingEmail(BaseModel):
+    subject: str = Field(description="The subject line of the email.")
+    html_body: str = Field(description="The content of the email (HTML format supported).")
+    recipient: Optional[str] = Field(default=None, description="The receiver (comma-separated for several); defaults to EMAIL_USER.")
+
+
+class ThemeReport(BaseModel):
+    theme: str = Field(description="The thematic topic the report is about.")
+    html_body: str = Field(description="The report's HTML body.")
+
+
+def send_html_email(subject: str, html_body: str, recipient: Optional[str] = None) -> str:
+    """
+    Send an HTML email over the pooled connection; raises on failure (ValueError if a retry
+    cannot succeed: missing settings, or every recipient refused).
+
+    `recipient` may list several comma-separated addresses. Returns the addresses the email
+    was delivered to, followed by a note on those the server refused, if any.
+    """
+    sender_email = os.getenv("EMAIL_USER")
+    if not sender_email:
+        raise ValueError("EMAIL_USER environment variable is not set.")
+    recipient = recipient or email_recipient
+    recipients = [address.strip() for address in (recipient or "").split(",") if address.strip()]
+    if not recipients:
+        raise ValueError("No recipient given.")
+
+    msg = MIMEMultipart()
+    msg["From"] = sender_email
+    msg["To"] = recipient
+    msg["Subject"] = subject
+    # We use 'html' as the second argument to render tables/bolding correctly; utf-8 is sent
+    # base64-encoded, so long single-line bodies stay within SMTP's line length limit
+    msg.attach(MIMEText(html_body, "html", "utf-8"))
+
+    try:
+        refused = smtp_pool.sendmail(sender_email, recipients, msg.as_string())
+    except smtplib.SMTPRecipientsRefused as e:
+        # Sending again would be refused again
+        raise ValueError(f"All recipients were refused: {_describe_refused(e.recipients)}") from e
+    delivered = ", ".join(address for address in recipients if address not in refused)
+    if not refused:
+        return delivered
+    # Partial delivery: some addresses got the email, so it is reported as sent, not retried
+    return f"{delivered} (refused: {_describe_refused(refused)})"
+
+
+def _describe_refused(refused: Dict[str, Tuple[int, bytes]]) -> str:
+    return "; ".join(
+        f"{address}: {code} {reply.decode(errors='replace') if isinstance(reply, bytes) else reply}"
+        for address, (code, reply) in refused.items()
+    )
+
+
+def _deliver(subject: str, html_body: str, recipient: Optional[str]) -> str:
+    try:
+        return f"{SENT_PREFIX} {send_html_email(subject, html_body, recipient)}"
+    except ValueError as e:
+        return f"Error: {e}"
+    except Exception as e:
+        return f"Failed to send email. Error: {str(e)}"
+
+
+def build_digest(reports: List[ThemeReport]) -> str:
+    """Merge several theme reports into one HTML body, one section per theme."""
+    sections = [
+        f'<h1 style="font-family: Arial, Helvetica, sans-serif; color: #202124;">{html.escape(report.theme)}</h1>\n'
+        f"{report.html_body}"
+        for report in reports
+    ]
+    return '\n<hr style="border: none; border-top: 1px solid #e0e0e0; margin: 32px 0;">\n'.join(sections)
+
+
 @mcp.tool()
 def send_email(subject: str, html_body: str, recipient: str = email_recipient) -> str:
     """
-    Sends an HTML email using SMTP.
+    Sends an HTML email using SMTP. Recipients the server refused are listed in the reply.
 
     Args:
         subject: The subject line of the email.
         html_body: The content of the email (HTML format supported).
-        recipient: The email address of the receiver.
+        recipient: The email address of the receiver (comma-separated for several).
     """
-    # 1. specific configuration (Use Env Variables for security)
-    smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
-    smtp_port = int(os.getenv("SMTP_PORT", 587))
-    sender_email = os.getenv("EMAIL_USER")
-    sender_password = os.getenv("EMAIL_PASSWORD")
+    return _deliver(subject, html_body, recipient)
 
-    if not sender_email or not sender_password:
-        return "Error: EMAIL_USER or EMAIL_PASSWORD environment variables are not set."
 
-    try:
-        # 2. Create the email object
-        msg = MIMEMultipart()
-        msg["From"] = sender_email
-        msg["To"] = recipient
-        msg["Subject"] = subject
+@mcp.tool()
+def send_emails(emails: List[OutgoingEmail]) -> List[str]:
+    """
+    Sends several HTML emails over the same SMTP connection.
 
-        # Attach the HTML body
-        # We use 'html' as the second argument to render tables/bolding correctly
-        msg.attach(MIMEText(html_body, "html"))
+    Args:
+        emails: The emails to send, each with a subject, an HTML body and an optional recipient.
 
-        # 3. Connect to the SMTP Server
-        print(f"Connecting to {smtp_server}...")
-        server = smtplib.SMTP(smtp_server, smtp_port)
-        server.starttls()  # Secure the connection
+    Returns:
+        One status line per email, in the same order.
+    """
+    return [_deliver(email.subject, email.html_body, email.recipient) for email in emails]
 
-        # 4. Login and Send
-        server.login(sender_email, sender_password)
-        text = msg.as_string()
-        server.sendmail(sender_email, recipient, text)
-        server.quit()
 
-        return f"Successfully sent email to {recipient}"
+@mcp.tool()
+def send_digest(
+        reports: List[ThemeReport],
+        subject: str = "Daily Trading Idea Digest",
+        recipient: str = email_recipient,
+) -> str:
+    """
+    Merges several theme reports into a single email and sends it.
 
-    except Exception as e:
-        return f"Failed to send email. Error: {str(e)}"
+    Args:
+        reports: The reports to include, each with its theme and HTML body.
+        subject: The subject line of the digest.
+        recipient: The email address of the receiver (comma-separated for several).
+    """
+    if not reports:
+        return "Error: no reports to send."
+    return _deliver(subject, build_digest(reports), recipient)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,164 @@
+"""
+Pooled SMTP connections for the email MCP server.
+
+Opening an SMTP connection costs a TCP connect, the STARTTLS handshake and a login. The
+pool keeps up to `size` logged-in connections open between sends and reuses them:
+
+- a connection idle for longer than `healthcheck_after` seconds is checked with NOOP
+  before it is reused, and one idle for longer than `idle_timeout` is closed instead
+  (servers drop idle clients after a few minutes anyway);
+- a send that fails because the connection was dropped is retried once on a new connection.
+"""
+
+import os
+import smtplib
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# --- Configuration ---
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", "2"))
+SMTP_IDLE_TIMEOUT_SECONDS = float(os.getenv("SMTP_IDLE_TIMEOUT_SECONDS", "240"))
+SMTP_HEALTHCHECK_SECONDS = float(os.getenv("SMTP_HEALTHCHECK_SECONDS", "30"))
+SMTP_TIMEOUT_SECONDS = float(os.getenv("SMTP_TIMEOUT_SECONDS", "30"))
+# Set to false for a local SMTP stand-in without TLS (e.g. `python -m aiosmtpd -n -l localhost:1025`)
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "true").lower() == "true"
+
+
+def _log(message: str) -> None:
+    # stdout carries the MCP protocol when the server runs over stdio
+    print(message, file=sys.stderr)
+
+
+class SMTPConnectionPool:
+    """A thread-safe pool of logged-in `smtplib.SMTP` connections to one server."""
+
+    def __init__(
+            self,
+            host: str,
+            port: int,
+            username: Optional[str] = None,
+            password: Optional[str] = None,
+            size: int = SMTP_POOL_SIZE,
+            starttls: bool = SMTP_STARTTLS,
+            idle_timeout: float = SMTP_IDLE_TIMEOUT_SECONDS,
+            healthcheck_after: float = SMTP_HEALTHCHECK_SECONDS,
+            timeout: float = SMTP_TIMEOUT_SECONDS,
+            smtp_factory: Callable[..., smtplib.SMTP] = smtplib.SMTP,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.idle_timeout = idle_timeout
+        self.healthcheck_after = healthcheck_after
+        self.timeout = timeout
+        self.smtp_factory = smtp_factory
+        self.connections_opened: int = 0
+        self._idle: List[Tuple[smtplib.SMTP, float]] = []  # (connection, last used); most recent last
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max(size, 1))
+
+    def _connect(self) -> smtplib.SMTP:
+        _log(f"Connecting to {self.host}:{self.port}...")
+        connection = self.smtp_factory(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                connection.starttls()
+            if self.username and self.password:
+                connection.login(self.username, self.password)
+        except Exception:
+            self._close(connection)
+            raise
+        self.connections_opened += 1
+        return connection
+
+    @staticmethod
+    def _close(connection: smtplib.SMTP) -> None:
+        try:
+            connection.quit()
+        except Exception:
+            connection.close()
+
+    @staticmethod
+    def _is_alive(connection: smtplib.SMTP) -> bool:
+        try:
+            return connection.noop()[0] == 250
+        except Exception:
+            return False
+
+    def _acquire(self) -> smtplib.SMTP:
+        self._slots.acquire()
+        try:
+            while True:
+                with self._lock:
+                    if not self._idle:
+                        break
+                    connection, last_used = self._idle.pop()
+                idle = time.monotonic() - last_used
+                if idle <= self.healthcheck_after or (idle <= self.idle_timeout and self._is_alive(connection)):
+                    return connection
+                self._close(connection)
+            return self._connect()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _release(self, connection: smtplib.SMTP, reusable: bool) -> None:
+        if reusable:
+            with self._lock:
+                self._idle.append((connection, time.monotonic()))
+        else:
+            self._close(connection)
+        self._slots.release()
+
+    def sendmail(self, sender: str, recipients: Sequence[str], message: str) -> Dict[str, Tuple[int, bytes]]:
+        """
+        Send `message` over a pooled connection; retried once if the connection was dropped.
+
+        Returns the recipients the server refused (address -> (code, message)), as
+        `smtplib.SMTP.sendmail` does; it raises if all of them were refused.
+        """
+        for attempt in range(2):
+            connection = self._acquire()
+            try:
+                refused = connection.sendmail(sender, list(recipients), message)
+            except smtplib.SMTPResponseException as e:
+                # 421: the server is closing the connection
+                dropped = e.smtp_code == 421
+                self._release(connection, reusable=not dropped)
+                if not dropped or attempt == 1:
+                    raise
+            except smtplib.SMTPServerDisconnected:
+                self._release(connection, reusable=False)
+                if attempt == 1:
+                    raise
+            except smtplib.SMTPException:
+                # Refused recipients and the like; the connection itself is fine
+                self._release(connection, reusable=True)
+                raise
+            except OSError:
+                # Socket errors; SMTPException is an OSError as well, hence the order
+                self._release(connection, reusable=False)
+                if attempt == 1:
+                    raise
+            except Exception:
+                self._release(connection, reusable=False)
+                raise
+            else:
+                self._release(connection, reusable=True)
+                return refused
+            _log("SMTP connection lost, reconnecting...")
+
+    def close(self) -> None:
+        """Close the idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection, _ in idle:
+            self._close(connection)
@@ -0,0 +1,173 @@
+"""
+Pipeline runs on a long-lived background event loop, with progress streamed as they go.
+
+`BackgroundRunService` owns one event loop running in a daemon thread and one `Runner`.
+`submit` schedules a run on that loop and returns a `BackgroundRun` immediately. As the
+run's events arrive, the handle records which agent finished when and which state keys
+(scanned tickers, each analyst's findings, the final summary) it wrote, so a UI can
+poll the handle and show partial results while the rest of the pipeline is still running.
+
+All runs share the loop, so concurrent users no longer block each other's script threads,
+and agents, HTTP clients and caches are not rebuilt for every submission. Finished runs
+are evicted, together with their sessions, after `RUN_TTL_SECONDS` or once more than
+`RUN_HISTORY_SIZE` of them are kept, so a long-lived server does not grow without bound.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+from google.adk.apps import App
+from google.adk.events import Event
+from google.adk.runners import Runner
+from google.adk.sessions import BaseSessionService, InMemorySessionService
+from google.genai import types
+
+load_dotenv()
+
+# --- Configuration ---
+# Finished runs (and their sessions) are dropped after this many seconds, or oldest first
+# once more than RUN_HISTORY_SIZE of them are kept
+RUN_TTL_SECONDS: float = float(os.getenv("RUN_TTL_SECONDS", 3600))
+RUN_HISTORY_SIZE: int = int(os.getenv("RUN_HISTORY_SIZE", 100))
+
+RUNNING, DONE, FAILED = "running", "done", "failed"
+
+
+def thematic_topic_query(thematic_topic: str) -> str:
+    return f"The thematic topic is: '{thematic_topic}'. Please execute the task as defined in your system instructions."
+
+
+@dataclass
+class StageUpdate:
+    """An agent's final response or state change, as it was streamed."""
+    agent: str
+    elapsed: float  # Seconds since the run started
+    state_keys: List[str] = field(default_factory=list)
+    text: Optional[str] = None
+
+
+@dataclass
+class BackgroundRun:
+    """Handle of a submitted run; updated from the background loop, read from the UI thread."""
+    id: str
+    theme: str
+    user_id: str
+    session_id: Optional[str] = None
+    status: str = RUNNING  # running | done | failed
+    started_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    updates: List[StageUpdate] = field(default_factory=list)
+    state: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.time()) - self.started_at
+
+    def record(self, event: Event) -> None:
+        delta = dict(event.actions.state_delta) if event.actions else {}
+        text = None
+        if event.is_final_response() and event.content and event.content.parts:
+            text = "".join(part.text for part in event.content.parts if part.text) or None
+        if not delta and text is None:
+            return
+        with self._lock:
+            self.state.update(delta)
+            self.updates.append(StageUpdate(event.author, self.elapsed, list(delta), text))
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            self.finished_at = time.time()
+            self.status = DONE if error is None else FAILED
+            self.error = None if error is None else f"{type(error).__name__}: {error}"
+
+    def snapshot(self) -> "BackgroundRun":
+        """A consistent copy for rendering."""
+        with self._lock:
+            return BackgroundRun(
+                id=self.id, theme=self.theme, user_id=self.user_id, session_id=self.session_id, status=self.status, started_at=self.started_at,
+                finished_at=self.finished_at, updates=list(self.updates), state=dict(self.state), error=self.error,
+            )
+
+
+class BackgroundRunService:
+    """
+    Runs `app` on a background event loop; one session per submitted run.
+
+    `runs` only holds the running and recently finished runs: a finished run is evicted, and its
+    session deleted, once it is older than `ttl_seconds` or more than `max_finished_runs` are kept.
+    """
+
+    def __init__(
+            self,
+            app: App,
+            session_service: Optional[BaseSessionService] = None,
+            ttl_seconds: float = RUN_TTL_SECONDS,
+            max_finished_runs: int = RUN_HISTORY_SIZE,
+    ) -> None:
+        self.app_name = app.name
+        self.session_service = session_service or InMemorySessionService()
+        self.runner = Runner(app=app, session_service=self.session_service)
+        self.ttl_seconds = ttl_seconds
+        self.max_finished_runs = max_finished_runs
+        self.runs: Dict[str, BackgroundRun] = {}
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="agent-runs", daemon=True)
+        self._thread.start()
+
+    def submit(self, theme: str, user_id: str = "streamlit_user") -> BackgroundRun:
+        """Start a run for `theme` in the background and return its handle right away."""
+        run = BackgroundRun(id=uuid.uuid4().hex, theme=theme, user_id=user_id)
+        self.runs[run.id] = run
+        asyncio.run_coroutine_threadsafe(self._execute(run), self._loop)
+        return run
+
+    async def _execute(self, run: BackgroundRun) -> None:
+        try:
+            session = await self.session_service.create_session(app_name=self.app_name, user_id=run.user_id)
+            run.session_id = session.id
+            message = types.Content(role="user", parts=[types.Part(text=thematic_topic_query(run.theme))])
+            async for event in self.runner.run_async(user_id=run.user_id, session_id=session.id, new_message=message):
+                if not event.partial:
+                    run.record(event)
+        except Exception as e:
+            logging.error(f"[Runs] Run for '{run.theme}' failed: {e}")
+            run.finish(e)
+        else:
+            run.finish()
+        await self._evict_finished_runs()
+
+    async def _evict_finished_runs(self) -> None:
+        """Drop the finished runs past their TTL or beyond the history size, and delete their sessions."""
+        now = time.time()
+        # Oldest first; `submit` may add runs from the UI thread meanwhile, so work on a copy
+        finished = sorted(
+            (run for run in list(self.runs.values()) if run.finished_at is not None),
+            key=lambda run: run.finished_at,
+        )
+        over_limit = max(len(finished) - self.max_finished_runs, 0)
+        expired = [
+            run for index, run in enumerate(finished)
+            if index < over_limit or now - run.finished_at > self.ttl_seconds
+        ]
+        for run in expired:
+            self.runs.pop(run.id, None)
+            if run.session_id is None:
+                continue
+            try:
+                await self.session_service.delete_session(
+                    app_name=self.app_name, user_id=run.user_id, session_id=run.session_id
+                )
+            except Exception as e:
+                logging.warning(f"[Runs] Could not delete the session of run {run.id}: {e}")
+        if expired:
+            logging.info(f"[Runs] Evicted {len(expired)} finished runs, {len(self.runs)} kept.")
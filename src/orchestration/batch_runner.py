@@ -0,0 +1,188 @@
+"""
+Batch runner: analyze many thematic topics in one run.
+
+The single-theme entry points (`main.py`, `streamlit_app.py`) run the whole agent tree
+once per theme, so a ticker that appears in many themes is fetched and analyzed once per
+theme. `BatchRunner` splits the pipeline into three phases instead:
+
+1. Scan: the ticker scanner runs for every theme concurrently (at most
+   `max_concurrency` themes at a time), each theme in its own session.
+2. Prefetch: the union of the scanned tickers is passed once to the price/technical,
+   institution rating and social sentiment tools. Their results are memoized per ticker
+   (see `function_tools.ticker_memo`); the batch runs a copy of the analysis agents that
+   uses the memoized tools, so single-theme runs are unaffected.
+3. Fan out: every theme's analysts, summarizer and (optionally) email dispatch run in the
+   theme's session. The analyst tool calls are answered from the per-ticker memo, so the
+   data fetching cost grows with the number of unique tickers, not themes x tickers.
+
+The same plugins as the single-theme app (caches, instrumentation) are installed.
+"""
+
+import asyncio
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+from google.adk.agents import LlmAgent
+from google.adk.agents.base_agent import BaseAgent
+from google.adk.apps import App
+from google.adk.runners import Runner
+from google.adk.sessions import BaseSessionService, InMemorySessionService
+from google.genai import types
+
+from agents.agent import analysis_summary_agent, plugins
+from agents.analysts_team.deterministic_analyst import DeterministicAnalystAgent, scanned_tickers_from_state
+from agents.configs.context_compaction_config import context_compaction_config
+from agents.email_dispatch import email_dispatch_agent
+from agents.ticker_scanner_agent import root_ticker_scanner_agent
+from function_tools.async_tools import (
+    fetch_price_and_technical_analysis_async,
+    get_social_sentiment_summary_async,
+    memoized_analyst_tools,
+    run_analysis_for_multiple_tickers_async,
+)
+
+load_dotenv()
+
+# --- Configuration ---
+# Themes processed at the same time in each phase
+BATCH_MAX_CONCURRENCY: int = int(os.getenv("BATCH_MAX_CONCURRENCY", 4))
+
+APP_NAME = "TradingIdeaApp"
+USER_ID = "batch_user"
+
+
+def thematic_topic_query(thematic_topic: str) -> str:
+    return f"The thematic topic is: '{thematic_topic}'. Please execute the task as defined in your system instructions."
+
+
+def with_tools(agent: BaseAgent, replacements: Dict[Any, Any]) -> BaseAgent:
+    """A copy of the agent tree in which every tool found in `replacements` is swapped."""
+    clone = agent.clone()
+    pending = [clone]
+    while pending:
+        current = pending.pop()
+        if isinstance(current, DeterministicAnalystAgent):
+            current.tool = replacements.get(current.tool, current.tool)
+        elif isinstance(current, LlmAgent):
+            current.tools = [replacements.get(tool, tool) for tool in current.tools]
+        pending.extend(current.sub_agents)
+    return clone
+
+
+@dataclass
+class ThemeResult:
+    """Outcome of one theme in a batch."""
+    theme: str
+    session_id: str
+    tickers: List[str] = field(default_factory=list)
+    state: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def final_summary(self) -> Optional[str]:
+        return self.state.get("final_summary")
+
+
+class BatchRunner:
+    """Runs the agent pipeline for a list of themes, fetching each unique ticker once."""
+
+    def __init__(
+            self,
+            max_concurrency: int = BATCH_MAX_CONCURRENCY,
+            send_email: bool = True,
+            session_service: Optional[BaseSessionService] = None,
+    ) -> None:
+        self.max_concurrency = max_concurrency
+        self.send_email = send_email
+        self.session_service = session_service or InMemorySessionService()
+        self.tools = memoized_analyst_tools()
+
+        # One runner per stage; all of them share the session service, so a theme's
+        # later stages see the state written by its scanner
+        self._scanner_runner = self._runner(root_ticker_scanner_agent)
+        self._analysis_runner = self._runner(with_tools(analysis_summary_agent, self.tools))
+        self._email_runner = self._runner(email_dispatch_agent)
+
+    def _runner(self, agent: BaseAgent) -> Runner:
+        app = App(
+            name=APP_NAME,
+            root_agent=agent,
+            plugins=plugins,
+            events_compaction_config=context_compaction_config,
+        )
+        return Runner(app=app, session_service=self.session_service)
+
+    async def _run_stage(self, runner: Runner, result: ThemeResult) -> None:
+        message = types.Content(role="user", parts=[types.Part(text=thematic_topic_query(result.theme))])
+        async for _ in runner.run_async(user_id=USER_ID, session_id=result.session_id, new_message=message):
+            pass
+        session = await self.session_service.get_session(
+            app_name=APP_NAME, user_id=USER_ID, session_id=result.session_id
+        )
+        result.state = dict(session.state)
+
+    async def _scan(self, theme: str, semaphore: asyncio.Semaphore) -> ThemeResult:
+        session = await self.session_service.create_session(app_name=APP_NAME, user_id=USER_ID)
+        result = ThemeResult(theme=theme, session_id=session.id)
+        async with semaphore:
+            try:
+                await self._run_stage(self._scanner_runner, result)
+            except Exception as e:
+                result.error = f"Ticker scan failed: {e}"
+                return result
+
+        result.tickers = [
+            ticker["symbol"].upper()
+            for ticker in scanned_tickers_from_state(result.state.get("structured_ticker_scanner_findings"))
+        ]
+        logging.info(f"[Batch] '{theme}': {len(result.tickers)} tickers scanned")
+        return result
+
+    async def _analyze(self, result: ThemeResult, semaphore: asyncio.Semaphore) -> ThemeResult:
+        async with semaphore:
+            try:
+                await self._run_stage(self._analysis_runner, result)
+                if self.send_email:
+                    await self._run_stage(self._email_runner, result)
+            except Exception as e:
+                result.error = f"Analysis failed: {e}"
+        return result
+
+    async def prefetch(self, symbols: List[str]) -> None:
+        """Fetch every analyst's data for `symbols` once, filling the per-ticker memo."""
+        if not symbols:
+            return
+        outcomes = await asyncio.gather(
+            self.tools[fetch_price_and_technical_analysis_async](symbols),
+            self.tools[run_analysis_for_multiple_tickers_async](symbols),
+            self.tools[get_social_sentiment_summary_async](symbols),
+            return_exceptions=True,
+        )
+        for outcome in outcomes:
+            # The analysts retry whatever could not be prefetched on their own
+            if isinstance(outcome, Exception):
+                logging.warning(f"[Batch] Prefetch failed: {outcome}")
+
+    async def run(self, themes: List[str]) -> List[ThemeResult]:
+        """Analyze every theme (duplicates are dropped) and return one result per theme, in order."""
+        themes = list(dict.fromkeys(theme.strip() for theme in themes if theme.strip()))
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        results = await asyncio.gather(*(self._scan(theme, semaphore) for theme in themes))
+
+        scanned = [result for result in results if result.error is None and result.tickers]
+        unique_tickers = list(dict.fromkeys(ticker for result in scanned for ticker in result.tickers))
+        logging.info(
+            f"[Batch] {len(themes)} themes, {sum(len(result.tickers) for result in scanned)} tickers "
+            f"({len(unique_tickers)} unique)"
+        )
+        await self.prefetch(unique_tickers)
+
+        await asyncio.gather(*(self._analyze(result, semaphore) for result in scanned))
+        for result in results:
+            if result.error is None and not result.tickers:
+                result.error = "The scanner found no tickers."
+        return results
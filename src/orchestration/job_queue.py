@@ -0,0 +1,203 @@
+"""
+Job queue for distributing theme analyses across worker processes and nodes.
+
+A job is one theme to analyze. Producers (the UI, a scheduler) `enqueue` jobs and poll
+them with `get`; workers `claim` the oldest available job with a lease, extend the lease
+with `heartbeat` while they work, and finish with `complete` or `fail`. A job whose lease
+runs out (the worker crashed or lost its node) becomes claimable again, until it has
+been attempted `max_attempts` times.
+
+`JobQueue` is the backend interface and is kept narrow so that a networked broker can
+implement it later. `SQLiteJobQueue` stores the jobs in a local SQLite file, which is
+enough for several worker processes on one machine (or nodes sharing a volume) and for
+offline testing.
+
+Environment variables:
+- JOB_QUEUE_PATH: SQLite file location (default `<CACHE_DIR>/jobs.sqlite3`).
+- JOB_LEASE_SECONDS: How long a claim is valid without a heartbeat (default 120).
+- JOB_MAX_ATTEMPTS: Claims per job before it is marked failed (default 3).
+"""
+
+import abc
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from configs.settings import settings
+
+# --- Configuration ---
+JOB_QUEUE_PATH: str = os.getenv("JOB_QUEUE_PATH", os.path.join(settings.cache_dir, "jobs.sqlite3"))
+JOB_LEASE_SECONDS: float = float(os.getenv("JOB_LEASE_SECONDS", 120))
+JOB_MAX_ATTEMPTS: int = int(os.getenv("JOB_MAX_ATTEMPTS", 3))
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+@dataclass
+class Job:
+    """A theme analysis job and its current state."""
+    id: str
+    theme: str
+    status: str  # queued | running | done | failed
+    attempts: int = 0
+    worker_id: Optional[str] = None
+    lease_expires_at: Optional[float] = None  # Epoch seconds
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: float = 0.0
+    updated_at: float = 0.0
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+
+class JobQueue(abc.ABC):
+    """Backend interface for theme jobs."""
+
+    @abc.abstractmethod
+    def enqueue(self, theme: str) -> str:
+        """Add a job for `theme` and return its id."""
+
+    @abc.abstractmethod
+    def claim(self, worker_id: str, lease_seconds: float = JOB_LEASE_SECONDS) -> Optional[Job]:
+        """Lease the oldest available job to `worker_id`, or return None if there is none."""
+
+    @abc.abstractmethod
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: float = JOB_LEASE_SECONDS) -> bool:
+        """Extend the lease; False means the worker no longer holds the job and should stop."""
+
+    @abc.abstractmethod
+    def complete(self, job_id: str, worker_id: str, result: Dict[str, Any]) -> bool:
+        """Store the result of a job held by `worker_id`; False if the lease was lost."""
+
+    @abc.abstractmethod
+    def fail(self, job_id: str, worker_id: str, error: str, retry: bool = True) -> bool:
+        """Release a job after an error; it is re-queued if `retry` and attempts remain."""
+
+    @abc.abstractmethod
+    def get(self, job_id: str) -> Optional[Job]:
+        """Current state (and result, once done) of a job."""
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    theme TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker_id TEXT,
+    lease_expires_at REAL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, created_at);
+"""
+
+
+class SQLiteJobQueue(JobQueue):
+    """
+    `JobQueue` backed by a SQLite file.
+
+    Claims run in an immediate (write-locking) transaction, so two workers never lease
+    the same job, also across processes.
+    """
+
+    def __init__(self, path: str = JOB_QUEUE_PATH, max_attempts: int = JOB_MAX_ATTEMPTS) -> None:
+        self.path = path
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode; transactions are opened explicitly where needed
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def enqueue(self, theme: str) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, theme, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, theme, QUEUED, now, now),
+            )
+        return job_id
+
+    def claim(self, worker_id: str, lease_seconds: float = JOB_LEASE_SECONDS) -> Optional[Job]:
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Jobs whose worker stopped sending heartbeats are given up after the last attempt
+                conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, worker_id = NULL, lease_expires_at = NULL, updated_at = ? "
+                    "WHERE status = ? AND lease_expires_at <= ? AND attempts >= ?",
+                    (FAILED, "Lease expired on the last attempt.", now, RUNNING, now, self.max_attempts),
+                )
+                row = conn.execute(
+                    "SELECT id FROM jobs WHERE status = ? OR (status = ? AND lease_expires_at <= ?) "
+                    "ORDER BY created_at LIMIT 1",
+                    (QUEUED, RUNNING, now),
+                ).fetchone()
+                if row is not None:
+                    conn.execute(
+                        "UPDATE jobs SET status = ?, attempts = attempts + 1, worker_id = ?, lease_expires_at = ?, "
+                        "updated_at = ? WHERE id = ?",
+                        (RUNNING, worker_id, now + lease_seconds, now, row[0]),
+                    )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return None if row is None else self.get(row[0])
+
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: float = JOB_LEASE_SECONDS) -> bool:
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires_at = ?, updated_at = ? WHERE id = ? AND worker_id = ? AND status = ?",
+                (now + lease_seconds, now, job_id, worker_id, RUNNING),
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id: str, worker_id: str, result: Dict[str, Any]) -> bool:
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = NULL, lease_expires_at = NULL, updated_at = ? "
+                "WHERE id = ? AND worker_id = ? AND status = ?",
+                (DONE, json.dumps(result, default=str), time.time(), job_id, worker_id, RUNNING),
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, job_id: str, worker_id: str, error: str, retry: bool = True) -> bool:
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = CASE WHEN ? AND attempts < ? THEN ? ELSE ? END, "
+                "error = ?, worker_id = NULL, lease_expires_at = NULL, updated_at = ? "
+                "WHERE id = ? AND worker_id = ? AND status = ?",
+                (retry, self.max_attempts, QUEUED, FAILED, error, time.time(), job_id, worker_id, RUNNING),
+            )
+            return cursor.rowcount == 1
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, theme, status, attempts, worker_id, lease_expires_at, result, error, created_at, updated_at "
+                "FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return Job(*row[:6], json.loads(row[6]) if row[6] else None, *row[7:])
@@ -0,0 +1,99 @@
+"""
+Worker loop that pulls theme jobs from a `JobQueue` and runs them.
+
+Any number of workers (processes or nodes) can share one queue. Each claims a job with a
+lease, keeps the lease alive with heartbeats while the pipeline runs, and stores the
+theme's scanned tickers, stage outputs and final summary as the job result. If the lease
+is lost (the job timed out and was claimed by another worker), the run is cancelled.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+
+from orchestration.batch_runner import BatchRunner, ThemeResult
+from orchestration.job_queue import JOB_LEASE_SECONDS, Job, JobQueue
+
+load_dotenv()
+
+# --- Configuration ---
+# Seconds between claim attempts while the queue is empty
+JOB_POLL_SECONDS: float = float(os.getenv("JOB_POLL_SECONDS", 2))
+
+
+def job_result(result: ThemeResult) -> Dict[str, Any]:
+    """The JSON-serializable job result for a finished theme."""
+    return {
+        "theme": result.theme,
+        "tickers": result.tickers,
+        "final_summary": result.final_summary,
+        "state": result.state,
+    }
+
+
+class QueueWorker:
+    """Claims jobs from `queue` and runs them one at a time with a `BatchRunner`."""
+
+    def __init__(
+            self,
+            queue: JobQueue,
+            worker_id: Optional[str] = None,
+            send_email: bool = True,
+            lease_seconds: float = JOB_LEASE_SECONDS,
+            poll_seconds: float = JOB_POLL_SECONDS,
+    ) -> None:
+        self.queue = queue
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self.runner = BatchRunner(max_concurrency=1, send_email=send_email)
+
+    async def _keep_lease(self, job: Job, task: asyncio.Future) -> bool:
+        """Send heartbeats until `task` is done; cancels it and returns True if the lease is lost."""
+        while not task.done():
+            await asyncio.sleep(self.lease_seconds / 3)
+            if not await asyncio.to_thread(self.queue.heartbeat, job.id, self.worker_id, self.lease_seconds):
+                logging.warning(f"[Worker] Lost the lease on job {job.id}; cancelling '{job.theme}'")
+                task.cancel()
+                return True
+        return False
+
+    async def run_job(self, job: Job) -> None:
+        logging.info(f"[Worker] {self.worker_id} running job {job.id} ('{job.theme}', attempt {job.attempts})")
+        task = asyncio.ensure_future(self.runner.run([job.theme]))
+        heartbeat = asyncio.create_task(self._keep_lease(job, task))
+        try:
+            result = (await task)[0]
+        except asyncio.CancelledError:
+            # Another worker owns the job now; only our own shutdown propagates
+            if heartbeat.done() and not heartbeat.cancelled() and heartbeat.result():
+                return
+            raise
+        except Exception as e:
+            await asyncio.to_thread(self.queue.fail, job.id, self.worker_id, f"{type(e).__name__}: {e}")
+            return
+        finally:
+            heartbeat.cancel()
+
+        if result.error:
+            await asyncio.to_thread(self.queue.fail, job.id, self.worker_id, result.error)
+        else:
+            await asyncio.to_thread(self.queue.complete, job.id, self.worker_id, job_result(result))
+
+    async def run(self, max_jobs: Optional[int] = None, exit_when_idle: bool = False) -> int:
+        """Process jobs until `max_jobs` have run (or the queue is empty, with `exit_when_idle`)."""
+        processed = 0
+        while max_jobs is None or processed < max_jobs:
+            job = await asyncio.to_thread(self.queue.claim, self.worker_id, self.lease_seconds)
+            if job is None:
+                if exit_when_idle:
+                    break
+                await asyncio.sleep(self.poll_seconds)
+                continue
+            await self.run_job(job)
+            processed += 1
+        return processed
@@ -0,0 +1,296 @@
+"""
+Disk-backed session service with bounded memory and event retention.
+
+`InMemorySessionService` keeps every session, with every event, for the lifetime of the
+process. `BoundedSqliteSessionService` keeps the same in-memory behaviour for the
+sessions in use, but:
+
+- writes sessions, events and app/user state to a SQLite file, so runs survive restarts;
+- holds at most `max_cached_sessions` sessions in memory, least recently used first out,
+  and reloads an evicted session from disk the next time it is used;
+- keeps at most `max_events` events per session, dropping the oldest ones;
+- deletes sessions that have been idle for longer than `ttl_seconds`.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, List, Optional
+
+from google.adk.errors.already_exists_error import AlreadyExistsError
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, InMemorySessionService, Session
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+
+from agents.configs.session_config import (
+    SESSION_CACHE_MAX_SESSIONS,
+    SESSION_DB_PATH,
+    SESSION_MAX_EVENTS,
+    SESSION_STORE,
+    SESSION_TTL_SECONDS,
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    last_update_time REAL NOT NULL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (app_name, user_id, id)
+);
+
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS events_by_session ON events (app_name, user_id, session_id, seq);
+
+CREATE TABLE IF NOT EXISTS scoped_state (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,  -- Empty for app-level state
+    state TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id)
+);
+"""
+
+
+def _trim_events(events: List[Event], max_events: int) -> List[Event]:
+    """The newest `max_events` events, without a leading function response whose call was dropped."""
+    if len(events) <= max_events:
+        return events
+    events = events[-max_events:]
+    while events and events[0].get_function_responses():
+        events = events[1:]
+    return events
+
+
+class BoundedSqliteSessionService(InMemorySessionService):
+    """
+    An `InMemorySessionService` whose sessions are persisted to SQLite and bounded in size.
+
+    Reads and writes go through the in-memory maps of the parent class; sessions missing
+    from memory are loaded from disk first.
+    """
+
+    def __init__(
+            self,
+            path: str = SESSION_DB_PATH,
+            max_events: int = SESSION_MAX_EVENTS,
+            max_cached_sessions: int = SESSION_CACHE_MAX_SESSIONS,
+            ttl_seconds: Optional[float] = SESSION_TTL_SECONDS,
+    ) -> None:
+        super().__init__()
+        self.path = path
+        self.max_events = max_events
+        self.max_cached_sessions = max_cached_sessions
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._loaded: "OrderedDict[tuple[str, str, str], None]" = OrderedDict()  # LRU of in-memory sessions
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            for app_name, user_id, state in conn.execute("SELECT app_name, user_id, state FROM scoped_state"):
+                if user_id:
+                    self.user_state.setdefault(app_name, {})[user_id] = json.loads(state)
+                else:
+                    self.app_state[app_name] = json.loads(state)
+        self.purge_expired()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    # --- In-memory LRU ---
+
+    def _touch(self, app_name: str, user_id: str, session_id: str) -> None:
+        key = (app_name, user_id, session_id)
+        self._loaded[key] = None
+        self._loaded.move_to_end(key)
+        while len(self._loaded) > self.max_cached_sessions:
+            evicted_app, evicted_user, evicted_id = self._loaded.popitem(last=False)[0]
+            self.sessions.get(evicted_app, {}).get(evicted_user, {}).pop(evicted_id, None)
+
+    def _load(self, app_name: str, user_id: str, session_id: str) -> bool:
+        """Make sure the session is in memory (reading it from disk if needed); False if it does not exist."""
+        if session_id in self.sessions.get(app_name, {}).get(user_id, {}):
+            self._touch(app_name, user_id, session_id)
+            return True
+
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT state, last_update_time FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?",
+                (app_name, user_id, session_id),
+            ).fetchone()
+            if row is None:
+                return False
+            events = [
+                Event.model_validate_json(data)
+                for (data,) in conn.execute(
+                    "SELECT data FROM events WHERE app_name = ? AND user_id = ? AND session_id = ? ORDER BY seq",
+                    (app_name, user_id, session_id),
+                )
+            ]
+            conn.execute(
+                "UPDATE sessions SET last_access = ? WHERE app_name = ? AND user_id = ? AND id = ?",
+                (time.time(), app_name, user_id, session_id),
+            )
+
+        self.sessions.setdefault(app_name, {}).setdefault(user_id, {})[session_id] = Session(
+            app_name=app_name, user_id=user_id, id=session_id,
+            state=json.loads(row[0]), events=events, last_update_time=row[1],
+        )
+        self._touch(app_name, user_id, session_id)
+        return True
+
+    # --- Persistence ---
+
+    def _save_scoped_state(self, conn: sqlite3.Connection, app_name: str, user_id: str) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO scoped_state (app_name, user_id, state) VALUES (?, '', ?)",
+            (app_name, json.dumps(self.app_state.get(app_name, {}), default=str)),
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO scoped_state (app_name, user_id, state) VALUES (?, ?, ?)",
+            (app_name, user_id, json.dumps(self.user_state.get(app_name, {}).get(user_id, {}), default=str)),
+        )
+
+    def _save_session(self, conn: sqlite3.Connection, session: Session) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO sessions (app_name, user_id, id, state, last_update_time, last_access) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (session.app_name, session.user_id, session.id, json.dumps(session.state, default=str),
+             session.last_update_time, time.time()),
+        )
+
+    def purge_expired(self) -> int:
+        """Delete sessions idle for longer than `ttl_seconds`; returns how many were deleted."""
+        if self.ttl_seconds is None:
+            return 0
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock, self._connect() as conn:
+            expired = conn.execute(
+                "SELECT app_name, user_id, id FROM sessions WHERE last_access < ?", (cutoff,)
+            ).fetchall()
+            for app_name, user_id, session_id in expired:
+                self._delete_from_disk(conn, app_name, user_id, session_id)
+        for app_name, user_id, session_id in expired:
+            self.sessions.get(app_name, {}).get(user_id, {}).pop(session_id, None)
+            self._loaded.pop((app_name, user_id, session_id), None)
+        return len(expired)
+
+    @staticmethod
+    def _delete_from_disk(conn: sqlite3.Connection, app_name: str, user_id: str, session_id: str) -> None:
+        conn.execute("DELETE FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                     (app_name, user_id, session_id))
+        conn.execute("DELETE FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?",
+                     (app_name, user_id, session_id))
+
+    # --- BaseSessionService ---
+
+    async def create_session(
+            self,
+            *,
+            app_name: str,
+            user_id: str,
+            state: Optional[dict[str, Any]] = None,
+            session_id: Optional[str] = None,
+    ) -> Session:
+        session_id = session_id.strip() if session_id else None
+        if session_id and self._load(app_name, user_id, session_id):
+            raise AlreadyExistsError(f"Session with id {session_id} already exists.")
+
+        session = await super().create_session(app_name=app_name, user_id=user_id, state=state, session_id=session_id)
+        stored = self.sessions[app_name][user_id][session.id]
+        with self._lock, self._connect() as conn:
+            self._save_session(conn, stored)
+            self._save_scoped_state(conn, app_name, user_id)
+        self._touch(app_name, user_id, session.id)
+        return session
+
+    async def get_session(
+            self,
+            *,
+            app_name: str,
+            user_id: str,
+            session_id: str,
+            config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        session_id = session_id.strip() if session_id else session_id
+        if not self._load(app_name, user_id, session_id):
+            return None
+        return await super().get_session(app_name=app_name, user_id=user_id, session_id=session_id, config=config)
+
+    async def list_sessions(self, *, app_name: str, user_id: Optional[str] = None) -> ListSessionsResponse:
+        query = "SELECT user_id, id, state, last_update_time FROM sessions WHERE app_name = ?"
+        params: tuple = (app_name,)
+        if user_id is not None:
+            query += " AND user_id = ?"
+            params += (user_id,)
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(query + " ORDER BY last_update_time, user_id, id", params).fetchall()
+
+        return ListSessionsResponse(sessions=[
+            self._merge_state(app_name, row_user_id, Session(
+                app_name=app_name, user_id=row_user_id, id=session_id,
+                state=json.loads(state), last_update_time=last_update_time,
+            ))
+            for row_user_id, session_id, state, last_update_time in rows
+        ])
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        session_id = session_id.strip() if session_id else session_id
+        await super().delete_session(app_name=app_name, user_id=user_id, session_id=session_id)
+        self._loaded.pop((app_name, user_id, session_id), None)
+        with self._lock, self._connect() as conn:
+            self._delete_from_disk(conn, app_name, user_id, session_id)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        if event.partial:
+            return event
+        # The runner may hold a session that was evicted from memory since it was fetched
+        self._load(session.app_name, session.user_id, session.id)
+        stored = self.sessions.get(session.app_name, {}).get(session.user_id, {}).get(session.id)
+        events_before = len(stored.events) if stored is not None else 0
+
+        event = await super().append_event(session=session, event=event)
+
+        stored = self.sessions[session.app_name][session.user_id][session.id]
+        if len(stored.events) == events_before:
+            return event  # A re-delivered event; nothing changed
+        stored.events = _trim_events(stored.events, self.max_events)
+
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO events (app_name, user_id, session_id, data) VALUES (?, ?, ?, ?)",
+                (session.app_name, session.user_id, session.id, event.model_dump_json(exclude_none=True)),
+            )
+            if len(stored.events) < events_before + 1:
+                # Drop the events trimmed from memory from disk as well
+                conn.execute(
+                    "DELETE FROM events WHERE app_name = ? AND user_id = ? AND session_id = ? AND seq NOT IN "
+                    "(SELECT seq FROM events WHERE app_name = ? AND user_id = ? AND session_id = ? "
+                    "ORDER BY seq DESC LIMIT ?)",
+                    (session.app_name, session.user_id, session.id,
+                     session.app_name, session.user_id, session.id, len(stored.events)),
+                )
+            self._save_session(conn, stored)
+            if event.actions and event.actions.state_delta:
+                self._save_scoped_state(conn, session.app_name, session.user_id)
+        return event
+
+
+def create_session_service() -> BaseSessionService:
+    """The session service selected by `SESSION_STORE` (`sqlite` or `memory`)."""
+    if SESSION_STORE == "memory":
+        return InMemorySessionService()
+    return BoundedSqliteSessionService()
@@ -0,0 +1,122 @@
+"""
+Process-pool execution mode: run theme analyses in several worker processes.
+
+In a single process, the CPU-bound parts of a run (indicator math, pandas reshaping,
+JSON/pydantic validation, HTML assembly) share one GIL and one event loop with every
+other theme. `WorkerPool` hands one job per theme to `num_workers` worker processes and
+collects the `ThemeResult`s as they come back from the pool's result queue.
+
+Each worker builds the agent tree and a `BatchRunner` once, when it starts, and keeps
+its own event loop, so agents, HTTP clients, caches and the per-ticker memo are reused
+by every job the worker runs. Within a worker, a ticker is fetched at most once per
+`TICKER_MEMO_TTL_SECONDS`. Across workers, every process fetches what it needs itself.
+
+Per-process API quotas (the Finnhub rate limiter) are divided between the workers, so
+all of them together stay within the account limits.
+"""
+
+import asyncio
+import atexit
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterator, List, Optional
+
+from dotenv import load_dotenv
+
+from orchestration.batch_runner import BatchRunner, ThemeResult
+
+load_dotenv()
+
+# --- Configuration ---
+# Worker processes; defaults to one per CPU core
+WORKER_POOL_SIZE: int = int(os.getenv("WORKER_POOL_SIZE", os.cpu_count() or 1))
+
+# Set in each worker process by `_init_worker`
+_worker_runner: Optional[BatchRunner] = None
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _init_worker(num_workers: int, send_email: bool) -> None:
+    """Warm up a worker process: share the API quotas and build its runner and event loop."""
+    global _worker_runner, _worker_loop
+
+    logging.basicConfig(
+        level=logging.INFO, format=f"%(asctime)s - %(levelname)s - worker {os.getpid()} - %(message)s"
+    )
+
+    from agents.email_agent import email_mcp_connection
+    from function_tools.get_and_analyze_institution_rating import finnhub_rate_limiter
+
+    finnhub_rate_limiter.share(num_workers)
+
+    _worker_loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_worker_loop)
+    _worker_runner = BatchRunner(max_concurrency=1, send_email=send_email)
+
+    # Close the email MCP server process when the worker exits
+    atexit.register(lambda: _worker_loop.run_until_complete(email_mcp_connection.close()))
+
+
+def _run_theme(theme: str) -> ThemeResult:
+    started = time.perf_counter()
+    result = _worker_loop.run_until_complete(_worker_runner.run([theme]))[0]
+    logging.info(f"[Worker] '{theme}' finished in {time.perf_counter() - started:.1f}s")
+    return result
+
+
+class WorkerPool:
+    """
+    Runs theme analyses in `num_workers` processes.
+
+    Use as a context manager (or call `start` / `stop`):
+
+        with WorkerPool(num_workers=8) as pool:
+            results = pool.run(themes)
+    """
+
+    def __init__(self, num_workers: int = WORKER_POOL_SIZE, send_email: bool = True) -> None:
+        self.num_workers = max(1, num_workers)
+        self.send_email = send_email
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def start(self) -> "WorkerPool":
+        if self._executor is None:
+            # "spawn" gives every worker a fresh interpreter (no forked event loop or SQLite handles)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.num_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.num_workers, self.send_email),
+            )
+        return self
+
+    def stop(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def __enter__(self) -> "WorkerPool":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def iter_results(self, themes: List[str]) -> Iterator[ThemeResult]:
+        """Submit one job per theme (duplicates are dropped) and yield the results as they complete."""
+        self.start()
+        themes = list(dict.fromkeys(theme.strip() for theme in themes if theme.strip()))
+        futures = {self._executor.submit(_run_theme, theme): theme for theme in themes}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                # The worker process died or the result could not be sent back
+                yield ThemeResult(theme=futures[future], session_id="", error=f"Worker failed: {e}")
+
+    def run(self, themes: List[str]) -> List[ThemeResult]:
+        """Analyze every theme in the pool and return the results in the order of `themes`."""
+        results = {result.theme: result for result in self.iter_results(themes)}
+        return [results[theme] for theme in dict.fromkeys(theme.strip() for theme in themes if theme.strip())]
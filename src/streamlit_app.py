@@ -1,16 +1,35 @@
 import streamlit as st
-import asyncio
-import sys
 import os
 from dotenv import load_dotenv
-from google.adk.runners import InMemoryRunner
 from agents.agent import app
+from orchestration.background_runs import DONE, FAILED, BackgroundRunService
+from orchestration.job_queue import SQLiteJobQueue
+from orchestration.session_service import create_session_service
+from utils.json_utils import extract_json
 
 # Load environment variables
 load_dotenv()
 
-if "runner" not in st.session_state:
-    st.session_state.runner = InMemoryRunner(app=app)
+# Submit runs to the job queue (processed by `src/job_worker.py work`) instead of running them in this process
+STREAMLIT_USE_JOB_QUEUE: bool = os.getenv("STREAMLIT_USE_JOB_QUEUE", "false").lower() == "true"
+
+STAGE_LABELS = {
+    "structured_ticker_scanner_findings": "🔎 Scanned Tickers",
+    "structured_technical_analyst_findings": "📈 Technical Analysis",
+    "structured_institution_rating_findings": "🏦 Institution Ratings",
+    "structured_social_media_sentiment_findings": "💬 Social Media Sentiment",
+}
+
+
+@st.cache_resource
+def get_run_service() -> BackgroundRunService:
+    # One background event loop and runner for the whole server, shared by every browser session
+    return BackgroundRunService(app, session_service=create_session_service())
+
+
+@st.cache_resource
+def get_job_queue() -> SQLiteJobQueue:
+    return SQLiteJobQueue()
 
 st.set_page_config(
     page_title="Thematic Trading Idea Agent", page_icon="💎", layout="wide"
@@ -66,48 +85,104 @@ def main():
         if not thematic_topic.strip():
             st.error("😿 Topic cannot be empty. Please try again.")
         else:
-            run_analysis(thematic_topic)
-
-
-def run_analysis(topic: str):
-    st.info(
-        f"Analyzing topic: '{topic}'... Please wait while the Agent team runs its analysis... ⏳"
-    )
-
-    agent_query = f"The thematic topic is: '{topic}'. Please execute the task as defined in your system instructions."
-
-    # Container for output
-    output_container = st.container()
-
-    async def run_agent():
-        try:
-            # Capture stdout to redirect to Streamlit
-            # This is a bit tricky with asyncio and Streamlit,
-            # for now we will just await the result and show the final response.
-            # If we want streaming logs, we'd need a custom log handler.
-
-            response = await st.session_state.runner.run_debug(agent_query)
-            return response
-        except Exception as e:
-            return f"Error: {e}"
-
-    # Run the async function
-    try:
-        response = asyncio.run(run_agent())
-
-        st.success(f"--- AGENT ANALYSIS COMPLETE for '{topic}' ---")
-
-        # Display the result
-        # The response structure depends on what runner.run_debug returns.
-        # Usually it prints to stdout. If it returns the final state/output, we display it.
-        # Since the original main.py just printed to stdout, we might not see much here
-        # unless we capture stdout or if run_debug returns the conversation.
+            submit_analysis(thematic_topic.strip())
+
+    if STREAMLIT_USE_JOB_QUEUE:
+        render_jobs()
+    elif any(run.status not in (DONE, FAILED) for run in known_runs()):
+        render_runs_live()
+    else:
+        render_runs()
+
+
+def submit_analysis(topic: str):
+    # Returns immediately; the analysis runs in the background (or on a queue worker)
+    if STREAMLIT_USE_JOB_QUEUE:
+        st.session_state.setdefault("job_ids", []).append(get_job_queue().enqueue(topic))
+    else:
+        st.session_state.setdefault("run_ids", []).append(get_run_service().submit(topic).id)
+
+
+@st.fragment(run_every=1.0)
+def render_runs_live():
+    render_runs()
+    if all(run.status in (DONE, FAILED) for run in known_runs()):
+        # Stop polling once every run has finished
+        st.rerun()
+
+
+def known_runs():
+    """This browser session's runs, oldest first; ids the service no longer knows are dropped."""
+    # Runs are evicted after a while, and all of them are gone if the cached service was rebuilt
+    service = get_run_service()
+    runs = [run for run in map(service.runs.get, st.session_state.get("run_ids", [])) if run is not None]
+    st.session_state["run_ids"] = [run.id for run in runs]
+    return runs
+
+
+def render_runs():
+    for handle in reversed(known_runs()):
+        run = handle.snapshot()
+        with st.container(border=True):
+            if run.status == DONE:
+                st.success(f"--- AGENT ANALYSIS COMPLETE for '{run.theme}' ({run.elapsed:.0f}s) ---")
+            elif run.status == FAILED:
+                st.error(f"An error occurred while analyzing '{run.theme}': {run.error}")
+            else:
+                st.info(f"Analyzing topic: '{run.theme}'... {run.elapsed:.0f}s ⏳")
+
+            with st.expander("Progress", expanded=run.status not in (DONE, FAILED)):
+                for update in run.updates:
+                    keys = f" → {', '.join(update.state_keys)}" if update.state_keys else ""
+                    st.markdown(f"✅ `{update.elapsed:6.1f}s` **{update.agent}**{keys}")
+
+            render_state(run.state)
+
+
+def render_jobs():
+    queue = get_job_queue()
+    for job_id in reversed(st.session_state.get("job_ids", [])):
+        job = queue.get(job_id)
+        with st.container(border=True):
+            if job.status == DONE:
+                st.success(f"--- AGENT ANALYSIS COMPLETE for '{job.theme}' ---")
+                render_state(job.result["state"])
+            elif job.status == FAILED:
+                st.error(f"An error occurred while analyzing '{job.theme}': {job.error}")
+            else:
+                st.info(f"'{job.theme}' is {job.status} (attempt {job.attempts})... ⏳")
+                if st.button("🔄 Refresh", key=f"refresh_{job_id}"):
+                    st.rerun()
+
+
+def render_state(state: dict):
+    """Show the stage outputs available so far: tickers, analyst findings and the final summary."""
+    for key, label in STAGE_LABELS.items():
+        value = state.get(key)
+        if value is None:
+            continue
+        if isinstance(value, str):
+            value = extract_json(value) or value
+
+        st.markdown(f"#### {label}")
+        if key == "structured_ticker_scanner_findings" and isinstance(value, dict):
+            st.dataframe(value.get("scanned_tickers", []), width="stretch")
+        elif isinstance(value, (dict, list)):
+            with st.expander("Findings", expanded=False):
+                st.json(value)
+        else:
+            st.write(value)
 
+    if state.get("final_summary"):
         st.markdown("### Analysis Results")
-        st.write(response)
+        st.markdown(state["final_summary"], unsafe_allow_html=True)
 
-    except Exception as e:
-        st.error(f"An error occurred: {e}")
+    receipt = state.get("email_receipt")
+    if receipt:
+        if receipt["status"] == "sent":
+            st.caption(f"📧 Emailed to {receipt['recipient']} at {receipt['sent_at']}")
+        else:
+            st.caption(f"📧 Email {receipt['status']}: {receipt['error']}")
 
 
 if __name__ == "__main__":
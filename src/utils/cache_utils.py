@@ -0,0 +1,162 @@
+"""
+Small key/value cache backends with per-entry TTLs.
+
+- `InMemoryLRUCache`: process-local, bounded by entry count, least recently used first out.
+- `SQLiteCache`: persistent JSON values in a local SQLite file, bounded the same way.
+- `TieredCache`: an in-memory LRU in front of a persistent backend.
+
+All backends share the same `get` / `set` / `delete` / `clear` interface and are safe
+to use from multiple threads. A `ttl` of `None` means the entry never expires.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class InMemoryLRUCache:
+    """Bounded in-memory cache with per-entry expiry."""
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = None if ttl is None else time.time() + ttl
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCache:
+    """
+    Persistent cache storing JSON-serializable values in a SQLite file.
+
+    Expired entries are dropped when read; the least recently used entries are evicted
+    once the table holds more than `max_entries` rows.
+    """
+
+    def __init__(self, path: str, max_entries: int = 10_000, table: str = "cache") -> None:
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table!r}")
+
+        self.path = path
+        self.max_entries = max_entries
+        self.table = table
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL, last_access REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute(f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                return None
+
+            conn.execute(f"UPDATE {self.table} SET last_access = ? WHERE key = ?", (now, key))
+            return json.loads(value)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        now = time.time()
+        expires_at = None if ttl is None else now + ttl
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), expires_at, now),
+            )
+            (entry_count,) = conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+            if entry_count > self.max_entries:
+                conn.execute(
+                    f"DELETE FROM {self.table} WHERE key IN "
+                    f"(SELECT key FROM {self.table} ORDER BY last_access ASC LIMIT ?)",
+                    (entry_count - self.max_entries,),
+                )
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute(f"DELETE FROM {self.table}")
+
+
+class TieredCache:
+    """
+    An in-memory LRU in front of a persistent cache.
+
+    Reads check memory first and promote persistent hits into memory; writes go to both.
+    The in-memory copy of a promoted entry lives for at most `promoted_ttl` seconds so it
+    cannot outlive the persistent entry by much.
+    """
+
+    def __init__(self, memory: InMemoryLRUCache, persistent: SQLiteCache, promoted_ttl: float = 300) -> None:
+        self.memory = memory
+        self.persistent = persistent
+        self.promoted_ttl = promoted_ttl
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+
+        value = self.persistent.get(key)
+        if value is not None:
+            self.memory.set(key, value, ttl=self.promoted_ttl)
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self.memory.set(key, value, ttl=ttl)
+        self.persistent.set(key, value, ttl=ttl)
+
+    def delete(self, key: str) -> None:
+        self.memory.delete(key)
+        self.persistent.delete(key)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        self.persistent.clear()
@@ -0,0 +1,96 @@
+"""
+Tolerant extraction of JSON from LLM text output.
+
+Models often wrap JSON in Markdown code fences, surround it with prose, or emit
+near-JSON (trailing commas, `//` comments, typographic quotes). `extract_json` finds the
+first JSON object or array in the text and parses it, applying a small repair step when
+the strict parse fails; `iter_json_values` yields every such value in order.
+"""
+
+import json
+import re
+from typing import Any, Iterator, Optional
+
+_OPENING_RE = re.compile(r"[\[{]")
+_FENCE_RE = re.compile(r"```(?:json|JSON)?\s*(.*?)```", re.DOTALL)
+_TRAILING_COMMA_RE = re.compile(r",\s*([\]}])")
+_LINE_COMMENT_RE = re.compile(r'^(\s*(?:[^"\n]*"(?:[^"\\\n]|\\.)*")*[^"\n]*?)\s*//[^\n]*$', re.MULTILINE)
+_SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+
+
+def _balanced_span(text: str, start: int) -> Optional[str]:
+    """Return the bracket-balanced substring starting at `text[start]`, ignoring brackets inside strings."""
+    closing = {"{": "}", "[": "]"}
+    stack = []
+    in_string = False
+    escaped = False
+    for index in range(start, len(text)):
+        char = text[index]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in closing:
+            stack.append(closing[char])
+        elif char in "]}":
+            if not stack or stack.pop() != char:
+                return None
+            if not stack:
+                return text[start:index + 1]
+    return None
+
+
+def repair_json(candidate: str) -> str:
+    """Fix common near-JSON mistakes: typographic quotes, `//` comments and trailing commas."""
+    candidate = candidate.translate(_SMART_QUOTES)
+    candidate = _LINE_COMMENT_RE.sub(r"\1", candidate)
+    return _TRAILING_COMMA_RE.sub(r"\1", candidate)
+
+
+def _loads(candidate: str) -> Optional[Any]:
+    for text in (candidate, repair_json(candidate)):
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            continue
+    return None
+
+
+def iter_json_values(text: str) -> Iterator[Any]:
+    """
+    Yield every parsable top-level JSON object or array found in `text`, in order.
+
+    Fenced code blocks are searched before the rest of the text.
+    """
+    if not text:
+        return
+
+    sources = [match.group(1) for match in _FENCE_RE.finditer(text)] + [text]
+    for source in sources:
+        index = 0
+        while (match := _OPENING_RE.search(source, index)) is not None:
+            span = _balanced_span(source, match.start())
+            value = _loads(span) if span is not None else None
+            if value is None:
+                index = match.start() + 1
+                continue
+            yield value
+            index = match.start() + len(span)
+
+
+def extract_json(text: str) -> Optional[Any]:
+    """
+    Parse the first JSON object or array found in `text`.
+
+    Args:
+        text: Raw model output, possibly with code fences or surrounding prose.
+
+    Returns:
+        The parsed value, or None if no parsable JSON object or array was found.
+    """
+    return next(iter_json_values(text), None)
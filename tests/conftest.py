@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The application modules are imported as top-level packages from src/ (see evaluation/)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../src"))
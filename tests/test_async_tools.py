@@ -0,0 +1,111 @@
+"""
+The analyst team's tools run in worker threads, so the three analysts' tool calls overlap.
+"""
+
+import asyncio
+import inspect
+import json
+import time
+from typing import AsyncGenerator
+
+import pytest
+from google.adk.agents import LlmAgent
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from agents.agent import parallel_analyst_agent_team
+from agents.analysts_team.deterministic_analyst import DeterministicAnalystAgent
+from function_tools import async_tools
+from function_tools.async_tools import run_in_thread
+from orchestration.batch_runner import with_tools
+
+DELAYS = {
+    "fetch_price_and_technical_analysis": 0.3,
+    "run_analysis_for_multiple_tickers": 0.4,
+    "get_social_sentiment_summary": 0.5,
+}
+SCANNED = {"scanned_tickers": [{"symbol": "AAA", "company_name": "Alpha Inc.", "justification": "r"}]}
+
+
+def _sleeping_stub(name: str, delay: float):
+    def stub(symbols: list) -> list:
+        time.sleep(delay)  # Blocking, like the network calls of the real tools
+        return [{"symbol": symbol, "aggregated_sentiment": "neutral", "justification": name} for symbol in symbols]
+
+    stub.__name__ = name
+    return stub
+
+
+class ToolCallingModel(BaseLlm):
+    """Calls the agent's tool once with the scanned symbols, then answers with an empty list."""
+
+    model: str = "tool-calling-stub"
+
+    async def generate_content_async(
+            self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        if any(part.function_response for part in llm_request.contents[-1].parts or []):
+            part = types.Part(text="[]")
+        else:
+            part = types.Part(function_call=types.FunctionCall(
+                name=next(iter(llm_request.tools_dict)), args={"symbols": ["AAA"]}
+            ))
+        yield LlmResponse(content=types.Content(role="model", parts=[part]))
+
+
+def _registered_tools(agent) -> list:
+    if isinstance(agent, DeterministicAnalystAgent):
+        return [agent.tool]
+    if isinstance(agent, LlmAgent):
+        return list(agent.tools)
+    return [tool for sub_agent in agent.sub_agents for tool in _registered_tools(sub_agent)]
+
+
+@pytest.mark.parametrize("name", DELAYS)
+def test_wrappers_keep_the_tool_declaration(name):
+    wrapper = getattr(async_tools, f"{name}_async")
+    assert inspect.iscoroutinefunction(wrapper)
+    assert wrapper.__name__ == name
+    assert inspect.signature(wrapper) == inspect.signature(wrapper.__wrapped__)
+
+
+def test_analyst_team_registers_the_threaded_tools():
+    registered = {tool.__name__: tool for tool in _registered_tools(parallel_analyst_agent_team)}
+    assert set(DELAYS) <= set(registered)
+    for name in DELAYS:
+        assert registered[name] is getattr(async_tools, f"{name}_async")
+
+
+def test_analyst_team_tool_calls_overlap():
+    # The same team, with each registered tool swapped for a threaded stub that sleeps
+    team = with_tools(parallel_analyst_agent_team, {
+        getattr(async_tools, f"{name}_async"): run_in_thread(_sleeping_stub(name, delay))
+        for name, delay in DELAYS.items()
+    })
+    for sub_agent in team.sub_agents:
+        if isinstance(sub_agent, LlmAgent):
+            sub_agent.model = ToolCallingModel()
+
+    async def run():
+        runner = InMemoryRunner(agent=team, app_name="test")
+        session = await runner.session_service.create_session(
+            app_name="test", user_id="u", state={"structured_ticker_scanner_findings": json.dumps(SCANNED)}
+        )
+        message = types.Content(role="user", parts=[types.Part(text="go")])
+        started = time.perf_counter()
+        async for _ in runner.run_async(user_id="u", session_id=session.id, new_message=message):
+            pass
+        elapsed = time.perf_counter() - started
+        session = await runner.session_service.get_session(app_name="test", user_id="u", session_id=session.id)
+        return elapsed, session.state
+
+    elapsed, state = asyncio.run(run())
+
+    assert json.loads(state["structured_technical_analyst_findings"])[0]["symbol"] == "AAA"
+    assert json.loads(state["structured_institution_rating_findings"])[0]["symbol"] == "AAA"
+    assert state["structured_social_media_sentiment_findings"] == "[]"
+    # About the slowest analyst, well short of the sequential sum (1.2s)
+    assert max(DELAYS.values()) <= elapsed < max(DELAYS.values()) + 0.35
@@ -0,0 +1,81 @@
+"""
+`DeterministicAnalystAgent`: tool results are validated per ticker and failures stay per ticker.
+"""
+
+import asyncio
+import json
+
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from agents.analysts_team.deterministic_analyst import DeterministicAnalystAgent
+from agents.data_models.institution_rating_agent_data_model import InstitutionRating
+from agents.data_models.technical_agent_data_model import TechnicalSentiment
+
+SCANNED = {"scanned_tickers": [
+    {"symbol": "AAA", "company_name": "Alpha Inc.", "justification": "r"},
+    {"symbol": "BAD", "company_name": "Broken Corp.", "justification": "r"},
+    {"symbol": "CCC", "company_name": "Gamma Ltd.", "justification": "r"},
+]}
+
+
+def _run(agent: DeterministicAnalystAgent) -> list:
+    async def run():
+        runner = InMemoryRunner(agent=agent, app_name="test")
+        session = await runner.session_service.create_session(
+            app_name="test", user_id="u", state={"structured_ticker_scanner_findings": SCANNED}
+        )
+        message = types.Content(role="user", parts=[types.Part(text="go")])
+        async for _ in runner.run_async(user_id="u", session_id=session.id, new_message=message):
+            pass
+        session = await runner.session_service.get_session(app_name="test", user_id="u", session_id=session.id)
+        return json.loads(session.state[agent.output_key])
+
+    return asyncio.run(run())
+
+
+def _rating(symbol: str) -> dict:
+    return {"symbol": symbol, "aggregated_sentiment": "bullish", "justification": "Buy > Sell.",
+            "period": "2025-06-01", "cache_hit": True}
+
+
+def test_institution_rating_keeps_period_and_cache_hit():
+    agent = DeterministicAnalystAgent(
+        name="institution", tool=lambda symbols: [_rating(symbol) for symbol in symbols],
+        item_model=InstitutionRating, output_key="out",
+    )
+    findings = _run(agent)
+    assert [finding["symbol"] for finding in findings] == ["AAA", "BAD", "CCC"]
+    assert findings[0] == {
+        "symbol": "AAA", "company_name": "Alpha Inc.", "aggregated_sentiment": "bullish",
+        "justification": "Buy > Sell.", "period": "2025-06-01", "cache_hit": True,
+    }
+
+
+def test_a_failing_ticker_does_not_fail_the_others():
+    def tool(symbols):
+        if "BAD" in symbols:
+            raise RuntimeError("upstream error")
+        return [_rating(symbol) for symbol in symbols]
+
+    agent = DeterministicAnalystAgent(name="institution", tool=tool, item_model=InstitutionRating, output_key="out")
+    findings = {finding["symbol"]: finding for finding in _run(agent)}
+    assert findings["AAA"]["aggregated_sentiment"] == "bullish"
+    assert findings["CCC"]["aggregated_sentiment"] == "bullish"
+    assert findings["BAD"]["aggregated_sentiment"] is None
+    assert "RuntimeError: upstream error" in findings["BAD"]["justification"]
+    assert findings["BAD"]["company_name"] == "Broken Corp."
+
+
+def test_an_invalid_result_is_reported_without_a_sentiment():
+    async def tool(symbols):
+        return [
+            {"symbol": symbol, "aggregated_sentiment": "sideways" if symbol == "BAD" else "BEARISH", "justification": "x"}
+            for symbol in symbols
+        ]
+
+    agent = DeterministicAnalystAgent(name="technical", tool=tool, item_model=TechnicalSentiment, output_key="out")
+    findings = {finding["symbol"]: finding for finding in _run(agent)}
+    assert findings["AAA"]["aggregated_sentiment"] == "bearish"
+    assert findings["BAD"]["aggregated_sentiment"] is None
+    assert findings["BAD"]["justification"].startswith("Analysis failed")
@@ -0,0 +1,111 @@
+"""
+The email MCP server's tools against a local SMTP stand-in (aiosmtpd, no TLS).
+"""
+
+import asyncio
+import socket
+
+import pytest
+from aiosmtpd.controller import Controller
+
+from agents.email_dispatch import FAILED, EmailDispatchAgent
+from mcp_server import email_server
+from mcp_server.smtp_pool import SMTPConnectionPool
+
+SENDER = "me@example.com"
+
+
+class RecordingHandler:
+    """Accepts every message; refuses recipients whose address starts with `bad`."""
+
+    def __init__(self) -> None:
+        self.envelopes = []
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith("bad"):
+            return "550 5.1.1 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.envelopes.append(envelope)
+        return "250 OK"
+
+
+class SMTPServer:
+    def __init__(self) -> None:
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            self.port = probe.getsockname()[1]
+        self.handler = RecordingHandler()
+        self.controller = None
+
+    def start(self) -> None:
+        self.controller = Controller(self.handler, hostname="127.0.0.1", port=self.port)
+        self.controller.start()
+
+    def stop(self) -> None:
+        self.controller.stop()
+
+
+@pytest.fixture
+def server(monkeypatch):
+    smtp_server = SMTPServer()
+    smtp_server.start()
+    pool = SMTPConnectionPool(host="127.0.0.1", port=smtp_server.port, starttls=False, size=1)
+    monkeypatch.setattr(email_server, "smtp_pool", pool)
+    monkeypatch.setattr(email_server, "email_recipient", SENDER)
+    monkeypatch.setenv("EMAIL_USER", SENDER)
+    yield smtp_server
+    pool.close()
+    smtp_server.stop()
+
+
+def test_tools_share_one_connection(server):
+    assert email_server.send_email("One", "<p>1</p>", SENDER) == f"{email_server.SENT_PREFIX} {SENDER}"
+    assert email_server.send_emails([
+        email_server.OutgoingEmail(subject="Two", html_body="<p>2</p>"),
+        email_server.OutgoingEmail(subject="Three", html_body="<p>3</p>", recipient="you@example.com"),
+    ]) == [f"{email_server.SENT_PREFIX} {SENDER}", f"{email_server.SENT_PREFIX} you@example.com"]
+    assert email_server.send_digest([
+        email_server.ThemeReport(theme="AI <chips>", html_body="<p>a</p>"),
+        email_server.ThemeReport(theme="Robotics", html_body="<p>b</p>"),
+    ]) == f"{email_server.SENT_PREFIX} {SENDER}"
+
+    assert email_server.smtp_pool.connections_opened == 1
+    assert [envelope.rcpt_tos for envelope in server.handler.envelopes] == [
+        [SENDER], [SENDER], ["you@example.com"], [SENDER],
+    ]
+    assert "Subject: Daily Trading Idea Digest" in server.handler.envelopes[-1].content.decode()
+
+
+def test_reconnects_after_a_server_restart(server):
+    email_server.send_email("Before", "<p>1</p>", SENDER)
+    server.stop()
+    server.start()
+
+    assert email_server.send_email("After", "<p>2</p>", SENDER).startswith(email_server.SENT_PREFIX)
+    assert email_server.smtp_pool.connections_opened == 2
+    assert len(server.handler.envelopes) == 2
+
+
+def test_partially_refused_recipients_are_reported(server):
+    reply = email_server.send_email("Partial", "<p>1</p>", f"{SENDER}, bad@example.com")
+    assert reply == f"{email_server.SENT_PREFIX} {SENDER} (refused: bad@example.com: 550 5.1.1 No such user)"
+    assert server.handler.envelopes[-1].rcpt_tos == [SENDER]
+
+
+def test_all_recipients_refused_is_an_error(server):
+    assert email_server.send_email("None", "<p>1</p>", "bad@example.com").startswith("Error: All recipients were refused")
+    assert server.handler.envelopes == []
+
+
+def test_dispatch_does_not_retry_refused_recipients(server, monkeypatch):
+    monkeypatch.setattr(email_server, "email_recipient", "bad@example.com")
+    agent = EmailDispatchAgent(name="EmailDispatchAgent", transport="smtp", max_attempts=3, retry_seconds=0)
+
+    receipt = asyncio.run(agent._dispatch(None, "<p>report</p>"))
+
+    assert receipt["status"] == FAILED
+    assert receipt["attempts"] == 1
+    assert "All recipients were refused" in receipt["error"]
@@ -0,0 +1,75 @@
+"""
+Parity of `IncrementalIndicatorState`, fed bar by bar, with the `ta`-based
+`calculate_technical_indicators`.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from function_tools.calculate_technical_indicators import (
+    calculate_technical_indicators,
+    generate_aggregated_signal,
+)
+from function_tools.incremental_technical_indicators import IncrementalIndicatorState
+
+COLUMNS = ["SMA_20", "RSI_14", "MACDh_12_26_9"]
+TOLERANCE = 1e-9
+
+
+def _random_walk(seed: int, length: int = 150) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return 100.0 * np.exp(np.cumsum(rng.normal(0, 0.02, length)))
+
+
+def _assert_matches(values: dict, expected: pd.Series) -> None:
+    for column in COLUMNS:
+        if math.isnan(expected[column]):
+            assert values[column] is None, column
+        else:
+            assert values[column] == pytest.approx(expected[column], rel=TOLERANCE, abs=TOLERANCE), column
+
+
+@pytest.mark.parametrize("closes", [
+    _random_walk(1),
+    _random_walk(2),
+    np.r_[np.full(40, 20.0), np.linspace(20, 30, 60)],  # Flat start: no losses for a while
+    np.linspace(50, 10, 80),  # Only losses
+], ids=["walk-1", "walk-2", "flat-then-up", "falling"])
+def test_bar_by_bar_parity_with_ta(closes):
+    expected = calculate_technical_indicators(pd.DataFrame({"Close": closes}))
+
+    state = IncrementalIndicatorState()
+    for index, close in enumerate(closes):
+        if index == len(closes) // 2:
+            # Persist and restore partway through, as between two runs
+            state = IncrementalIndicatorState.from_json(state.to_json())
+        values = state.update(close)
+        assert values["Close"] == close
+        _assert_matches(values, expected.iloc[index])
+
+
+def test_round_trip_keeps_the_state():
+    state = IncrementalIndicatorState.from_closes(_random_walk(3, 45))
+    restored = IncrementalIndicatorState.from_json(state.to_json())
+    assert restored.to_dict() == state.to_dict()
+
+    for close in _random_walk(4, 10):
+        assert restored.update(close) == state.update(close)
+
+
+def test_signal_matches_the_batch_signal():
+    closes = _random_walk(5)
+    state = IncrementalIndicatorState.from_closes(closes[:100])
+    state = IncrementalIndicatorState.from_json(state.to_json())
+    state.update_many(closes[100:])
+
+    assert state.signal("AAA") == generate_aggregated_signal("AAA", pd.DataFrame({"Close": closes}))
+
+
+def test_short_history_is_neutral():
+    state = IncrementalIndicatorState.from_closes(_random_walk(6, 20))
+    assert state.signal("AAA")["aggregated_sentiment"] == "NEUTRAL"
+    assert state.signal("AAA")["justification"].startswith("Insufficient historical data")
@@ -0,0 +1,107 @@
+"""
+`PriceStore` coverage, merging and LRU eviction, and how the Yahoo Finance loader records coverage.
+"""
+
+import datetime
+import itertools
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from function_tools import fetch_yahoo_finance_stock_price as loader
+from function_tools import price_store
+from function_tools.price_store import PriceStore
+
+JAN_1, JAN_10, JAN_20 = (datetime.date(2025, 1, day) for day in (1, 10, 20))
+FEB_1 = datetime.date(2025, 2, 1)
+
+
+def _bars(start: str, closes: list) -> pd.DataFrame:
+    index = pd.bdate_range(start, periods=len(closes))
+    return pd.DataFrame(
+        {"Open": closes, "High": closes, "Low": closes, "Close": closes, "Volume": [1000.0] * len(closes)},
+        index=index,
+    )
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    # A clock that advances on every read, so LRU order does not depend on timer resolution
+    clock = itertools.count(1_000_000)
+    monkeypatch.setattr(price_store, "time", SimpleNamespace(time=lambda: float(next(clock))))
+    return PriceStore(str(tmp_path / "prices.sqlite3"), max_symbols=2)
+
+
+def test_coverage_only_lists_downloaded_symbols(store):
+    assert store.coverage(["AAA"]) == {}
+    store.upsert("AAA", _bars("2025-01-02", [1.0, 2.0]), fetched_from=JAN_1, fetched_through=JAN_10)
+    assert store.coverage(["AAA", "BBB"]) == {"AAA": (JAN_1, JAN_10)}
+
+
+def test_upsert_merges_bars_and_widens_coverage(store):
+    store.upsert("AAA", _bars("2025-01-02", [1.0, 2.0, 3.0]), fetched_from=JAN_10, fetched_through=JAN_20)
+    # An overlapping later download replaces the shared bar and extends the window
+    store.upsert("AAA", _bars("2025-01-06", [30.0, 4.0]), fetched_from=JAN_1, fetched_through=FEB_1)
+
+    closes = store.load_close_matrix(["AAA"], JAN_1)["AAA"]
+    assert list(closes) == [1.0, 2.0, 30.0, 4.0]
+    assert store.coverage(["AAA"]) == {"AAA": (JAN_1, FEB_1)}
+
+
+def test_empty_window_still_counts_as_covered(store):
+    store.upsert("AAA", _bars("2025-01-02", [1.0]), fetched_from=JAN_1, fetched_through=JAN_10)
+    store.upsert("AAA", pd.DataFrame(), fetched_from=JAN_10, fetched_through=JAN_20)
+    assert store.coverage(["AAA"]) == {"AAA": (JAN_1, JAN_20)}
+    assert list(store.load_close_matrix(["AAA"], JAN_1)["AAA"]) == [1.0]
+
+
+def test_rows_without_close_are_ignored(store):
+    bars = _bars("2025-01-02", [1.0, 2.0, 3.0])
+    bars.iloc[1, bars.columns.get_loc("Close")] = np.nan
+    store.upsert("AAA", bars, fetched_from=JAN_1, fetched_through=JAN_10)
+    assert list(store.load_close_matrix(["AAA"], JAN_1)["AAA"]) == [1.0, 3.0]
+
+
+def test_least_recently_used_symbol_is_evicted(store):
+    store.upsert("AAA", _bars("2025-01-02", [1.0]), fetched_from=JAN_1, fetched_through=JAN_10)
+    store.upsert("BBB", _bars("2025-01-02", [2.0]), fetched_from=JAN_1, fetched_through=JAN_10)
+    store.load_close_matrix(["AAA"], JAN_1)  # AAA is now more recently used than BBB
+    store.upsert("CCC", _bars("2025-01-02", [3.0]), fetched_from=JAN_1, fetched_through=JAN_10)
+
+    assert set(store.coverage(["AAA", "BBB", "CCC"])) == {"AAA", "CCC"}
+    assert list(store.load_close_matrix(["AAA", "BBB", "CCC"], JAN_1).columns) == ["AAA", "CCC"]
+
+
+def _download_result(bars_by_symbol: dict) -> pd.DataFrame:
+    """A multi-ticker `yf.download` result: (price, ticker) MultiIndex columns."""
+    if not bars_by_symbol:
+        return pd.DataFrame()
+    return pd.concat(bars_by_symbol, axis=1).swaplevel(axis=1).sort_index(axis=1)
+
+
+def test_loader_records_coverage_per_download_outcome(store, monkeypatch):
+    store.max_symbols = 10
+    store.upsert("OLD", _bars("2024-12-02", [1.0]), fetched_from=datetime.date(2024, 12, 1), fetched_through=JAN_10)
+    downloads = {
+        # Tail window of the stored symbol: a weekend, nothing to download
+        JAN_10: pd.DataFrame(),
+        # Full window of the new symbols: NEW has bars, NAN is all-NaN and GONE is missing
+        datetime.date(2024, 12, 1): _download_result({
+            "NEW": _bars("2024-12-02", [5.0, 6.0]),
+            "NAN": _bars("2024-12-02", [np.nan, np.nan]),
+        }),
+    }
+    monkeypatch.setattr(loader, "_download", lambda symbols, start, end: downloads[start])
+
+    loader._load_close_prices_with_store(store, ["OLD", "NEW", "NAN", "GONE"], datetime.date(2024, 12, 1), JAN_20)
+
+    coverage = store.coverage(["OLD", "NEW", "NAN", "GONE"])
+    assert coverage == {"OLD": (datetime.date(2024, 12, 1), JAN_20), "NEW": (datetime.date(2024, 12, 1), JAN_20)}
+
+
+def test_loader_records_nothing_when_the_download_fails(store, monkeypatch):
+    monkeypatch.setattr(loader, "_download", lambda symbols, start, end: None)
+    loader._load_close_prices_with_store(store, ["AAA"], JAN_1, JAN_20)
+    assert store.coverage(["AAA"]) == {}
@@ -0,0 +1,37 @@
+"""
+`TokenBucket` refill and resizing, and splitting a `RateLimiter` between worker processes.
+"""
+
+import time
+
+import pytest
+
+from function_tools.rate_limiter import RateLimiter, TokenBucket
+
+
+def test_bucket_refills_continuously():
+    bucket = TokenBucket(capacity=2, period=1.0)
+    now = time.monotonic()
+    bucket.consume()
+    bucket.consume()
+    assert bucket.wait_time(now) == pytest.approx(0.5, abs=1e-3)
+    assert bucket.wait_time(now + 0.5) == 0.0
+
+
+def test_resize_drops_tokens_above_the_new_capacity():
+    bucket = TokenBucket(capacity=10, period=1.0)
+    bucket.resize(3)
+    now = time.monotonic()
+    for _ in range(3):
+        assert bucket.wait_time(now) == 0.0
+        bucket.consume()
+    assert bucket.wait_time(now) == pytest.approx(1 / 3, abs=1e-3)
+
+    with pytest.raises(ValueError):
+        bucket.resize(0)
+
+
+def test_share_splits_every_bucket():
+    limiter = RateLimiter([TokenBucket(capacity=30, period=1.0), TokenBucket(capacity=3, period=60.0)])
+    limiter.share(4)
+    assert [bucket.capacity for bucket in limiter.buckets] == [7, 1]  # At least one call per period
@@ -0,0 +1,114 @@
+"""
+Local parsing of the raw scanner output (`extract_json`, `parse_scanner_output`) and when
+`LocalParseScannerAgent` falls back to the LLM enforcement pass.
+"""
+
+import asyncio
+from typing import AsyncGenerator
+
+import pytest
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from agents.ticker_scanner_agent import LocalParseScannerAgent, parse_scanner_output
+from utils.json_utils import extract_json, iter_json_values
+
+TICKERS = '[{"symbol": "nvda", "company_name": "NVIDIA", "justification": "GPUs."}, ' \
+          '{"symbol": "AVGO", "company_name": "Broadcom", "justification": "Networking."}]'
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"a": 1}', {"a": 1}),
+    ('Here you go:\n```json\n[1, 2]\n```\nThanks!', [1, 2]),
+    ('The answer is {"a": [1, 2]} as requested.', {"a": [1, 2]}),
+    ('{"a": "brackets ] and } in a string"}', {"a": "brackets ] and } in a string"}),
+    ('{“a”: [1, 2,], // a comment\n "b": 2,}', {"a": [1, 2], "b": 2}),
+    ("No JSON here.", None),
+    ('{"a": [1, 2}', None),
+    ("", None),
+])
+def test_extract_json(text, expected):
+    assert extract_json(text) == expected
+
+
+def test_fenced_values_come_first():
+    text = 'Draft: {"draft": true}\n```json\n{"final": true}\n```'
+    assert next(iter_json_values(text)) == {"final": True}
+    assert extract_json(text) == {"final": True}
+
+
+@pytest.mark.parametrize("text", [
+    f"```json\n{TICKERS}\n```",
+    f"Based on my search, these are the most relevant stocks:\n{TICKERS}\nLet me know if you need more.",
+    TICKERS,
+    f'{{"scanned_tickers": {TICKERS}}}',
+    f'Sure! {{"scanned_stocks": {TICKERS}}}',
+    f'Sources: [1], [2]. Result: {TICKERS}',  # Citation brackets before the list are skipped
+], ids=["fenced", "prose", "bare-list", "wrapped", "legacy-key", "citations"])
+def test_parse_scanner_output(text):
+    output = parse_scanner_output(text)
+    assert output is not None
+    assert [ticker.symbol for ticker in output.scanned_tickers] == ["NVDA", "AVGO"]
+    assert output.scanned_tickers[1].company_name == "Broadcom"
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "I could not find any relevant stocks.",
+    '[{"symbol": "NVDA", "company_name": "NVIDIA"',  # Truncated
+    '[{"symbol": "NVDA"}]',  # Missing required fields
+    '{"scanned_tickers": []}',
+    '{"tickers": "NVDA, AVGO"}',
+])
+def test_unparsable_output_returns_none(text):
+    assert parse_scanner_output(text) is None
+
+
+class TextAgent(BaseAgent):
+    """Writes fixed text to a state key, standing in for the LLM agents."""
+
+    output_key: str
+    text: str
+    runs: int = 0
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        self.runs += 1
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            actions=EventActions(state_delta={self.output_key: self.text}),
+        )
+
+
+def _scan(raw_text: str):
+    raw = TextAgent(name="raw", output_key="raw_ticker_scanner_findings", text=raw_text)
+    fallback = TextAgent(name="fallback", output_key="structured_ticker_scanner_findings", text="from-fallback")
+    scanner = LocalParseScannerAgent(name="scanner", raw_agent=raw, fallback_agent=fallback)
+
+    async def run():
+        runner = InMemoryRunner(agent=scanner, app_name="test")
+        session = await runner.session_service.create_session(app_name="test", user_id="u")
+        message = types.Content(role="user", parts=[types.Part(text="AI chips")])
+        async for _ in runner.run_async(user_id="u", session_id=session.id, new_message=message):
+            pass
+        session = await runner.session_service.get_session(app_name="test", user_id="u", session_id=session.id)
+        return session.state["structured_ticker_scanner_findings"]
+
+    return asyncio.run(run()), fallback.runs, scanner.fallback_rate
+
+
+def test_parsed_output_skips_the_enforcement_pass():
+    structured, fallback_runs, fallback_rate = _scan(f"Here are the stocks:\n```json\n{TICKERS}\n```")
+    assert fallback_runs == 0
+    assert fallback_rate == 0.0
+    assert [ticker["symbol"] for ticker in structured["scanned_tickers"]] == ["NVDA", "AVGO"]
+
+
+def test_malformed_output_falls_back_to_the_enforcement_pass():
+    structured, fallback_runs, fallback_rate = _scan("NVDA and AVGO look relevant (see sources).")
+    assert fallback_runs == 1
+    assert fallback_rate == 1.0
+    assert structured == "from-fallback"
@@ -0,0 +1,87 @@
+"""
+Local scoring of Bluesky posts (`score_post`) and the per-ticker aggregates built from it.
+"""
+
+import pytest
+
+from function_tools import score_social_sentiment
+from function_tools.score_social_sentiment import (
+    aggregate_sentiment,
+    get_social_sentiment_summary,
+    score_post,
+    summarize_posts,
+)
+
+
+@pytest.mark.parametrize("symbol, text, expected", [
+    # Relevance
+    ("ON", "Great weather today", None),
+    ("AAPL", "Loving my new phone from $AAPL", None),
+    ("AAPL", "AAPL earnings call tonight", "neutral"),
+    ("ON", "$ON looks bullish", "bullish"),
+    ("ON", "Turned ON the lights, bullish on coffee", None),  # Short bare tickers need the cashtag
+    # Lexicon
+    ("NVDA", "$NVDA breakout, buying more", "bullish"),
+    ("NVDA", "$NVDA downgrade after the earnings miss", "bearish"),
+    ("NVDA", "$NVDA chart 🚀🚀", "bullish"),
+    ("NVDA", "$NVDA chart 📉 rough day", "bearish"),
+    # Everyday words only count in a market context
+    ("NVDA", "$NVDA shares up 5% today", "bullish"),
+    ("NVDA", "NVDA down 3% premarket", "bearish"),
+    ("NVDA", "Record revenue for $NVDA this quarter", "bullish"),
+    ("NVDA", "Going long $NVDA here", "bullish"),
+    ("NVDA", "$NVDA has a long way to go, record heat outside, red carpet tonight, stock chart later", "neutral"),
+    ("NVDA", "Ran into the NVDA team on the red carpet, what a long day", None),
+    # Negation within a few words, including typographic apostrophes
+    ("NVDA", "$NVDA is not bullish", "bearish"),
+    ("NVDA", "$NVDA is not really bullish", "bearish"),
+    ("NVDA", "$NVDA: don’t buy here", "bearish"),
+    ("NVDA", "$NVDA isn't weak at all", "bullish"),
+])
+def test_score_post(symbol, text, expected):
+    assert score_post(text, symbol) == expected
+
+
+def test_aggregate_sentiment():
+    assert aggregate_sentiment(3, 1, 2) == "bullish"
+    assert aggregate_sentiment(1, 3, 3) == "bearish"
+    assert aggregate_sentiment(2, 1, 5) == "neutral"  # Mostly neutral chatter
+    assert aggregate_sentiment(2, 2, 0) == "neutral"
+    assert aggregate_sentiment(0, 0, 0) == "neutral"
+
+
+def _post(content: str, likes: int = 0) -> dict:
+    return {"content": content, "like_count": likes, "repost_count": 0}
+
+
+def test_summarize_posts_counts_and_picks_engaged_snippets():
+    posts = [
+        _post("$NVDA breakout, buying more", likes=5),
+        _post("$NVDA shares up 4% after earnings", likes=50),
+        _post("$NVDA downgrade, selling", likes=1),
+        _post("Nice day at the beach"),
+    ]
+    summary = summarize_posts("NVDA", posts, max_snippets=2)
+
+    assert {key: summary[key] for key in ("posts_fetched", "relevant_posts", "bullish", "bearish", "neutral")} == {
+        "posts_fetched": 4, "relevant_posts": 3, "bullish": 2, "bearish": 1, "neutral": 0,
+    }
+    assert summary["suggested_sentiment"] == "bullish"
+    assert [snippet["likes"] for snippet in summary["snippets"]] == [50, 5]
+
+
+def test_get_social_sentiment_summary(monkeypatch):
+    fetched = {
+        "NVDA": [_post("$NVDA plunge after the miss"), _post("$NVDA selling into strength, bearish")],
+        "AAPL": [],
+    }
+    monkeypatch.setattr(score_social_sentiment, "get_bluesky_posts_batch", lambda symbols, limit: fetched)
+
+    summaries = {summary["symbol"]: summary for summary in get_social_sentiment_summary(["NVDA", "AAPL"])}
+
+    assert summaries["NVDA"]["suggested_sentiment"] == "bearish"
+    assert summaries["NVDA"]["bearish"] == 2
+    assert summaries["AAPL"] == {
+        "symbol": "AAPL", "posts_fetched": 0, "relevant_posts": 0, "bullish": 0, "bearish": 0, "neutral": 0,
+        "suggested_sentiment": "neutral", "snippets": [],
+    }
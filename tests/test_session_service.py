@@ -0,0 +1,112 @@
+"""
+`BoundedSqliteSessionService`: event cap, in-memory LRU eviction and persistence across restarts.
+"""
+
+import asyncio
+
+from google.adk.events import Event, EventActions
+from google.genai import types
+
+from orchestration.session_service import BoundedSqliteSessionService
+
+APP, USER = "app", "user"
+
+
+def _event(index: int, **state_delta) -> Event:
+    return Event(
+        invocation_id=f"inv{index}",
+        author="agent",
+        content=types.Content(role="model", parts=[types.Part(text=f"event {index}")]),
+        actions=EventActions(state_delta=state_delta),
+    )
+
+
+def _texts(session) -> list:
+    return [event.content.parts[0].text for event in session.events]
+
+
+def test_events_are_capped_in_memory_and_on_disk(tmp_path):
+    async def run():
+        path = str(tmp_path / "sessions.sqlite3")
+        service = BoundedSqliteSessionService(path=path, max_events=3, ttl_seconds=None)
+        session = await service.create_session(app_name=APP, user_id=USER)
+        for index in range(5):
+            await service.append_event(session, _event(index))
+
+        cached = await service.get_session(app_name=APP, user_id=USER, session_id=session.id)
+        reloaded = await BoundedSqliteSessionService(path=path, max_events=3, ttl_seconds=None).get_session(
+            app_name=APP, user_id=USER, session_id=session.id
+        )
+        return cached, reloaded
+
+    cached, reloaded = asyncio.run(run())
+    assert _texts(cached) == ["event 2", "event 3", "event 4"]
+    assert _texts(reloaded) == ["event 2", "event 3", "event 4"]
+
+
+def test_append_to_a_session_evicted_from_memory(tmp_path):
+    async def run():
+        service = BoundedSqliteSessionService(
+            path=str(tmp_path / "sessions.sqlite3"), max_cached_sessions=1, ttl_seconds=None
+        )
+        first = await service.create_session(app_name=APP, user_id=USER)
+        await service.append_event(first, _event(0, theme="robotics"))
+        # Creating a second session evicts the first from memory; the runner still holds `first`
+        second = await service.create_session(app_name=APP, user_id=USER)
+        evicted = first.id not in service.sessions[APP][USER]
+        await service.append_event(first, _event(1, step="done"))
+        await service.append_event(second, _event(2))
+        return evicted, await service.get_session(app_name=APP, user_id=USER, session_id=first.id)
+
+    evicted, first = asyncio.run(run())
+    assert evicted
+    assert _texts(first) == ["event 0", "event 1"]
+    assert first.state == {"theme": "robotics", "step": "done"}
+
+
+def test_sessions_and_scoped_state_survive_a_restart(tmp_path):
+    path = str(tmp_path / "sessions.sqlite3")
+
+    async def write():
+        service = BoundedSqliteSessionService(path=path, ttl_seconds=None)
+        session = await service.create_session(app_name=APP, user_id=USER, state={"theme": "uranium"})
+        await service.append_event(session, _event(0, **{"user:language": "en", "app:version": 2, "summary": "ok"}))
+        return session.id
+
+    async def read(session_id):
+        service = BoundedSqliteSessionService(path=path, ttl_seconds=None)
+        session = await service.get_session(app_name=APP, user_id=USER, session_id=session_id)
+        listed = await service.list_sessions(app_name=APP, user_id=USER)
+        return session, [listed_session.id for listed_session in listed.sessions]
+
+    session_id = asyncio.run(write())
+    session, listed_ids = asyncio.run(read(session_id))
+    assert _texts(session) == ["event 0"]
+    assert session.state["theme"] == "uranium"
+    assert session.state["summary"] == "ok"
+    assert session.state["user:language"] == "en"
+    assert session.state["app:version"] == 2
+    assert listed_ids == [session_id]
+
+
+def test_deleted_and_expired_sessions_are_gone_after_a_restart(tmp_path):
+    path = str(tmp_path / "sessions.sqlite3")
+
+    async def run():
+        service = BoundedSqliteSessionService(path=path, ttl_seconds=None)
+        deleted = await service.create_session(app_name=APP, user_id=USER)
+        kept = await service.create_session(app_name=APP, user_id=USER)
+        await service.delete_session(app_name=APP, user_id=USER, session_id=deleted.id)
+
+        restarted = BoundedSqliteSessionService(path=path, ttl_seconds=None)
+        ids = [session.id for session in (await restarted.list_sessions(app_name=APP, user_id=USER)).sessions]
+        # A TTL of zero expires every session on start
+        BoundedSqliteSessionService(path=path, ttl_seconds=0)
+        expired = await BoundedSqliteSessionService(path=path, ttl_seconds=None).get_session(
+            app_name=APP, user_id=USER, session_id=kept.id
+        )
+        return kept.id, ids, expired
+
+    kept_id, ids, expired = asyncio.run(run())
+    assert ids == [kept_id]
+    assert expired is None
@@ -0,0 +1,78 @@
+"""
+Parity of the batched indicator path (`generate_aggregated_signals`) with the `ta`-based
+per-symbol path (`generate_aggregated_signal`).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from function_tools.calculate_technical_indicators import (
+    generate_aggregated_signal,
+    generate_aggregated_signals,
+)
+
+DATES = pd.bdate_range("2025-01-01", periods=120)
+
+
+def _random_walk(seed: int, length: int = len(DATES), start: float = 100.0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return start * np.exp(np.cumsum(rng.normal(0, 0.02, length)))
+
+
+def _per_symbol(close_df: pd.DataFrame) -> list:
+    """The reference: one `ta` evaluation per symbol on its non-NaN closes."""
+    return [
+        generate_aggregated_signal(symbol, close_df[symbol].dropna().to_frame(name="Close"))
+        for symbol in close_df.columns
+    ]
+
+
+def _assert_parity(close_df: pd.DataFrame) -> None:
+    assert generate_aggregated_signals(close_df) == _per_symbol(close_df)
+
+
+def test_full_history():
+    close_df = pd.DataFrame({f"S{seed}": _random_walk(seed) for seed in range(8)}, index=DATES)
+    _assert_parity(close_df)
+
+
+def test_gapped_series():
+    close_df = pd.DataFrame({f"S{seed}": _random_walk(seed) for seed in range(6)}, index=DATES)
+    rng = np.random.default_rng(42)
+    # Interior gaps (missing bars, different per symbol)
+    for symbol in close_df.columns:
+        close_df.loc[close_df.index[rng.choice(len(DATES) - 1, size=15, replace=False)], symbol] = np.nan
+    # A later listing (leading NaNs) and a symbol whose last bar is missing
+    close_df.iloc[:70, 1] = np.nan
+    close_df.iloc[-1, 2] = np.nan
+    _assert_parity(close_df)
+
+
+@pytest.mark.parametrize("length", [5, 19, 20, 25, 26, 33, 34, 35, 40])
+def test_short_series(length):
+    close_df = pd.DataFrame(
+        {"LONG": _random_walk(1), "SHORT": np.r_[np.full(len(DATES) - length, np.nan), _random_walk(2, length)]},
+        index=DATES,
+    )
+    _assert_parity(close_df)
+
+
+def test_short_series_are_neutral():
+    close_df = pd.DataFrame({"NEW": np.r_[np.full(len(DATES) - 10, np.nan), _random_walk(3, 10)]}, index=DATES)
+    [result] = generate_aggregated_signals(close_df)
+    assert result["aggregated_sentiment"] == "NEUTRAL"
+    assert result["justification"].startswith("Insufficient historical data")
+
+
+def test_flat_series():
+    close_df = pd.DataFrame(
+        {"FLAT": np.full(len(DATES), 50.0), "FLAT_THEN_UP": np.r_[np.full(80, 20.0), np.linspace(20, 30, 40)],
+         "WALK": _random_walk(4)},
+        index=DATES,
+    )
+    _assert_parity(close_df)
+
+
+def test_empty_matrix():
+    assert generate_aggregated_signals(pd.DataFrame()) == []